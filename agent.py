@@ -2,19 +2,19 @@
 import asyncio
 import os
 import sys
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, TextIO, Tuple, TypeVar
 
-from beeai_framework.agents.requirement import RequirementAgent
-from beeai_framework.agents.requirement.requirements.conditional import ConditionalRequirement
-from beeai_framework.errors import FrameworkError
-from beeai_framework.memory import TokenMemory
-from beeai_framework.middleware.trajectory import GlobalTrajectoryMiddleware
-from beeai_framework.tools import Tool
-from beeai_framework.tools.think import ThinkTool
-
+from config.agent_config import get_daemon_address, get_daemon_token, get_rag_enabled, get_startup_timeout
 from config.llm_config import (
     create_chat_model,
     get_llm_config,
+    get_llm_fallbacks,
     get_llm_max_tokens,
+    get_llm_parallel_tool_calls,
+    get_llm_router_model,
+    get_llm_stream,
     get_llm_temperature,
     get_memory_max_tokens,
     load_agent_instructions,
@@ -25,83 +25,270 @@ from config.logging_config import (
     is_debug_mode,
     print_clean_message,
 )
-from tools.mcp_linux_tools import create_linux_tools
-from tools.rag_integration import create_rag_tool
+from config.metrics import install_metrics_dump
+from tools.answer_cache import get_answer_cache
 
+# beeai_framework, the MCP client and the RAG/langchain stack take seconds to
+# import, so they are imported where they are first needed: argument and
+# environment validation in run_agent() fail fast, and disabled components
+# are never imported at all.
+if TYPE_CHECKING:
+    from beeai_framework.agents.requirement import RequirementAgent
+    from beeai_framework.backend import ChatModel
+    from beeai_framework.emitter import Emitter, EventMeta
+    from beeai_framework.tools import Tool
 
-async def create_troubleshooting_agent() -> RequirementAgent:
-    """Create the system troubleshooting agent with RAG and filesystem capabilities.
+    from tools.answer_cache import CachedAnswer
+
+T = TypeVar("T")
+
+
+@dataclass
+class StartupTiming:
+    """Timing record for a single startup component."""
     
+    component: str
+    duration: float
+    status: str
+    error: Optional[str] = None
+
+
+@dataclass
+class StartupReport:
+    """Startup timing report for the concurrent initialization pipeline."""
+    
+    timings: List[StartupTiming] = field(default_factory=list)
+    total: float = 0.0
+
+    @property
+    def sequential_total(self) -> float:
+        """Time the same components would have taken if run one after another."""
+        return sum(timing.duration for timing in self.timings)
+
+    def format(self) -> str:
+        """Format the report as a human-readable multiline string."""
+        lines = [
+            f"Startup timing: {self.total:.2f}s total "
+            f"(sequential would be {self.sequential_total:.2f}s)"
+        ]
+        for timing in self.timings:
+            line = f"  {timing.component:<13} {timing.duration:>7.2f}s  {timing.status}"
+            if timing.error:
+                line += f" ({timing.error})"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+# Report of the most recent create_troubleshooting_agent() call
+last_startup_report: Optional[StartupReport] = None
+
+
+async def _timed_startup(
+    component: str,
+    awaitable: Awaitable[T],
+) -> Tuple[Optional[T], StartupTiming, Optional[BaseException]]:
+    """Await a startup component with its configured timeout and record its timing.
+    
+    A timeout stops waiting for the component but cannot cancel work already
+    offloaded with asyncio.to_thread(): the worker thread keeps running until
+    its blocking call returns, and its result is discarded.
+    
+    Args:
+        component: Component name used for the timeout lookup and the report.
+        awaitable: Coroutine that initializes the component.
+        
     Returns:
-        RequirementAgent: Configured troubleshooting agent.
+        Tuple of (result or None, timing record, exception or None).
     """
-    # Get configured LLM provider and model
-    llm_provider, llm_model = get_llm_config()
+    timeout = get_startup_timeout(component)
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(awaitable, timeout=timeout)
+        return result, StartupTiming(component, time.perf_counter() - start, "ok"), None
+    except asyncio.TimeoutError:
+        error = TimeoutError(f"{component} initialization timed out after {timeout:g}s")
+        return None, StartupTiming(component, time.perf_counter() - start, "timeout", str(error)), error
+    except Exception as e:
+        return None, StartupTiming(component, time.perf_counter() - start, "failed", str(e)), e
+
+
+async def _disabled_startup(component: str) -> Tuple[None, StartupTiming, None]:
+    """Startup result of a component turned off by configuration."""
+    return None, StartupTiming(component, 0.0, "disabled"), None
+
+
+def create_rag_tool() -> "Tool":
+    """Create the RAG knowledge base tool, importing the RAG stack on first use."""
+    from tools.rag_integration import create_rag_tool as _create_rag_tool
+    return _create_rag_tool()
+
+
+async def create_linux_tools(**kwargs: Any) -> List["Tool"]:
+    """Create the Linux MCP tools, importing the MCP client on first use."""
+    from tools.mcp_linux_tools import create_linux_tools as _create_linux_tools
+    return await _create_linux_tools(**kwargs)
+
+
+async def _create_linux_tools_from_env() -> List["Tool"]:
+    """Create the Linux MCP diagnostic tools using environment configuration."""
+    # Get Linux MCP server path from environment or use default
+    linux_server_path = os.getenv("LINUX_MCP_SERVER_PATH")
+    
+    # Get allowed log paths from environment
+    allowed_log_paths = os.getenv("LINUX_MCP_ALLOWED_LOG_PATHS")
+    
+    return await create_linux_tools(
+        server_path=linux_server_path,
+        allowed_log_paths=allowed_log_paths
+    )
+
+
+def create_agent_chat_model() -> "ChatModel":
+    """Create the agent's chat model from the environment.
+    
+    The configured provider and model (with its LLM_FALLBACKS chain) answer
+    the agent. When LLM_ROUTER_MODEL is set, a small model answers triage
+    steps (intent, thinking, tool selection) in front of it and only the
+    final synthesis is escalated to the configured model.
     
-    # Initialize LLM with configured provider
+    Returns:
+        ChatModel: The configured model, or a RoutedChatModel around it.
+    """
     # Lower temperature (default 0.2) for more precise, deterministic tool usage
-    llm = create_chat_model(
-        provider=llm_provider,
-        model=llm_model,
+    options = dict(
         temperature=get_llm_temperature(),
         max_tokens=get_llm_max_tokens(),
+        parallel_tool_calls=get_llm_parallel_tool_calls(),
+        stream=get_llm_stream(),
     )
+    llm_provider, llm_model = get_llm_config()
+    llm = create_chat_model(provider=llm_provider, model=llm_model, fallbacks=get_llm_fallbacks(), **options)
+    
+    router_model = get_llm_router_model()
+    if router_model is None:
+        return llm
+    from tools.llm_router import RoutedChatModel
+    
+    router_provider, router_model_id = router_model
+    return RoutedChatModel(create_chat_model(provider=router_provider, model=router_model_id, **options), llm)
+
+
+async def _close_started_components() -> None:
+    """Stop components started by a failed create_troubleshooting_agent() call."""
+    # The MCP session pool keeps server processes running; it is only loaded if MCP tools were created
+    if "tools.mcp_session_pool" in sys.modules:
+        from tools.mcp_session_pool import close_session_pools
+        await close_session_pools()
+
+
+async def create_troubleshooting_agent() -> "RequirementAgent":
+    """Create the system troubleshooting agent with RAG and filesystem capabilities.
+    
+    The chat model, RAG tool, Linux MCP tools and agent instructions are
+    initialized concurrently (blocking parts are offloaded to threads), each
+    bounded by its STARTUP_TIMEOUT_<COMPONENT> timeout, so cold start takes
+    roughly as long as the slowest component instead of the sum of all of them.
+    
+    The RAG tool is skipped (and its dependencies never imported) when
+    RAG_ENABLED=false.
+    
+    Returns:
+        RequirementAgent: Configured troubleshooting agent.
+    """
+    global last_startup_report
+    logger = get_logger()
+    
+    llm_init = asyncio.to_thread(create_agent_chat_model)
+    rag_init = (
+        _timed_startup("rag", asyncio.to_thread(create_rag_tool)) if get_rag_enabled() else _disabled_startup("rag")
+    )
+    
+    # Nothing failing (or cancelled) during startup may leave the started MCP servers running
+    try:
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            _timed_startup("llm", llm_init),
+            rag_init,
+            _timed_startup("mcp", _create_linux_tools_from_env()),
+            _timed_startup("instructions", asyncio.to_thread(load_agent_instructions)),
+        )
+        report = StartupReport(timings=[timing for _, timing, _ in results], total=time.perf_counter() - start)
+        last_startup_report = report
+        logger.info(report.format())
+        if is_debug_mode():
+            print(report.format())
+        
+        return _assemble_agent(results)
+    except BaseException:
+        await _close_started_components()
+        raise
+
+
+def _assemble_agent(results: List[Tuple[Any, StartupTiming, Optional[BaseException]]]) -> "RequirementAgent":
+    """Build the troubleshooting agent from the startup results of its components.
+    
+    Raises:
+        RuntimeError: If the chat model or the agent instructions failed to start.
+    """
+    from beeai_framework.agents.requirement import RequirementAgent
+    from beeai_framework.agents.requirement.requirements.conditional import ConditionalRequirement
+    from beeai_framework.memory import TokenMemory
+    from beeai_framework.middleware.trajectory import GlobalTrajectoryMiddleware
+    from beeai_framework.tools import Tool
+    from beeai_framework.tools.think import ThinkTool
+    
+    logger = get_logger()
+    
+    llm, _, llm_error = results[0]
+    rag_tool, _, rag_error = results[1]
+    linux_tools, _, mcp_error = results[2]
+    instructions, _, instructions_error = results[3]
+    
+    if llm_error is not None:
+        logger.error(f"Failed to create chat model: {llm_error}", exc_info=llm_error)
+        raise RuntimeError(f"Cannot start agent without a chat model: {llm_error}")
+    
+    # Agent instructions are mandatory
+    if instructions_error is not None:
+        logger.error(f"Failed to load agent instructions: {instructions_error}", exc_info=instructions_error)
+        raise RuntimeError(f"Cannot start agent without instructions: {instructions_error}")
     
     # Initialize tools list with ThinkTool
     tools = [ThinkTool()]
     
     # Add RAG tool for knowledge base access
-    try:
-        logger = get_logger()
-        rag_tool = create_rag_tool()
+    if rag_tool is not None:
         tools.append(rag_tool)
         logger.info("✅ Initialized RAG knowledge base tool")
         if is_debug_mode():
             print("✅ Initialized RAG knowledge base tool")
-    except Exception as e:
-        logger = get_logger()
-        logger.warning(f"Could not initialize RAG tool: {e}", exc_info=True)
+    elif rag_error is None:
+        logger.info("RAG knowledge base disabled (RAG_ENABLED=false)")
+    else:
+        logger.warning(f"Could not initialize RAG tool: {rag_error}", exc_info=rag_error)
         if is_debug_mode():
-            print(f"⚠️  Warning: Could not initialize RAG tool: {e}")
+            print(f"⚠️  Warning: Could not initialize RAG tool: {rag_error}")
             print("   Agent will run without knowledge base access.")
     
     # Add Linux MCP tools for system diagnostics
-    try:
-        logger = get_logger()
-        # Get Linux MCP server path from environment or use default
-        linux_server_path = os.getenv("LINUX_MCP_SERVER_PATH")
-        
-        # Get allowed log paths from environment
-        allowed_log_paths = os.getenv("LINUX_MCP_ALLOWED_LOG_PATHS")
-        
-        linux_tools = await create_linux_tools(
-            server_path=linux_server_path,
-            allowed_log_paths=allowed_log_paths
-        )
+    if mcp_error is None:
         tools.extend(linux_tools)
         logger.info(f"✅ Initialized {len(linux_tools)} Linux diagnostic tools")
         if is_debug_mode():
             print(f"✅ Initialized {len(linux_tools)} Linux diagnostic tools")
-    except Exception as e:
-        logger = get_logger()
-        logger.warning(f"Could not initialize Linux diagnostic tools: {e}", exc_info=True)
+    else:
+        logger.warning(f"Could not initialize Linux diagnostic tools: {mcp_error}", exc_info=mcp_error)
         if is_debug_mode():
-            print(f"⚠️  Warning: Could not initialize Linux diagnostic tools: {e}")
+            print(f"⚠️  Warning: Could not initialize Linux diagnostic tools: {mcp_error}")
             print("   Agent will run without Linux system diagnostic capabilities.")
     
     # Create memory with token management to prevent unbounded growth
     # Default 12000 tokens leaves headroom for tool outputs and responses
     memory = TokenMemory(llm=llm, max_tokens=get_memory_max_tokens())
     
-    # Load agent instructions from markdown file
-    try:
-        instructions = load_agent_instructions()
-        logger.info("✅ Loaded agent instructions from file")
-        if is_debug_mode():
-            print(f"✅ Loaded agent instructions ({len(instructions)} chars)")
-    except Exception as e:
-        logger.error(f"Failed to load agent instructions: {e}", exc_info=True)
-        raise RuntimeError(f"Cannot start agent without instructions: {e}")
+    logger.info("✅ Loaded agent instructions from file")
+    if is_debug_mode():
+        print(f"✅ Loaded agent instructions ({len(instructions)} chars)")
     
     # Create the troubleshooting agent
     agent = RequirementAgent(
@@ -118,12 +305,178 @@ async def create_troubleshooting_agent() -> RequirementAgent:
     return agent
 
 
-async def interactive_mode(agent: RequirementAgent) -> None:
+def fork_agent(agent: "RequirementAgent") -> "RequirementAgent":
+    """Create an agent sharing the model, tools and instructions of another one.
+    
+    The fork has its own, empty memory, so independent queries (e.g. those
+    served by the daemon) can run concurrently without seeing each other's
+    conversation. Nothing is re-initialized, so forking is cheap.
+    
+    Args:
+        agent: Agent created by create_troubleshooting_agent.
+        
+    Returns:
+        RequirementAgent: New agent with fresh memory.
+    """
+    from beeai_framework.agents.requirement import RequirementAgent
+    from beeai_framework.agents.tool_calling.utils import ToolCallChecker
+    from beeai_framework.memory import TokenMemory
+    
+    # Mirrors RequirementAgent.clone(), minus cloning the model, tools and memory
+    tool_call_checker = agent._tool_call_checker
+    forked = RequirementAgent(
+        name=agent.meta.name,
+        description=agent.meta.description,
+        llm=agent._llm,
+        tools=list(agent._tools),
+        requirements=agent._requirements.copy(),
+        templates=agent._templates,
+        memory=TokenMemory(llm=agent._llm, max_tokens=get_memory_max_tokens()),
+        tool_call_checker=(
+            tool_call_checker.config.model_copy()
+            if isinstance(tool_call_checker, ToolCallChecker)
+            else tool_call_checker
+        ),
+        save_intermediate_steps=agent._save_intermediate_steps,
+        final_answer_as_tool=agent._final_answer_as_tool,
+        middlewares=agent.middlewares.copy(),
+    )
+    forked.runner_cls = agent.runner_cls
+    return forked
+
+
+class StreamingPrinter:
+    """Print agent progress and final-answer tokens to the terminal as they arrive.
+    
+    Tool starts and finishes are shown as progress lines while the agent
+    works; the response header is printed lazily before the first answer
+    token so progress lines never interleave with the answer.
+    """
+
+    def __init__(self, header: str = "🤖 Agent: ", stream: Optional[TextIO] = None) -> None:
+        """Create a printer.
+        
+        Args:
+            header: Prefix printed before the final answer.
+            stream: Output stream. Defaults to sys.stdout at write time.
+        """
+        self.header = header
+        self._stream = stream
+        self._tool_starts: Dict[str, float] = {}
+        self.streamed = False
+        self.tool_calls = 0
+
+    def _write(self, text: str) -> None:
+        stream = self._stream or sys.stdout
+        stream.write(text)
+        stream.flush()
+
+    def observe(self, emitter: "Emitter") -> None:
+        """Register the printer on an agent run emitter (for ``Run.observe``)."""
+        from beeai_framework.emitter import EmitterOptions
+        
+        emitter.on("final_answer", self.on_final_answer)
+        emitter.on(self._is_tool_event, self.on_tool_event, EmitterOptions(match_nested=True))
+
+    @staticmethod
+    def _tool_of(event: "EventMeta") -> Optional["Tool"]:
+        """Return the tool that emitted an event (ignoring run-context mirrors), if any."""
+        from beeai_framework.agents.requirement.utils._tool import FinalAnswerTool
+        from beeai_framework.tools import Tool
+        
+        creator = event.creator
+        if isinstance(creator, Tool) and not isinstance(creator, FinalAnswerTool):
+            return creator
+        return None
+
+    def _is_tool_event(self, event: "EventMeta") -> bool:
+        return event.name in ("start", "success", "error") and self._tool_of(event) is not None
+
+    def on_final_answer(self, data: Any, event: "EventMeta") -> None:
+        """Write a chunk of the final answer."""
+        delta = getattr(data, "delta", "")
+        if not delta:
+            return
+        if not self.streamed:
+            self._write(self.header)
+            self.streamed = True
+        self._write(delta)
+
+    def on_tool_event(self, data: Any, event: "EventMeta") -> None:
+        """Write a progress line when a tool starts or finishes."""
+        tool = self._tool_of(event)
+        run_id = event.trace.run_id if event.trace is not None else tool.name
+        if event.name == "start":
+            self.tool_calls += 1
+            self._tool_starts[run_id] = time.perf_counter()
+            self._write(f"   ⏳ {tool.name}...\n")
+            return
+        elapsed = time.perf_counter() - self._tool_starts.pop(run_id, time.perf_counter())
+        status = "✓" if event.name == "success" else "✗"
+        self._write(f"   {status} {tool.name} ({elapsed:.1f}s)\n")
+
+    def on_cached_answer(self, cached: "CachedAnswer") -> None:
+        """Write a progress line for an answer served from the answer cache."""
+        self._write(f"   ♻ cached answer to \"{cached.query}\" ({cached.similarity:.2f} similar, {cached.age:.0f}s old)\n")
+
+    def finish(self, text: str) -> None:
+        """Complete the output, printing the whole answer if nothing was streamed."""
+        if not self.streamed:
+            self._write(f"{self.header}{text}")
+        self._write("\n")
+
+
+async def run_with_streaming(
+    agent: "RequirementAgent",
+    query: str,
+    printer: StreamingPrinter,
+    observer: Optional[Callable[["Emitter"], Any]] = None,
+) -> str:
+    """Run the agent on a query while streaming its progress and answer.
+    
+    When the semantic answer cache is enabled (ANSWER_CACHE_PATH) and the
+    agent has no conversation yet, an answer to a similar recent query is
+    returned without running the agent.
+    
+    Args:
+        agent: The troubleshooting agent to use.
+        query: The query to process.
+        printer: Printer receiving tool progress and answer tokens.
+        observer: Optional additional emitter observer (e.g. the logging observer).
+        
+    Returns:
+        str: The agent's final answer.
+    """
+    # Follow-up questions depend on the conversation, so only fresh agents use the cache
+    answer_cache = get_answer_cache() if not agent.memory.messages else None
+    cached = await answer_cache.lookup(query) if answer_cache is not None else None
+    if cached is not None and not answer_cache.should_verify():
+        printer.on_cached_answer(cached)
+        printer.finish(cached.answer)
+        return cached.answer
+    
+    run = agent.run(query, expected_output="Clear, actionable troubleshooting guidance.")
+    if observer is not None:
+        run = run.observe(observer)
+    response = await run.observe(printer.observe)
+    
+    agent_response = response.last_message.text
+    printer.finish(agent_response)
+    if answer_cache is not None:
+        if cached is not None:
+            await answer_cache.verify(cached, agent_response)
+        await answer_cache.store(query, agent_response)
+    return agent_response
+
+
+async def interactive_mode(agent: "RequirementAgent") -> None:
     """Run the agent in interactive mode for continuous troubleshooting.
     
     Args:
         agent: The troubleshooting agent to use.
     """
+    from beeai_framework.errors import FrameworkError
+    
     logger = get_logger()
     
     print_clean_message("=" * 70)
@@ -162,20 +515,16 @@ async def interactive_mode(agent: RequirementAgent) -> None:
             logger.info(f"Query: {user_input}")
             logger.info("-" * 70)
             
-            print("\n🤖 Agent: ", end="", flush=True)
+            print()
             
-            # Create event observer for this run
-            event_observer = create_event_observer()
-            
-            response = await agent.run(
+            # Stream tool progress and the answer while the agent works
+            agent_response = await run_with_streaming(
+                agent,
                 user_input,
-                expected_output="Clear, actionable troubleshooting guidance.",
-                observe=event_observer
+                StreamingPrinter(),
+                observer=create_event_observer(),
             )
             
-            agent_response = response.last_message.text
-            print(agent_response)
-            
             logger.info("-" * 70)
             logger.info(f"AGENT RESPONSE #{interaction_count}")
             logger.info(f"Response:\n{agent_response}")
@@ -196,13 +545,15 @@ async def interactive_mode(agent: RequirementAgent) -> None:
             logger.error(f"UNEXPECTED ERROR in interaction #{interaction_count}: {str(e)}", exc_info=True)
 
 
-async def single_query_mode(agent: RequirementAgent, query: str) -> None:
+async def single_query_mode(agent: "RequirementAgent", query: str) -> None:
     """Run a single query and exit.
     
     Args:
         agent: The troubleshooting agent to use.
         query: The query to process.
     """
+    from beeai_framework.errors import FrameworkError
+    
     logger = get_logger()
     
     # Get provider and model for logging
@@ -216,20 +567,15 @@ async def single_query_mode(agent: RequirementAgent, query: str) -> None:
         logger.info("=" * 70)
         
         print_clean_message(f"\n🔧 Query: {query}\n")
-        print("🤖 Agent: ", end="", flush=True)
-        
-        # Create event observer for this run
-        event_observer = create_event_observer()
         
-        response = await agent.run(
+        # Stream tool progress and the answer while the agent works
+        agent_response = await run_with_streaming(
+            agent,
             query,
-            expected_output="Clear, actionable troubleshooting guidance.",
-            observe=event_observer
+            StreamingPrinter(),
+            observer=create_event_observer(),
         )
         
-        agent_response = response.last_message.text
-        print(agent_response)
-        
         logger.info("-" * 70)
         logger.info("AGENT RESPONSE")
         logger.info(f"Response:\n{agent_response}")
@@ -257,6 +603,16 @@ async def run_agent(args: list[str] = None) -> None:
     if args is None:
         args = sys.argv[1:]
     
+    # Validate batch arguments before paying for agent startup
+    batch_args = None
+    if args and args[0] == "--batch":
+        from agent_batch import parse_batch_args
+        batch_args = parse_batch_args(args[1:])
+    elif args and args[0] == "--serve" and isinstance(get_daemon_address(), tuple) and not get_daemon_token():
+        print_clean_message("❌ Error: AGENT_DAEMON_PORT requires AGENT_DAEMON_TOKEN.")
+        print_clean_message("Any local user can connect to a TCP port; set a shared token or use the Unix socket.")
+        sys.exit(1)
+    
     # Get configured LLM provider and model (after .env is loaded)
     llm_provider, llm_model = get_llm_config()
     
@@ -269,6 +625,9 @@ async def run_agent(args: list[str] = None) -> None:
     logger.info(f"Debug Mode: {is_debug_mode()}")
     logger.info("=" * 70)
     
+    # Dump run metrics to METRICS_FILE at exit (if configured)
+    install_metrics_dump()
+    
     # Validate environment variables based on provider
     if llm_provider == "watsonx":
         watsonx_api_key = os.getenv("WATSONX_API_KEY")
@@ -306,12 +665,28 @@ async def run_agent(args: list[str] = None) -> None:
         logger.error(error_msg, exc_info=True)
         sys.exit(1)
     
-    # Check for command-line arguments
-    if len(args) > 0:
-        # Single query mode
-        query = " ".join(args)
-        await single_query_mode(agent, query)
-    else:
-        # Interactive mode
-        await interactive_mode(agent)
+    try:
+        # Check for command-line arguments
+        if batch_args is not None:
+            # Batch mode: answer a file of questions concurrently, JSONL out
+            from agent_batch import batch_mode
+            results = await batch_mode(agent, batch_args)
+            if not all(result.ok for result in results):
+                sys.exit(1)
+        elif args and args[0] == "--serve":
+            # Daemon mode: keep the agent warm and serve queries over a socket
+            from agent_daemon import serve_daemon
+            await serve_daemon(agent)
+        elif len(args) > 0:
+            # Single query mode
+            query = " ".join(args)
+            await single_query_mode(agent, query)
+        else:
+            # Interactive mode
+            await interactive_mode(agent)
+    finally:
+        # Stop the warm MCP server processes (only loaded if MCP tools were created)
+        if "tools.mcp_session_pool" in sys.modules:
+            from tools.mcp_session_pool import close_session_pools
+            await close_session_pools()
 
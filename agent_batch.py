@@ -0,0 +1,276 @@
+"""Batch query mode: answer a file of questions with bounded concurrency.
+
+Queries are read from a JSONL or plain-text file (or stdin) and answered
+by up to BATCH_CONCURRENCY concurrent agent runs. All runs share one chat
+model client, the RAG connection pool and the MCP session pool, and each
+runs on a fork of the agent with its own memory. Answers are written as
+JSONL as soon as they complete, with per-query latency and token usage;
+a summary is printed to stderr at the end.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+from beeai_framework.agents.requirement import RequirementAgent
+from beeai_framework.errors import FrameworkError
+
+from agent import fork_agent
+from config.agent_config import get_batch_concurrency
+from config.logging_config import create_event_observer, get_logger
+from tools.answer_cache import get_answer_cache
+
+
+@dataclass
+class BatchQuery:
+    """A single question of a batch."""
+
+    index: int
+    id: str
+    query: str
+
+
+@dataclass
+class BatchResult:
+    """Answer and statistics of a single batch query."""
+
+    index: int
+    id: str
+    query: str
+    response: Optional[str]
+    error: Optional[str]
+    latency: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    tool_calls: int = 0
+    iterations: int = 0
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def parse_queries(lines: Iterable[str]) -> List[BatchQuery]:
+    """Parse batch input lines into queries.
+
+    Each non-empty line is either a JSON object with a ``query`` (and an
+    optional ``id``), a JSON string, or plain text. Lines starting with
+    ``#`` are comments.
+
+    Raises:
+        ValueError: If a JSON object has no query.
+    """
+    queries: List[BatchQuery] = []
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        query_id: Any = None
+        if line[0] in "{\"":
+            try:
+                data = json.loads(line)
+            except ValueError:
+                data = line
+            if isinstance(data, dict):
+                query_id = data.get("id")
+                data = data.get("query")
+                if not isinstance(data, str) or not data.strip():
+                    raise ValueError(f"Line {line_number}: JSON object without a 'query'")
+            line = str(data).strip()
+        index = len(queries)
+        queries.append(BatchQuery(index, str(query_id if query_id is not None else index + 1), line))
+    return queries
+
+
+def _count_tool_calls(response: Any) -> int:
+    """Count the tool calls of a run, excluding the final answer."""
+    steps = getattr(getattr(response, "state", None), "steps", None) or []
+    return sum(1 for step in steps if step.tool is not None and step.tool.name != "final_answer")
+
+
+async def answer_query(agent: RequirementAgent, item: BatchQuery) -> BatchResult:
+    """Answer one batch query on a fork of the agent."""
+    logger = get_logger()
+    start = time.perf_counter()
+    answer_cache = get_answer_cache()
+    cached = None
+    if answer_cache is not None:
+        # A cache failure must not fail the query (or, through the TaskGroup, the batch)
+        try:
+            cached = await answer_cache.lookup(item.query)
+        except Exception as e:
+            logger.warning(f"Answer cache lookup failed for batch query {item.id}: {e}")
+    if cached is not None and not answer_cache.should_verify():
+        return BatchResult(
+            item.index, item.id, item.query, cached.answer, None, time.perf_counter() - start, cached=True
+        )
+
+    try:
+        run = fork_agent(agent).run(item.query, expected_output="Clear, actionable troubleshooting guidance.")
+        response = await run.observe(create_event_observer())
+    except FrameworkError as err:
+        logger.error(f"FRAMEWORK ERROR in batch query {item.id}: {err.explain()}", exc_info=True)
+        return BatchResult(item.index, item.id, item.query, None, err.explain(), time.perf_counter() - start)
+    except Exception as e:
+        logger.error(f"UNEXPECTED ERROR in batch query {item.id}: {e}", exc_info=True)
+        return BatchResult(item.index, item.id, item.query, None, str(e), time.perf_counter() - start)
+
+    if answer_cache is not None:
+        try:
+            if cached is not None:
+                await answer_cache.verify(cached, response.last_message.text)
+            await answer_cache.store(item.query, response.last_message.text)
+        except Exception as e:
+            logger.warning(f"Answer cache store failed for batch query {item.id}: {e}")
+
+    usage = response.state.usage
+    return BatchResult(
+        index=item.index,
+        id=item.id,
+        query=item.query,
+        response=response.last_message.text,
+        error=None,
+        latency=time.perf_counter() - start,
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens,
+        total_tokens=usage.total_tokens,
+        tool_calls=_count_tool_calls(response),
+        iterations=response.state.iteration,
+    )
+
+
+async def run_batch(
+    agent: RequirementAgent,
+    queries: List[BatchQuery],
+    output: TextIO,
+    concurrency: int = 4,
+) -> List[BatchResult]:
+    """Answer queries with at most ``concurrency`` agent runs in flight.
+
+    Results are written to ``output`` as JSONL in completion order; use the
+    ``index`` field to restore input order.
+
+    Returns:
+        List[BatchResult]: Results in input order.
+    """
+    pending: asyncio.Queue = asyncio.Queue()
+    for item in queries:
+        pending.put_nowait(item)
+    results: List[BatchResult] = []
+
+    async def worker() -> None:
+        while True:
+            try:
+                item = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result = await answer_query(agent, item)
+            results.append(result)
+            output.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+            output.flush()
+
+    async with asyncio.TaskGroup() as group:
+        for _ in range(max(1, min(concurrency, len(queries)))):
+            group.create_task(worker())
+
+    return sorted(results, key=lambda result: result.index)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def summarize(results: List[BatchResult], wall_time: float) -> Dict[str, Any]:
+    """Aggregate latency, throughput and token statistics of a batch."""
+    latencies = [result.latency for result in results]
+    return {
+        "queries": len(results),
+        "succeeded": sum(1 for result in results if result.ok),
+        "failed": sum(1 for result in results if not result.ok),
+        "cached": sum(1 for result in results if result.cached),
+        "wall_time": wall_time,
+        "queries_per_second": len(results) / wall_time if wall_time > 0 else 0.0,
+        "latency_p50": _percentile(latencies, 0.5),
+        "latency_p95": _percentile(latencies, 0.95),
+        "latency_max": max(latencies, default=0.0),
+        "prompt_tokens": sum(result.prompt_tokens for result in results),
+        "completion_tokens": sum(result.completion_tokens for result in results),
+        "total_tokens": sum(result.total_tokens for result in results),
+    }
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Format a batch summary as a human-readable multiline string."""
+    return "\n".join([
+        f"Batch: {summary['queries']} queries, {summary['succeeded']} succeeded, {summary['failed']} failed "
+        f"in {summary['wall_time']:.1f}s ({summary['queries_per_second']:.2f} queries/s, "
+        f"{summary['cached']} from the answer cache)",
+        f"  latency  p50 {summary['latency_p50']:.2f}s  p95 {summary['latency_p95']:.2f}s  "
+        f"max {summary['latency_max']:.2f}s",
+        f"  tokens   {summary['total_tokens']} total ({summary['prompt_tokens']} prompt, "
+        f"{summary['completion_tokens']} completion)",
+    ])
+
+
+def parse_batch_args(argv: List[str]) -> argparse.Namespace:
+    """Parse the arguments following ``--batch``."""
+    parser = argparse.ArgumentParser(
+        prog="command_line_agent.py --batch",
+        description="Answer a file of questions (JSONL or one per line) and write JSONL answers.",
+    )
+    parser.add_argument("input", help="Input file, or '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output JSONL file, or '-' for stdout (default)")
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=get_batch_concurrency(),
+        help="Concurrent agent runs (default: BATCH_CONCURRENCY or 4)",
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    # Fail before agent startup rather than after it
+    if args.input != "-":
+        try:
+            open(args.input, encoding="utf-8").close()
+        except OSError as e:
+            parser.error(f"cannot read {args.input}: {e.strerror}")
+    if args.output != "-" and not os.path.isdir(os.path.dirname(os.path.abspath(args.output))):
+        parser.error(f"cannot write {args.output}: directory does not exist")
+    return args
+
+
+def _read_lines(path: str) -> List[str]:
+    if path == "-":
+        return sys.stdin.readlines()
+    with open(path, encoding="utf-8") as handle:
+        return handle.readlines()
+
+
+async def batch_mode(agent: RequirementAgent, args: argparse.Namespace) -> List[BatchResult]:
+    """Run batch mode with parsed arguments.
+
+    Returns:
+        List[BatchResult]: Results in input order.
+    """
+    logger = get_logger()
+    queries = parse_queries(await asyncio.to_thread(_read_lines, args.input))
+    logger.info(f"BATCH MODE: {len(queries)} queries, concurrency {args.concurrency}")
+
+    start = time.perf_counter()
+    with nullcontext(sys.stdout) if args.output == "-" else open(args.output, "w", encoding="utf-8") as output:
+        results = await run_batch(agent, queries, output, concurrency=args.concurrency)
+
+    report = format_summary(summarize(results, time.perf_counter() - start))
+    logger.info(report)
+    print(report, file=sys.stderr, flush=True)
+    return results
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Thin client for the troubleshooting agent daemon.
+
+Sends a query to a daemon started with ``command_line_agent.py --serve``
+and prints its streamed output. Only the standard library is imported, so
+each call costs inference latency instead of agent startup.
+
+Protocol: newline-delimited JSON over a Unix socket (or localhost TCP).
+The client sends one request (``{"query": ...}`` or ``{"command": ...}``,
+plus ``"token"`` when AGENT_DAEMON_TOKEN is set);
+the daemon answers with ``output`` messages carrying terminal text,
+followed by one ``done`` or ``error`` message.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Dict, Optional, Tuple, Union
+
+from config.agent_config import get_daemon_address, get_daemon_token
+
+Address = Union[str, Tuple[str, int]]
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Encode a protocol message as one JSON line."""
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def decode_message(line: bytes) -> Dict[str, Any]:
+    """Decode one JSON line of the protocol."""
+    return json.loads(line.decode("utf-8"))
+
+
+def format_address(address: Address) -> str:
+    """Format a daemon address for messages."""
+    return f"{address[0]}:{address[1]}" if isinstance(address, tuple) else address
+
+
+async def open_connection(address: Address) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to the daemon on a Unix socket path or a (host, port) pair.
+
+    Raises:
+        PermissionError: If the socket belongs to another user, who could
+            otherwise answer our queries in place of the daemon.
+    """
+    if isinstance(address, tuple):
+        return await asyncio.open_connection(*address, limit=2 ** 20)
+    owner = os.stat(address).st_uid
+    if owner != os.getuid():
+        raise PermissionError(f"socket {address} is owned by another user (uid {owner})")
+    return await asyncio.open_unix_connection(address, limit=2 ** 20)
+
+
+async def send_request(
+    request: Dict[str, Any],
+    address: Optional[Address] = None,
+    output=None,
+) -> Dict[str, Any]:
+    """Send a request to the daemon, writing streamed output as it arrives.
+
+    Args:
+        request: Request message ({"query": ...} or {"command": ...}).
+        address: Daemon address. Defaults to get_daemon_address().
+        output: Text stream for ``output`` messages. Defaults to sys.stdout.
+
+    Returns:
+        Dict[str, Any]: The final ``done``/``error`` (or command reply) message.
+
+    Raises:
+        ConnectionError: If the daemon closes the connection without replying.
+        OSError: If the daemon is not reachable.
+    """
+    output = output or sys.stdout
+    token = get_daemon_token()
+    if token:
+        request = {**request, "token": token}
+    reader, writer = await open_connection(address or get_daemon_address())
+    try:
+        writer.write(encode_message(request))
+        await writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("Agent daemon closed the connection without a response")
+            message = decode_message(line)
+            if message.get("type") == "output":
+                output.write(message.get("text", ""))
+                output.flush()
+                continue
+            return message
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+
+def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Ask the running troubleshooting agent daemon a question.")
+    parser.add_argument("query", nargs="*", help="Question for the agent")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--ping", action="store_true", help="Check that the daemon is running")
+    group.add_argument("--shutdown", action="store_true", help="Stop the daemon")
+    group.add_argument("--metrics", action="store_true", help="Print the daemon's metrics (Prometheus text format)")
+    args = parser.parse_args(argv)
+    if not (args.query or args.ping or args.shutdown or args.metrics):
+        parser.error("a query, --ping, --shutdown or --metrics is required")
+    return args
+
+
+async def main(argv: Optional[list] = None) -> int:
+    """Run the client and return the process exit code."""
+    args = parse_args(argv)
+    if args.ping:
+        request = {"command": "ping"}
+    elif args.shutdown:
+        request = {"command": "shutdown"}
+    elif args.metrics:
+        request = {"command": "metrics"}
+    else:
+        request = {"query": " ".join(args.query)}
+
+    address = get_daemon_address()
+    try:
+        reply = await send_request(request, address)
+    except (OSError, ConnectionError) as e:
+        print(f"❌ Agent daemon is not reachable at {format_address(address)}: {e}", file=sys.stderr)
+        print("   Start it with: python command_line_agent.py --serve", file=sys.stderr)
+        return 2
+
+    if reply.get("type") == "error":
+        print(f"❌ Error: {reply.get('message')}", file=sys.stderr)
+        return 1
+    if reply.get("type") == "pong":
+        print(
+            f"✅ Agent daemon is running at {format_address(address)} "
+            f"(uptime {reply.get('uptime', 0):.0f}s, {reply.get('queries', 0)} queries served)"
+        )
+        answer_cache = reply.get("answer_cache")
+        if answer_cache:
+            precision = answer_cache.get("precision")
+            print(
+                f"   answer cache: {answer_cache['hits']}/{answer_cache['lookups']} hits "
+                f"({answer_cache['hit_rate']:.0%}), precision "
+                f"{'n/a' if precision is None else f'{precision:.0%}'} over {answer_cache['verified']} verified"
+            )
+    elif reply.get("type") == "bye":
+        print("👋 Agent daemon is shutting down.")
+    elif reply.get("type") == "metrics":
+        sys.stdout.write(reply.get("text", ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
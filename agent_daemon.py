@@ -0,0 +1,222 @@
+"""Long-running agent daemon serving queries over a local socket.
+
+Building the troubleshooting agent (chat model, RAG store, MCP server
+processes) takes seconds. The daemon builds it once and answers queries
+from agent_client.py over a Unix socket (or localhost TCP), so scripted
+queries only pay inference latency. Each query runs on a fork of the warm
+agent with empty memory, and up to AGENT_DAEMON_MAX_CONCURRENCY queries
+are answered at once.
+"""
+import asyncio
+import hmac
+import os
+import stat
+import time
+from typing import Any, Dict, Optional
+
+from beeai_framework.agents.requirement import RequirementAgent
+from beeai_framework.errors import FrameworkError
+
+from agent import StreamingPrinter, fork_agent, run_with_streaming
+from agent_client import Address, decode_message, encode_message, format_address, open_connection
+from config.agent_config import (
+    get_daemon_address,
+    get_daemon_max_concurrency,
+    get_daemon_token,
+    get_default_daemon_socket,
+)
+from config.logging_config import create_event_observer, get_logger, print_clean_message
+from config.metrics import REGISTRY, get_metrics_port, start_metrics_server
+from tools.answer_cache import get_answer_cache
+
+
+class SocketOutput:
+    """Text stream forwarding writes to a client as ``output`` messages."""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self._writer = writer
+
+    def write(self, text: str) -> None:
+        if text and not self._writer.is_closing():
+            self._writer.write(encode_message({"type": "output", "text": text}))
+
+    def flush(self) -> None:
+        pass
+
+
+class AgentDaemon:
+    """Serve queries against a warm troubleshooting agent."""
+
+    def __init__(self, agent: RequirementAgent, max_concurrency: int = 4, token: Optional[str] = None) -> None:
+        """Create a daemon.
+
+        Args:
+            agent: Agent created by create_troubleshooting_agent.
+            max_concurrency: Maximum number of queries answered at once.
+            token: Shared secret every request must carry (required for TCP).
+        """
+        self.agent = agent
+        self.max_concurrency = max_concurrency
+        self.token = token
+        self.queries = 0
+        self.started_at = time.monotonic()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._shutdown = asyncio.Event()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of daemon counters for the ping command."""
+        stats = {
+            "uptime": time.monotonic() - self.started_at,
+            "queries": self.queries,
+            "max_concurrency": self.max_concurrency,
+        }
+        answer_cache = get_answer_cache()
+        if answer_cache is not None:
+            stats["answer_cache"] = answer_cache.stats()
+        return stats
+
+    async def answer(self, query: str, writer: asyncio.StreamWriter) -> Dict[str, Any]:
+        """Answer a query, streaming output to the client.
+
+        Returns:
+            Dict[str, Any]: The final ``done`` or ``error`` message.
+        """
+        logger = get_logger()
+        async with self._semaphore:
+            self.queries += 1
+            query_number = self.queries
+            logger.info(f"DAEMON QUERY #{query_number}: {query}")
+            start = time.perf_counter()
+            try:
+                response = await run_with_streaming(
+                    fork_agent(self.agent),
+                    query,
+                    StreamingPrinter(stream=SocketOutput(writer)),
+                    observer=create_event_observer(),
+                )
+            except FrameworkError as err:
+                logger.error(f"FRAMEWORK ERROR in daemon query #{query_number}: {err.explain()}", exc_info=True)
+                return {"type": "error", "message": err.explain()}
+            except Exception as e:
+                logger.error(f"UNEXPECTED ERROR in daemon query #{query_number}: {e}", exc_info=True)
+                return {"type": "error", "message": str(e)}
+
+            duration = time.perf_counter() - start
+            logger.info(f"DAEMON RESPONSE #{query_number} ({duration:.2f}s):\n{response}")
+            return {"type": "done", "response": response, "duration": duration}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve a single client request."""
+        try:
+            try:
+                line = await reader.readline()
+                if not line:
+                    return
+                request = decode_message(line)
+            except (ValueError, asyncio.LimitOverrunError) as e:
+                # readline() raises ValueError for a line over the stream limit
+                reply = {"type": "error", "message": f"Invalid request: {e}"}
+            else:
+                if isinstance(request, dict):
+                    reply = await self._dispatch(request, writer)
+                else:
+                    reply = {"type": "error", "message": "Invalid request: expected a JSON object"}
+            if not writer.is_closing():
+                writer.write(encode_message(reply))
+                await writer.drain()
+        except (ConnectionError, OSError):
+            get_logger().warning("Agent daemon client disconnected before the reply was sent")
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request: Dict[str, Any], writer: asyncio.StreamWriter) -> Dict[str, Any]:
+        if self.token is not None and not hmac.compare_digest(str(request.get("token", "")), self.token):
+            get_logger().warning("Agent daemon rejected a request with a missing or wrong token")
+            return {"type": "error", "message": "Invalid or missing token (set AGENT_DAEMON_TOKEN)"}
+        command = request.get("command")
+        if command == "ping":
+            return {"type": "pong", **self.stats()}
+        if command == "shutdown":
+            self._shutdown.set()
+            return {"type": "bye"}
+        if command == "metrics":
+            return {"type": "metrics", "text": REGISTRY.render()}
+        query = str(request.get("query") or "").strip()
+        if not query:
+            return {"type": "error", "message": "Request must contain a 'query' or a 'command'"}
+        return await self.answer(query, writer)
+
+    async def serve(self, address: Address) -> None:
+        """Listen on an address until a shutdown command arrives."""
+        if isinstance(address, tuple):
+            # Any local user can reach a TCP port, and queries run diagnostics as this user
+            if not self.token:
+                raise RuntimeError("Refusing to listen on TCP without AGENT_DAEMON_TOKEN")
+            server = await asyncio.start_server(self.handle_connection, *address, limit=2 ** 20)
+        else:
+            if address == get_default_daemon_socket():
+                _ensure_private_dir(os.path.dirname(address))
+            await _remove_stale_socket(address)
+            # Queries run diagnostics on this machine: only the owner may connect, from the moment of bind
+            umask = os.umask(0o077)
+            try:
+                server = await asyncio.start_unix_server(self.handle_connection, address, limit=2 ** 20)
+            finally:
+                os.umask(umask)
+            os.chmod(address, stat.S_IRUSR | stat.S_IWUSR)
+
+        try:
+            async with server:
+                await self._shutdown.wait()
+        finally:
+            if not isinstance(address, tuple) and os.path.exists(address):
+                os.unlink(address)
+
+
+def _ensure_private_dir(path: str) -> None:
+    """Create the socket directory with mode 0700, refusing one another user could write to."""
+    os.makedirs(path, mode=stat.S_IRWXU, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+        raise RuntimeError(f"Socket directory {path} must be a directory owned by this user with mode 0700")
+
+
+async def _remove_stale_socket(path: str) -> None:
+    """Remove a leftover socket file, refusing if a daemon is still listening on it."""
+    if not os.path.exists(path):
+        return
+    try:
+        _, writer = await open_connection(path)
+    except OSError:
+        os.unlink(path)
+        return
+    writer.close()
+    raise RuntimeError(f"An agent daemon is already listening on {path}")
+
+
+async def serve_daemon(agent: RequirementAgent, address: Optional[Address] = None) -> None:
+    """Run the agent daemon until it is shut down.
+
+    Args:
+        agent: Agent created by create_troubleshooting_agent.
+        address: Unix socket path or (host, port). Defaults to get_daemon_address().
+    """
+    address = address or get_daemon_address()
+    daemon = AgentDaemon(agent, max_concurrency=get_daemon_max_concurrency(), token=get_daemon_token())
+    logger = get_logger()
+    logger.info(f"AGENT DAEMON LISTENING on {format_address(address)}")
+    print_clean_message(f"🚀 Agent daemon listening on {format_address(address)}")
+    print_clean_message('   Ask questions with: python agent_client.py "your question"')
+    metrics_server = None
+    metrics_port = get_metrics_port()
+    if metrics_port is not None:
+        metrics_server = await start_metrics_server(metrics_port)
+        logger.info(f"Metrics available at http://127.0.0.1:{metrics_port}/metrics")
+        print_clean_message(f"   Metrics: http://127.0.0.1:{metrics_port}/metrics")
+    try:
+        await daemon.serve(address)
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+        logger.info(f"AGENT DAEMON STOPPED (Total queries: {daemon.queries})")
+        print_clean_message(f"👋 Agent daemon stopped after {daemon.queries} queries.")
@@ -0,0 +1,128 @@
+"""Micro-benchmark of the per-event overhead of the DEBUG event observer.
+
+Emits the events of a typical agent step through a real beeai Emitter and
+measures the time per event:
+
+- none:    no observer attached (emitter dispatch only)
+- legacy:  catch-all listener that stringifies every payload with
+           str(vars(data)) before deciding what to log, as the observer did
+           before it was filtered
+- observer: create_event_observer() with DEBUG=true
+
+The chat model events carry a long conversation, so the difference between
+rendering the whole payload and a capped, lazy preview is visible. Records
+are formatted but discarded, so file I/O is not part of the measurement.
+
+Usage:
+    python -m benchmarks.event_observer
+    python -m benchmarks.event_observer --events 20000 --messages 100
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+from beeai_framework.backend import AssistantMessage, ChatModelOutput, UserMessage
+from beeai_framework.backend.events import ChatModelNewTokenEvent, ChatModelStartEvent, ChatModelSuccessEvent
+from beeai_framework.backend.types import ChatModelInput
+from beeai_framework.emitter import Emitter, EmitterOptions
+
+
+class DiscardingHandler(logging.Handler):
+    """Handler that formats records (like a file handler would) and drops them."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format(record)
+
+
+def _legacy_observer(logger: logging.Logger) -> Callable[[Emitter], None]:
+    """Catch-all observer stringifying every payload up front."""
+
+    def observer(emitter: Emitter) -> None:
+        def log_all_events(data: Any, event: Any) -> None:
+            data_str = str(vars(data)) if hasattr(data, "__dict__") else str(data)
+            if event.name in ("start", "success"):
+                logger.info(f"{event.path}: {data_str[:10000]}")
+            elif len(data_str) < 500:
+                logger.debug(f"Event: {event.path} | {data_str}")
+
+        emitter.on("*.*", log_all_events, EmitterOptions(match_nested=True))
+
+    return observer
+
+
+def build_events(messages: int, tokens: int) -> List[Tuple[str, Any]]:
+    """Events of one LLM step: start, streamed tokens and success."""
+    conversation = [
+        UserMessage(f"Question {i}: " + "why is the disk full? " * 40) if i % 2 == 0
+        else AssistantMessage("Checked the journal and the mounts. " * 40)
+        for i in range(messages)
+    ]
+    start = ChatModelStartEvent(input=ChatModelInput(messages=conversation))
+    chunk = ChatModelOutput(output=[AssistantMessage("word ")])
+    success = ChatModelSuccessEvent(value=ChatModelOutput(output=[AssistantMessage("word " * tokens)]))
+    return [("start", start)] + [("new_token", ChatModelNewTokenEvent(value=chunk, abort=lambda: None))] * tokens + [
+        ("success", success)
+    ]
+
+
+async def measure(observer: Optional[Callable[[Emitter], None]], events: List[Tuple[str, Any]], total: int) -> float:
+    """Average microseconds per emitted event."""
+    root = Emitter(namespace=["bench"])
+    if observer is not None:
+        observer(root)
+    emitter = root.child(namespace=["backend", "chat"], creator=object())
+
+    emitted = 0
+    start = time.perf_counter()
+    while emitted < total:
+        for name, data in events:
+            await emitter.emit(name, data)
+        emitted += len(events)
+    return (time.perf_counter() - start) / emitted * 1_000_000
+
+
+async def run(total: int, messages: int, tokens: int) -> Dict[str, float]:
+    """Measure each variant and return microseconds per event."""
+    from config import logging_config
+
+    logger = logging.getLogger("bench-event-observer")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.handlers = [DiscardingHandler()]
+    events = build_events(messages, tokens)
+
+    with patch.object(logging_config, "get_logger", return_value=logger), \
+         patch.dict(os.environ, {"DEBUG": "true", "TRACE_ENABLED": "false"}):
+        return {
+            "none": await measure(None, events, total),
+            "legacy": await measure(_legacy_observer(logger), events, total),
+            "observer": await measure(logging_config.create_event_observer(), events, total),
+        }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Measure per-event overhead of the DEBUG event observer.")
+    parser.add_argument("--events", type=int, default=5000, help="Events emitted per variant")
+    parser.add_argument("--messages", type=int, default=40, help="Conversation length carried by LLM events")
+    parser.add_argument("--tokens", type=int, default=50, help="Streamed tokens per LLM step")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the micro-benchmark and print the results."""
+    args = parse_args(argv)
+    results = asyncio.run(run(args.events, args.messages, args.tokens))
+    print(f"{args.events} events, {args.messages}-message conversation, {args.tokens} tokens per step")
+    for name, micros in results.items():
+        print(f"  {name:<9} {micros:>9.1f} µs/event")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
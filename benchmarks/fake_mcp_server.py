@@ -0,0 +1,60 @@
+"""Offline stand-in for linux-mcp-server used by the benchmarks.
+
+Serves a few read-only diagnostic tools over stdio with canned output, so
+agent runs can be benchmarked without touching the host. The benchmark
+copies this file to ``<server_dir>/linux_mcp_server.py`` next to a
+``.venv/bin/python`` link, which is the layout create_linux_tools expects.
+
+FAKE_MCP_LATENCY (seconds, default 0) adds a fixed delay to every call.
+"""
+import asyncio
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+LATENCY = float(os.getenv("FAKE_MCP_LATENCY", "0"))
+
+server = FastMCP("fake-linux-mcp-server", log_level="WARNING")
+
+
+async def _respond(text: str) -> str:
+    if LATENCY > 0:
+        await asyncio.sleep(LATENCY)
+    return text
+
+
+@server.tool()
+async def get_system_information() -> str:
+    """Get basic system information (hostname, OS, kernel, uptime)."""
+    return await _respond("Hostname: bench-host\nOS: Fedora Linux 40\nKernel: 6.8.0\nUptime: 3 days, 4:12")
+
+
+@server.tool()
+async def get_disk_usage() -> str:
+    """Get filesystem disk usage."""
+    return await _respond(
+        "Filesystem      Size  Used Avail Use% Mounted on\n"
+        "/dev/vda1        40G   39G  1.0G  98% /\n"
+        "/dev/vdb1       100G   20G   80G  20% /data"
+    )
+
+
+@server.tool()
+async def get_service_status(service_name: str) -> str:
+    """Get the status of a systemd service."""
+    return await _respond(
+        f"● {service_name}.service\n"
+        "   Active: failed (Result: exit-code)\n"
+        "   Main PID: 1234 (code=exited, status=1/FAILURE)"
+    )
+
+
+@server.tool()
+async def get_journal_logs(unit: str = "", lines: int = 50) -> str:
+    """Read recent journal entries, optionally for one unit."""
+    entries = [f"Jan 01 00:00:{i:02d} bench-host {unit or 'kernel'}: No space left on device" for i in range(min(lines, 20))]
+    return await _respond("\n".join(entries))
+
+
+if __name__ == "__main__":
+    server.run("stdio")
@@ -0,0 +1,182 @@
+"""Offline fakes for benchmarking the agent end-to-end.
+
+- ScriptedChatModel plays a typical troubleshooting run: think, then one
+  step of parallel diagnostic tool calls, then a streamed final answer. It
+  has a configurable latency and keeps track of the time it spends
+  "generating", so framework overhead can be separated from model time.
+- HashingEmbeddingModel embeds text deterministically without a provider.
+- create_fake_rag_tool builds the RAG tool on an in-memory vector store.
+- prepare_fake_mcp_server lays out fake_mcp_server.py the way
+  create_linux_tools expects a linux-mcp-server checkout.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, AsyncGenerator, List
+
+from beeai_framework.adapters.beeai.backend.vector_store import TemporalVectorStore
+from beeai_framework.backend import AssistantMessage, ChatModel, ChatModelOutput, ChatModelParameters, UserMessage
+from beeai_framework.backend.embedding import EmbeddingModel
+from beeai_framework.backend.message import MessageToolCallContent
+from beeai_framework.backend.types import ChatModelUsage, Document, EmbeddingModelOutput
+from beeai_framework.tools import Tool
+from beeai_framework.tools.search.retrieval import VectorStoreSearchTool
+
+# Diagnostic calls issued in the tool step (only those the agent offers are used)
+DIAGNOSTIC_CALLS = [
+    ("get_disk_usage", {}),
+    ("get_service_status", {"service_name": "nginx"}),
+    ("get_journal_logs", {"unit": "nginx", "lines": 20}),
+    ("VectorStoreSearch", {"query": "nginx fails to start no space left on device"}),
+]
+
+# Knowledge base documents loaded into the in-memory vector store
+KNOWLEDGE_BASE = [
+    "When a disk is full, services fail to write PID files and logs. Free space with journalctl --vacuum-size.",
+    "nginx refuses to start if its configuration test fails; run nginx -t to see the error.",
+    "High load average with low CPU usage usually means processes are blocked on I/O.",
+    "Use du -xh / | sort -h | tail to find the largest directories on the root filesystem.",
+    "The OOM killer logs to the kernel ring buffer; check dmesg for 'Out of memory' messages.",
+]
+
+
+class ScriptedChatModel(ChatModel):
+    """Chat model replaying a fixed troubleshooting script with simulated latency."""
+
+    model_id = "scripted"
+    provider_id = "ollama"
+
+    def __init__(
+        self,
+        first_token_latency: float = 0.05,
+        token_latency: float = 0.005,
+        answer_tokens: int = 40,
+    ) -> None:
+        """Create the model.
+
+        Args:
+            first_token_latency: Delay before the first chunk of every call (seconds).
+            token_latency: Delay between streamed answer chunks (seconds).
+            answer_tokens: Number of chunks the final answer is streamed in.
+        """
+        super().__init__(parameters=ChatModelParameters(stream=True), allow_parallel_tool_calls=True)
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.answer_tokens = answer_tokens
+        self.calls = 0
+        self.model_time = 0.0
+
+    async def _create(self, input: Any, run: Any) -> ChatModelOutput:
+        chunks = [chunk async for chunk in self._create_stream(input, run)]
+        return ChatModelOutput.from_chunks(chunks)
+
+    def _next_calls(self, input: Any) -> List[MessageToolCallContent]:
+        """Pick the tool calls of the next step from the conversation so far."""
+        messages = input.messages
+        last_user = max((i for i, msg in enumerate(messages) if isinstance(msg, UserMessage)), default=-1)
+        called = {
+            content.tool_name
+            for msg in messages[last_user + 1:] if isinstance(msg, AssistantMessage)
+            for content in msg.get_tool_calls()
+        }
+        offered = {tool.name for tool in input.tools or []}
+
+        if isinstance(input.tool_choice, Tool) and input.tool_choice.name != "final_answer":
+            forced = input.tool_choice.name
+            args = {"thoughts": "Check disk space, the service state and the knowledge base."} if forced == "think" else {}
+            return [MessageToolCallContent(id=f"call_{self.calls}_0", tool_name=forced, args=json.dumps(args))]
+        if not called - {"think"}:
+            diagnostics = [(name, args) for name, args in DIAGNOSTIC_CALLS if name in offered]
+            if diagnostics:
+                return [
+                    MessageToolCallContent(id=f"call_{self.calls}_{i}", tool_name=name, args=json.dumps(args))
+                    for i, (name, args) in enumerate(diagnostics)
+                ]
+        return []
+
+    async def _create_stream(self, input: Any, run: Any) -> AsyncGenerator[ChatModelOutput, None]:
+        self.calls += 1
+        start = time.perf_counter()
+        usage = ChatModelUsage(prompt_tokens=1500, completion_tokens=60, total_tokens=1560)
+        try:
+            await asyncio.sleep(self.first_token_latency)
+            calls = self._next_calls(input)
+            if calls:
+                yield ChatModelOutput(output=[AssistantMessage(calls)], usage=usage)
+                return
+
+            words = [f"word{i}" for i in range(self.answer_tokens)]
+            answer = "The root filesystem is 98% full, so nginx cannot start. " + " ".join(words)
+            args = json.dumps({"response": answer})
+            step = max(1, math.ceil(len(args) / self.answer_tokens))
+            for offset in range(0, len(args), step):
+                if offset:
+                    await asyncio.sleep(self.token_latency)
+                chunk = MessageToolCallContent(id=f"call_{self.calls}_answer", tool_name="final_answer",
+                                               args=args[offset:offset + step])
+                output = ChatModelOutput(output=[AssistantMessage(chunk)])
+                if not offset:
+                    output.usage = usage
+                yield output
+        finally:
+            self.model_time += time.perf_counter() - start
+
+
+class HashingEmbeddingModel(EmbeddingModel):
+    """Deterministic bag-of-words embedding model (feature hashing)."""
+
+    def __init__(self, dimensions: int = 64) -> None:
+        super().__init__()
+        self.dimensions = dimensions
+
+    @property
+    def model_id(self) -> str:
+        return "hashing"
+
+    @property
+    def provider_id(self) -> Any:
+        return "ollama"
+
+    def embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for word in text.lower().split():
+            digest = hashlib.md5(word.encode("utf-8")).digest()
+            vector[digest[0] % self.dimensions] += 1.0 if digest[1] % 2 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    async def _create(self, input: Any, run: Any) -> EmbeddingModelOutput:
+        return EmbeddingModelOutput(values=input.values, embeddings=[self.embed(text) for text in input.values])
+
+
+def create_fake_rag_tool() -> Tool:
+    """Create the RAG search tool on an in-memory vector store (no database)."""
+    store = TemporalVectorStore(embedding_model=HashingEmbeddingModel())
+    documents = [Document(content=text, metadata={"source": f"doc_{i}.md"}) for i, text in enumerate(KNOWLEDGE_BASE)]
+    # Called from a worker thread during startup, so it may run its own loop
+    asyncio.run(store.add_documents(documents))
+    return VectorStoreSearchTool(vector_store=store)
+
+
+def prepare_fake_mcp_server(directory: Path) -> Path:
+    """Lay out the fake MCP server like a linux-mcp-server checkout.
+
+    Args:
+        directory: Empty directory to populate.
+
+    Returns:
+        Path: The server directory to use as LINUX_MCP_SERVER_PATH.
+    """
+    venv_bin = directory / ".venv" / "bin"
+    venv_bin.mkdir(parents=True, exist_ok=True)
+    python = venv_bin / "python"
+    if not python.exists():
+        os.symlink(sys.executable, python)
+    shutil.copy(Path(__file__).with_name("fake_mcp_server.py"), directory / "linux_mcp_server.py")
+    return directory
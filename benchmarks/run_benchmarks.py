@@ -0,0 +1,305 @@
+"""End-to-end startup and per-query latency benchmarks with offline fakes.
+
+Runs the real create_troubleshooting_agent() and agent runs against a
+scripted chat model, the fake MCP stdio server (through the real session
+pool) and an in-memory vector store, and measures:
+
+- import time of the CLI entry module (fresh interpreter),
+- cold start of create_troubleshooting_agent() per component,
+- time-to-first-token, end-to-end latency and per-step overhead
+  (latency not spent in the model) of each query,
+- Python heap peak (tracemalloc) and max RSS.
+
+Results are written as JSON; --compare reports the change against a
+previous result and exits non-zero when a metric regresses by more than
+--threshold percent.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --queries 20 --output baseline.json
+    python -m benchmarks.run_benchmarks --compare baseline.json --threshold 15
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+from dotenv import load_dotenv
+
+# Default directory for result files
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Metrics compared by --compare (dotted paths into the result; lower is better)
+COMPARED_METRICS = [
+    "import_ms",
+    "cold_start.total",
+    "queries.ttft_p50",
+    "queries.latency_p50",
+    "queries.overhead_per_step_p50",
+    "memory.tracemalloc_peak_mb",
+]
+
+QUERY = "nginx fails to start on the web server, what is wrong?"
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def _max_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def measure_import_ms(module: str = "agent") -> float:
+    """Import time of a module in a fresh interpreter, in milliseconds."""
+    from utils.profile_imports import profile_module, total_ms
+
+    return min(total_ms(profile_module(module), module) for _ in range(3))
+
+
+def _make_timing_printer():
+    """Create a StreamingPrinter that records first-token and tool timings."""
+    from agent import StreamingPrinter
+
+    class TimingPrinter(StreamingPrinter):
+        def __init__(self) -> None:
+            super().__init__(stream=io.StringIO())
+            self.first_token_at: Optional[float] = None
+            self.tool_time = 0.0
+            self._tool_started: Dict[str, float] = {}
+
+        def on_final_answer(self, data: Any, event: Any) -> None:
+            if self.first_token_at is None and getattr(data, "delta", ""):
+                self.first_token_at = time.perf_counter()
+            super().on_final_answer(data, event)
+
+        def on_tool_event(self, data: Any, event: Any) -> None:
+            run_id = event.trace.run_id if event.trace is not None else event.path
+            if event.name == "start":
+                self._tool_started[run_id] = time.perf_counter()
+            elif run_id in self._tool_started:
+                self.tool_time += time.perf_counter() - self._tool_started.pop(run_id)
+            super().on_tool_event(data, event)
+
+    return TimingPrinter()
+
+
+async def benchmark_query(agent: Any, model: Any) -> Dict[str, Any]:
+    """Run one query on a fork of the agent and collect its timings."""
+    from agent import fork_agent, run_with_streaming
+    from config.logging_config import create_event_observer
+
+    printer = _make_timing_printer()
+    calls_before, model_time_before = model.calls, model.model_time
+    start = time.perf_counter()
+    # The trajectory middleware prints tool events; keep its cost but not its output
+    with contextlib.redirect_stdout(io.StringIO()):
+        await run_with_streaming(fork_agent(agent), QUERY, printer, observer=create_event_observer())
+    latency = time.perf_counter() - start
+
+    # Every model call is one agent step
+    steps = max(1, model.calls - calls_before)
+    model_time = model.model_time - model_time_before
+    return {
+        "latency": latency,
+        "ttft": (printer.first_token_at - start) if printer.first_token_at else latency,
+        "model_time": model_time,
+        "tool_calls": printer.tool_calls,
+        "tool_time": printer.tool_time,
+        "steps": steps,
+        "overhead_per_step": max(0.0, latency - model_time) / steps,
+    }
+
+
+async def run_suite(
+    queries: int = 10,
+    first_token_latency: float = 0.05,
+    token_latency: float = 0.005,
+    mcp_latency: float = 0.0,
+) -> Dict[str, Any]:
+    """Run the benchmark suite and return the result document."""
+    from benchmarks.fakes import ScriptedChatModel, create_fake_rag_tool, prepare_fake_mcp_server
+
+    model = ScriptedChatModel(first_token_latency=first_token_latency, token_latency=token_latency)
+    with tempfile.TemporaryDirectory(prefix="bench-mcp-") as server_dir:
+        prepare_fake_mcp_server(Path(server_dir))
+        environment = {
+            "LINUX_MCP_SERVER_PATH": server_dir,
+            "FAKE_MCP_LATENCY": str(mcp_latency),
+            "RAG_ENABLED": "true",
+            "DEBUG": "false",
+        }
+        with patch.dict(os.environ, environment), \
+             patch("agent.create_chat_model", return_value=model), \
+             patch("agent.create_rag_tool", side_effect=create_fake_rag_tool):
+            import agent as agent_module
+            from tools.mcp_session_pool import close_session_pools
+
+            tracemalloc.start()
+            try:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    agent = await agent_module.create_troubleshooting_agent()
+                cold_start = time.perf_counter() - start
+                report = agent_module.last_startup_report
+                startup_peak = tracemalloc.get_traced_memory()[1]
+
+                runs = [await benchmark_query(agent, model) for _ in range(queries)]
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+                await close_session_pools()
+
+    def summary(key: str) -> Dict[str, float]:
+        values = [run[key] for run in runs]
+        return {
+            f"{key}_p50": statistics.median(values) if values else 0.0,
+            f"{key}_p95": _percentile(values, 0.95),
+        }
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "queries": queries,
+            "first_token_latency": first_token_latency,
+            "token_latency": token_latency,
+            "mcp_latency": mcp_latency,
+        },
+        "cold_start": {
+            "total": cold_start,
+            "components": {t.component: {"duration": t.duration, "status": t.status} for t in report.timings},
+        },
+        "queries": {
+            "count": len(runs),
+            **summary("latency"),
+            **summary("ttft"),
+            **summary("overhead_per_step"),
+            "tool_calls_per_query": statistics.mean(run["tool_calls"] for run in runs) if runs else 0.0,
+        },
+        "memory": {
+            "tracemalloc_startup_mb": startup_peak / (1024 * 1024),
+            "tracemalloc_peak_mb": peak / (1024 * 1024),
+            "max_rss_mb": _max_rss_mb(),
+        },
+        "runs": runs,
+    }
+
+
+def _lookup(result: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = result
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Compare key metrics against a baseline result.
+
+    Args:
+        current: Result of this run.
+        baseline: Previous result.
+        threshold: Allowed increase in percent before a metric counts as a regression.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per metric with values, change and regression flag.
+    """
+    rows = []
+    for metric in COMPARED_METRICS:
+        new, old = _lookup(current, metric), _lookup(baseline, metric)
+        if new is None or old is None:
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        rows.append({"metric": metric, "baseline": old, "current": new, "change": change,
+                     "regression": change > threshold})
+    return rows
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    """Format the headline numbers of a result."""
+    queries, memory = result["queries"], result["memory"]
+    lines = [
+        f"import agent      {result['import_ms']:8.1f} ms",
+        f"cold start        {result['cold_start']['total'] * 1000:8.1f} ms  "
+        + ", ".join(f"{name} {c['duration'] * 1000:.0f} ms ({c['status']})"
+                    for name, c in result["cold_start"]["components"].items()),
+        f"time to 1st token {queries['ttft_p50'] * 1000:8.1f} ms  (p95 {queries['ttft_p95'] * 1000:.1f} ms)",
+        f"query latency     {queries['latency_p50'] * 1000:8.1f} ms  (p95 {queries['latency_p95'] * 1000:.1f} ms)",
+        f"overhead / step   {queries['overhead_per_step_p50'] * 1000:8.1f} ms  "
+        f"(p95 {queries['overhead_per_step_p95'] * 1000:.1f} ms)",
+        f"memory            {memory['tracemalloc_peak_mb']:8.1f} MiB heap peak, {memory['max_rss_mb']:.0f} MiB max RSS",
+    ]
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark agent startup and query latency offline.")
+    parser.add_argument("--queries", type=int, default=10, help="Queries to run after startup")
+    parser.add_argument("--first-token-latency", type=float, default=0.05,
+                        help="Simulated model latency before the first chunk (seconds)")
+    parser.add_argument("--token-latency", type=float, default=0.005,
+                        help="Simulated latency between streamed chunks (seconds)")
+    parser.add_argument("--mcp-latency", type=float, default=0.0, help="Simulated MCP tool latency (seconds)")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/benchmark-<timestamp>.json)")
+    parser.add_argument("--compare", help="Baseline result file to compare against")
+    parser.add_argument("--threshold", type=float, default=20.0,
+                        help="Allowed regression in percent for --compare (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks and return the process exit code."""
+    args = parse_args(argv)
+    load_dotenv()
+
+    import_ms = measure_import_ms()
+    result = await run_suite(
+        queries=args.queries,
+        first_token_latency=args.first_token_latency,
+        token_latency=args.token_latency,
+        mcp_latency=args.mcp_latency,
+    )
+    result = {"import_ms": import_ms, **result}
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"benchmark-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(format_result(result))
+    print(f"\nResults written to {output}")
+
+    if not args.compare:
+        return 0
+    rows = compare(result, json.loads(Path(args.compare).read_text()), args.threshold)
+    print(f"\nComparison with {args.compare} (threshold {args.threshold:g}%):")
+    for row in rows:
+        flag = "❌" if row["regression"] else "  "
+        print(f"  {flag} {row['metric']:<32} {row['baseline']:>10.4f} -> {row['current']:>10.4f} ({row['change']:+.1f}%)")
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
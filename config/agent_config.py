@@ -0,0 +1,161 @@
+"""Agent runtime configuration (startup behaviour, execution limits)."""
+import os
+import socket
+import tempfile
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, Union
+
+
+# Default per-component startup timeouts in seconds
+DEFAULT_STARTUP_TIMEOUTS = {
+    "llm": 30.0,
+    "rag": 30.0,
+    "mcp": 60.0,
+    "instructions": 10.0,
+}
+
+
+def get_startup_timeout(component: str) -> float:
+    """Get the startup timeout for an agent component from environment variables.
+
+    Reads STARTUP_TIMEOUT_<COMPONENT> (e.g. STARTUP_TIMEOUT_MCP=45).
+
+    Args:
+        component: Component name ('llm', 'rag', 'mcp' or 'instructions').
+
+    Returns:
+        float: Timeout in seconds. Falls back to the component default
+        (or 30s for unknown components) when unset or invalid.
+    """
+    default = DEFAULT_STARTUP_TIMEOUTS.get(component, 30.0)
+    try:
+        timeout = float(os.getenv(f"STARTUP_TIMEOUT_{component.upper()}", str(default)))
+        return timeout if timeout > 0 else default
+    except (ValueError, TypeError):
+        return default
+
+
+def get_rag_enabled() -> bool:
+    """Get whether the RAG knowledge base tool should be created.
+
+    With RAG_ENABLED=false the agent starts without the knowledge base and
+    never imports the vector store / langchain stack.
+
+    Returns:
+        bool: False only if RAG_ENABLED=false. Defaults to True.
+    """
+    return os.getenv("RAG_ENABLED", "true").lower() != "false"
+
+
+def get_default_daemon_socket() -> str:
+    """Get the default Unix socket path of the agent daemon.
+
+    The socket lives in a directory only the user can write to: the user's
+    runtime directory ($XDG_RUNTIME_DIR), or else a per-user directory in
+    the temp directory that the daemon creates with mode 0700. A socket at
+    a predictable path in the shared temp directory could be created first
+    by another user.
+
+    Returns:
+        str: Socket path.
+    """
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "troubleshooting-agent.sock")
+    return os.path.join(tempfile.gettempdir(), f"troubleshooting-agent-{os.getuid()}", "agent.sock")
+
+
+def get_daemon_address() -> Union[str, Tuple[str, int]]:
+    """Get the address the agent daemon listens on.
+
+    AGENT_DAEMON_PORT selects a localhost TCP port (which requires
+    AGENT_DAEMON_TOKEN); otherwise the daemon listens on the Unix socket
+    AGENT_DAEMON_SOCKET.
+
+    Returns:
+        Union[str, Tuple[str, int]]: Unix socket path, or (host, port) for TCP.
+        Defaults to get_default_daemon_socket().
+    """
+    port = os.getenv("AGENT_DAEMON_PORT")
+    if port:
+        try:
+            return ("127.0.0.1", int(port))
+        except ValueError:
+            pass
+    return os.getenv("AGENT_DAEMON_SOCKET") or get_default_daemon_socket()
+
+
+def get_daemon_token() -> Optional[str]:
+    """Get the shared secret clients must send to the agent daemon.
+
+    Any local user can connect to a localhost TCP port, so the daemon
+    refuses to listen on AGENT_DAEMON_PORT without a token. On a Unix
+    socket, which only its owner can use, the token is optional.
+
+    Returns:
+        Optional[str]: Value of AGENT_DAEMON_TOKEN, or None if unset.
+    """
+    return os.getenv("AGENT_DAEMON_TOKEN") or None
+
+
+def get_daemon_max_concurrency() -> int:
+    """Get the maximum number of queries the daemon answers at once.
+
+    Returns:
+        int: Value of AGENT_DAEMON_MAX_CONCURRENCY. Defaults to 4.
+    """
+    try:
+        return max(1, int(os.getenv("AGENT_DAEMON_MAX_CONCURRENCY", "4")))
+    except (ValueError, TypeError):
+        return 4
+
+
+def get_batch_concurrency() -> int:
+    """Get the number of agent runs executed at once in batch mode.
+
+    Returns:
+        int: Value of BATCH_CONCURRENCY. Defaults to 4.
+    """
+    try:
+        return max(1, int(os.getenv("BATCH_CONCURRENCY", "4")))
+    except (ValueError, TypeError):
+        return 4
+
+
+@dataclass
+class AnswerCacheConfig:
+    """Configuration for the semantic cache of final answers."""
+
+    path: Optional[str] = None
+    threshold: float = 0.92
+    max_age: float = 900.0
+    max_entries: int = 1000
+    verify_rate: float = 0.0
+    host: str = field(default_factory=socket.gethostname)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether answers are cached (ANSWER_CACHE_PATH is set)."""
+        return bool(self.path)
+
+    @classmethod
+    def from_env(cls) -> "AnswerCacheConfig":
+        """Load answer cache configuration from environment variables.
+
+        Returns:
+            AnswerCacheConfig: Configuration loaded from environment.
+        """
+        def number(name: str, default: float, minimum: float, maximum: float) -> float:
+            try:
+                return min(maximum, max(minimum, float(os.getenv(name, str(default)))))
+            except (ValueError, TypeError):
+                return default
+
+        return cls(
+            path=os.getenv("ANSWER_CACHE_PATH") or None,
+            threshold=number("ANSWER_CACHE_THRESHOLD", cls.threshold, 0.0, 1.0),
+            max_age=number("ANSWER_CACHE_MAX_AGE", cls.max_age, 1.0, float("inf")),
+            max_entries=int(number("ANSWER_CACHE_MAX_ENTRIES", cls.max_entries, 1, float("inf"))),
+            verify_rate=number("ANSWER_CACHE_VERIFY_RATE", cls.verify_rate, 0.0, 1.0),
+            host=os.getenv("ANSWER_CACHE_HOST") or socket.gethostname(),
+        )
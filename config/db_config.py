@@ -1,7 +1,32 @@
 """Database configuration for postgres+pgvector RAG database."""
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from config.logging_config import get_logger
+
+N = TypeVar("N", int, float)
+
+
+def _get_number(name: str, default: N, cast: Callable[[str], N] = int, allow_zero: bool = False) -> N:
+    """Read a positive number environment variable, falling back to the default if it is malformed."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        number = cast(value)
+    except ValueError:
+        number = None
+    if number is None or number < 0 or (number == 0 and not allow_zero):
+        expected = "non-negative" if allow_zero else "positive"
+        get_logger().warning(f"Ignoring invalid {name}={value!r} (expected a {expected} number), using {default}")
+        return default
+    return number
+
+
+def _get_optional_int(name: str) -> Optional[int]:
+    """Read an optional positive integer environment variable (None if unset or invalid)."""
+    return _get_number(name, None) if os.getenv(name) else None
 
 
 @dataclass
@@ -13,6 +38,17 @@ class DatabaseConfig:
     database: str
     user: Optional[str] = None
     password: Optional[str] = None
+    # Connection pool settings (SQLAlchemy QueuePool)
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    pool_timeout: float = 30.0
+    connect_timeout: int = 10
+    statement_timeout_ms: int = 30000
+    # ANN search accuracy/speed trade-off (None keeps the server default)
+    hnsw_ef_search: Optional[int] = None
+    ivfflat_probes: Optional[int] = None
 
     @classmethod
     def from_env(cls) -> "DatabaseConfig":
@@ -27,8 +63,47 @@ class DatabaseConfig:
             database=os.getenv("POSTGRES_DB", "rag_db"),
             user=os.getenv("POSTGRES_USER"),
             password=os.getenv("POSTGRES_PASSWORD"),
+            pool_size=_get_number("POSTGRES_POOL_SIZE", cls.pool_size),
+            max_overflow=_get_number("POSTGRES_MAX_OVERFLOW", cls.max_overflow, allow_zero=True),
+            pool_recycle=_get_number("POSTGRES_POOL_RECYCLE", cls.pool_recycle),
+            pool_pre_ping=os.getenv("POSTGRES_POOL_PRE_PING", "true").lower() != "false",
+            pool_timeout=_get_number("POSTGRES_POOL_TIMEOUT", cls.pool_timeout, float),
+            connect_timeout=_get_number("POSTGRES_CONNECT_TIMEOUT", cls.connect_timeout),
+            # 0 disables the statement timeout
+            statement_timeout_ms=_get_number("POSTGRES_STATEMENT_TIMEOUT_MS", cls.statement_timeout_ms, allow_zero=True),
+            hnsw_ef_search=_get_optional_int("POSTGRES_HNSW_EF_SEARCH"),
+            ivfflat_probes=_get_optional_int("POSTGRES_IVFFLAT_PROBES"),
         )
 
+    def engine_args(self) -> Dict[str, Any]:
+        """Build SQLAlchemy create_engine() arguments for the connection pool.
+        
+        pool_size connections are kept open and up to max_overflow more are
+        opened under load. Connections are validated before use (pre-ping)
+        and recycled after pool_recycle seconds so stale ones don't stall
+        queries. statement_timeout_ms (0 disables it) and the HNSW ef_search /
+        IVFFlat probes settings are applied server-side to every connection.
+        
+        Returns:
+            Dict[str, Any]: Keyword arguments for sqlalchemy.create_engine.
+        """
+        options = f"-c statement_timeout={self.statement_timeout_ms}"
+        if self.hnsw_ef_search:
+            options += f" -c hnsw.ef_search={self.hnsw_ef_search}"
+        if self.ivfflat_probes:
+            options += f" -c ivfflat.probes={self.ivfflat_probes}"
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "pool_timeout": self.pool_timeout,
+            "connect_args": {
+                "connect_timeout": self.connect_timeout,
+                "options": options,
+            },
+        }
+
 
 def get_connection_string() -> str:
     """Build PostgreSQL connection string for pgvector.
@@ -47,3 +122,12 @@ def get_connection_string() -> str:
     
     return f"postgresql+psycopg://{auth}{config.host}:{config.port}/{config.database}"
 
+
+
+def get_engine_args() -> Dict[str, Any]:
+    """Build SQLAlchemy engine arguments (connection pooling, timeouts).
+    
+    Returns:
+        Dict[str, Any]: Keyword arguments for sqlalchemy.create_engine.
+    """
+    return DatabaseConfig.from_env().engine_args()
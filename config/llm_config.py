@@ -1,9 +1,12 @@
 """LLM configuration module for multi-provider support."""
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
 
-from beeai_framework.backend import ChatModel, ChatModelParameters
+# beeai_framework.backend pulls in the provider SDKs; import it on first use
+if TYPE_CHECKING:
+    from beeai_framework.backend import ChatModel
 
 
 # Default models for each provider
@@ -23,6 +26,14 @@ DEFAULT_EMBEDDING_MODELS = {
     "gemini": "text-embedding-004",
 }
 
+# Vector dimensions of the default embedding models
+EMBEDDING_DIMENSIONS = {
+    "ibm/slate-125m-english-rtrvr-v2": 768,
+    "text-embedding-3-small": 1536,
+    "nomic-embed-text": 768,
+    "text-embedding-004": 768,
+}
+
 
 def get_llm_config() -> Tuple[str, str]:
     """Get LLM provider and model from environment variables.
@@ -41,6 +52,130 @@ def get_llm_config() -> Tuple[str, str]:
     return provider, model
 
 
+def get_llm_fallbacks() -> List[Tuple[str, str]]:
+    """Get the chat models to fall back to when the configured one fails.
+    
+    LLM_FALLBACKS is a comma-separated list of ``provider`` or
+    ``provider:model`` entries, tried in order (e.g. "ollama:llama3.2,openai").
+    
+    Returns:
+        List[Tuple[str, str]]: (provider, model) tuples; the provider's
+        default model is used when none is given. Empty by default.
+    """
+    fallbacks = []
+    for entry in os.getenv("LLM_FALLBACKS", "").split(","):
+        provider, _, model = entry.strip().partition(":")
+        provider = provider.lower()
+        if provider:
+            fallbacks.append((provider, model or DEFAULT_MODELS.get(provider, DEFAULT_MODELS["watsonx"])))
+    return fallbacks
+
+
+def get_llm_router_model() -> Optional[Tuple[str, str]]:
+    """Get the small model answering triage steps in front of the configured one.
+    
+    LLM_ROUTER_MODEL is ``provider`` or ``provider:model`` (e.g.
+    "ollama:llama3.2"). Intent classification, thinking and tool selection
+    steps go to this model; the final answer is written by the configured
+    (large) model.
+    
+    Returns:
+        Optional[Tuple[str, str]]: (provider, model), or None to send every
+        step to the configured model (the default).
+    """
+    provider, _, model = os.getenv("LLM_ROUTER_MODEL", "").strip().partition(":")
+    provider = provider.lower()
+    if not provider:
+        return None
+    return provider, model or DEFAULT_MODELS.get(provider, DEFAULT_MODELS["watsonx"])
+
+
+def get_llm_attempt_timeout() -> float:
+    """Get how long a fallback chain waits for a model before trying the next.
+    
+    Returns:
+        float: Seconds to wait for the first (and each next streamed) chunk.
+        Defaults to 60.
+    """
+    try:
+        timeout = float(os.getenv("LLM_ATTEMPT_TIMEOUT", "60"))
+        return timeout if timeout > 0 else 60.0
+    except (ValueError, TypeError):
+        return 60.0
+
+
+def get_llm_hedge() -> bool:
+    """Get whether slow requests are hedged with the next fallback model.
+    
+    Returns:
+        bool: True if LLM_HEDGE=true, False otherwise.
+    """
+    return os.getenv("LLM_HEDGE", "false").lower() == "true"
+
+
+def get_llm_hedge_delay() -> float:
+    """Get the hedge delay used until a model's p95 latency is known.
+    
+    Returns:
+        float: Seconds. Defaults to 5.
+    """
+    try:
+        delay = float(os.getenv("LLM_HEDGE_DELAY", "5"))
+        return delay if delay > 0 else 5.0
+    except (ValueError, TypeError):
+        return 5.0
+
+
+@dataclass
+class RateLimitConfig:
+    """Client-side request limits of one provider, shared by chat and embedding calls."""
+    
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    max_in_flight: Optional[int] = None
+    max_retries: int = 4
+    backoff: float = 1.0
+    max_backoff: float = 60.0
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether any limit is set for the provider."""
+        return bool(self.requests_per_minute or self.tokens_per_minute or self.max_in_flight)
+    
+    @classmethod
+    def from_env(cls, provider: str) -> "RateLimitConfig":
+        """Load the limits of a provider from environment variables.
+        
+        RATE_LIMIT_<PROVIDER>_RPM, _TPM and _MAX_IN_FLIGHT set the limits
+        (e.g. RATE_LIMIT_WATSONX_RPM=120); RATE_LIMIT_MAX_RETRIES,
+        RATE_LIMIT_BACKOFF and RATE_LIMIT_MAX_BACKOFF apply to all providers.
+        
+        Args:
+            provider: Provider name (e.g. 'watsonx').
+            
+        Returns:
+            RateLimitConfig: Configuration loaded from environment.
+        """
+        def number(name: str, default: Optional[float]) -> Optional[float]:
+            try:
+                value = float(os.getenv(name, ""))
+            except (ValueError, TypeError):
+                return default
+            return value if value > 0 else default
+        
+        prefix = f"RATE_LIMIT_{provider.upper()}_"
+        max_in_flight = number(prefix + "MAX_IN_FLIGHT", None)
+        retries = os.getenv("RATE_LIMIT_MAX_RETRIES", "")
+        return cls(
+            requests_per_minute=number(prefix + "RPM", None),
+            tokens_per_minute=number(prefix + "TPM", None),
+            max_in_flight=int(max_in_flight) if max_in_flight else None,
+            max_retries=int(retries) if retries.isdigit() else cls.max_retries,
+            backoff=number("RATE_LIMIT_BACKOFF", cls.backoff),
+            max_backoff=number("RATE_LIMIT_MAX_BACKOFF", cls.max_backoff),
+        )
+
+
 def get_embedding_model_config() -> Tuple[str, str]:
     """Get embedding model provider and model from environment variables.
     
@@ -69,6 +204,98 @@ def get_embedding_model_config() -> Tuple[str, str]:
     return provider, model
 
 
+def get_embedding_dimensions(model: Optional[str] = None) -> Optional[int]:
+    """Get the vector dimensions of the embedding model.
+    
+    The vector store declares its embedding column with these dimensions,
+    which HNSW and IVFFlat indexes require.
+    
+    Args:
+        model: Embedding model name. Defaults to the configured model.
+        
+    Returns:
+        Optional[int]: EMBEDDING_DIMENSIONS, else the known dimensions of the
+        model, else None (untyped column).
+    """
+    try:
+        dimensions = int(os.getenv("EMBEDDING_DIMENSIONS", ""))
+        if dimensions > 0:
+            return dimensions
+    except (ValueError, TypeError):
+        pass
+    if model is None:
+        _, model = get_embedding_model_config()
+    return EMBEDDING_DIMENSIONS.get(model)
+
+
+def get_embedding_cache_size() -> int:
+    """Get the number of query embeddings kept in memory.
+    
+    Returns:
+        int: Maximum cached embeddings (0 disables the cache). Defaults to 1024.
+    """
+    try:
+        return max(0, int(os.getenv("EMBEDDING_CACHE_SIZE", "1024")))
+    except (ValueError, TypeError):
+        return 1024
+
+
+def get_embedding_cache_path() -> Optional[str]:
+    """Get the path of the on-disk embedding cache.
+    
+    Returns:
+        Optional[str]: SQLite file from EMBEDDING_CACHE_PATH, or None to
+        keep embeddings in memory only.
+    """
+    return os.getenv("EMBEDDING_CACHE_PATH") or None
+
+
+def get_llm_cache_path() -> Optional[str]:
+    """Get the path of the on-disk LLM response cache.
+    
+    Returns:
+        Optional[str]: SQLite file from LLM_CACHE_PATH, or None to always
+        call the provider (the default).
+    """
+    return os.getenv("LLM_CACHE_PATH") or None
+
+
+def get_llm_cache_ttl() -> int:
+    """Get how long a cached LLM response stays valid.
+    
+    Returns:
+        int: Seconds (0 keeps responses until evicted). Defaults to 86400.
+    """
+    try:
+        return max(0, int(os.getenv("LLM_CACHE_TTL", "86400")))
+    except (ValueError, TypeError):
+        return 86400
+
+
+def get_llm_cache_max_entries() -> int:
+    """Get the maximum number of cached LLM responses.
+    
+    Returns:
+        int: Maximum entries before the least recently used are evicted.
+        Defaults to 1000.
+    """
+    try:
+        return max(1, int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000")))
+    except (ValueError, TypeError):
+        return 1000
+
+
+def get_llm_cache_bypass() -> bool:
+    """Get whether cached LLM responses should be ignored for this run.
+    
+    Fresh responses are still stored, so a bypassed run refreshes the cache.
+    
+    Returns:
+        bool: True if LLM_CACHE_BYPASS=true, False otherwise.
+    """
+    return os.getenv("LLM_CACHE_BYPASS", "false").lower() == "true"
+
+
 def get_llm_temperature() -> float:
     """Get LLM temperature from environment variable.
     
@@ -107,6 +334,30 @@ def get_memory_max_tokens() -> int:
         return 12000
 
 
+def get_llm_parallel_tool_calls() -> bool:
+    """Get whether the LLM may request several tool calls in one step.
+    
+    When enabled, independent tool calls emitted in the same step are
+    executed concurrently by the agent.
+    
+    Returns:
+        bool: False only if LLM_PARALLEL_TOOL_CALLS=false. Defaults to True.
+    """
+    return os.getenv("LLM_PARALLEL_TOOL_CALLS", "true").lower() != "false"
+
+
+def get_llm_stream() -> bool:
+    """Get whether the LLM response should be streamed token by token.
+    
+    Streaming lets the terminal show the final answer as it is generated
+    instead of after the whole multi-step run has finished.
+    
+    Returns:
+        bool: False only if LLM_STREAM=false. Defaults to True.
+    """
+    return os.getenv("LLM_STREAM", "true").lower() != "false"
+
+
 def get_agent_instructions_file() -> str:
     """Get path to agent instructions file from environment variable.
     
@@ -148,25 +399,76 @@ def create_chat_model(
     model: str,
     temperature: float = 0.7,
     max_tokens: int = 2048,
-) -> ChatModel:
+    parallel_tool_calls: bool = False,
+    stream: bool = False,
+    fallbacks: Sequence[Tuple[str, str]] = (),
+) -> "ChatModel":
     """Create a ChatModel instance for the specified provider and model.
     
+    When LLM_CACHE_PATH is set, responses are cached on disk and identical
+    requests (same messages, tools and parameters) are answered locally.
+    Requests are kept within the provider's RATE_LIMIT_<PROVIDER>_* limits.
+    
     Args:
         provider: The LLM provider (e.g., 'openai', 'ollama', 'watsonx', 'gemini').
         model: The model name for that provider.
         temperature: Temperature parameter for generation.
         max_tokens: Maximum tokens to generate.
+        parallel_tool_calls: Allow the model to emit several tool calls per step.
+        stream: Stream the response from the provider token by token.
+        fallbacks: (provider, model) pairs tried in order when the model fails
+            or times out (LLM_ATTEMPT_TIMEOUT, LLM_HEDGE, LLM_HEDGE_DELAY).
         
     Returns:
         ChatModel: Configured chat model instance.
     """
+    from beeai_framework.backend import ChatModel, ChatModelParameters
+    
+    if fallbacks:
+        from tools.llm_fallback import FallbackChatModel
+        
+        return FallbackChatModel(
+            [
+                create_chat_model(name, model_id, temperature, max_tokens, parallel_tool_calls, stream)
+                for name, model_id in [(provider, model), *fallbacks]
+            ],
+            attempt_timeout=get_llm_attempt_timeout(),
+            hedge=get_llm_hedge(),
+            hedge_delay=get_llm_hedge_delay(),
+        )
+    
     model_name = f"{provider}:{model}"
     
-    return ChatModel.from_name(
+    # Only the adapter of the selected provider is imported by from_name
+    chat_model = ChatModel.from_name(
         model_name,
         ChatModelParameters(
             temperature=temperature,
             max_tokens=max_tokens,
-        )
+            stream=stream,
+        ),
+        allow_parallel_tool_calls=parallel_tool_calls,
     )
-
+    
+    from tools.rate_limiter import RateLimitedChatModel, get_rate_limiter
+    
+    limiter = get_rate_limiter(provider)
+    if limiter is not None:
+        chat_model = RateLimitedChatModel(chat_model, limiter)
+    
+    # The cache sits in front of the limiter, so cached answers use no quota
+    cache_path = get_llm_cache_path()
+    if cache_path:
+        from tools.llm_cache import DiskChatModelCache
+        
+        chat_model.config(
+            cache=DiskChatModelCache(
+                cache_path,
+                model_name,
+                ttl=get_llm_cache_ttl(),
+                max_entries=get_llm_cache_max_entries(),
+                bypass=get_llm_cache_bypass(),
+            )
+        )
+    
+    return chat_model
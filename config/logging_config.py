@@ -1,22 +1,35 @@
 """Logging configuration module with structured file logging and DEBUG toggle.
 
 This module provides:
-- Structured file logging with readable format
+- Structured file logging with readable format, written by a background
+  thread through a bounded queue so logging never blocks the event loop
 - Clean console output based on DEBUG flag
 - BeeAI Logger configuration through environment variables
 - Multiline message support
 """
+import atexit
 import os
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Callable
+from typing import Any, Callable, List
 
 # Configuration constants
 LOG_DIR = Path("logs")
 DEBUG_ENV_VAR = "DEBUG"
 BEEAI_LOG_LEVEL_ENV_VAR = "BEEAI_LOG_LEVEL"
+LOG_QUEUE_SIZE_ENV_VAR = "LOG_QUEUE_SIZE"
+DEFAULT_LOG_QUEUE_SIZE = 10000
+# Seconds a WARNING or higher record may wait for room in a full queue
+LOG_QUEUE_BLOCK_TIMEOUT = 1.0
+# Event payload previews in DEBUG mode: maximum characters and nesting depth
+EVENT_PAYLOAD_LIMIT = 10000
+EVENT_PAYLOAD_DEPTH = 6
+# Events logged by the DEBUG event observer
+LOGGED_EVENTS = frozenset({"start", "success", "error"})
 
 
 def get_log_file() -> Path:
@@ -30,6 +43,8 @@ def get_log_file() -> Path:
 # Global logger instance
 _logger: logging.Logger | None = None
 _is_setup: bool = False
+_listener: logging.handlers.QueueListener | None = None
+_atexit_registered: bool = False
 
 
 def is_debug_mode() -> bool:
@@ -41,22 +56,89 @@ def is_debug_mode() -> bool:
     return os.getenv(DEBUG_ENV_VAR, "false").lower() == "true"
 
 
+def get_log_queue_size() -> int:
+    """Get the maximum number of log records waiting to be written to file.
+
+    Returns:
+        int: Queue size from LOG_QUEUE_SIZE (default: 10000). 0 writes the
+        log file synchronously, without a queue.
+    """
+    try:
+        return max(0, int(os.getenv(LOG_QUEUE_SIZE_ENV_VAR, str(DEFAULT_LOG_QUEUE_SIZE))))
+    except ValueError:
+        return DEFAULT_LOG_QUEUE_SIZE
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full.
+
+    Records below WARNING are dropped immediately when the writer thread falls
+    behind; warnings and errors wait up to LOG_QUEUE_BLOCK_TIMEOUT for room.
+    Dropped records are counted and reported in the log once there is room
+    again.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._reported = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue, applying the overflow policy."""
+        try:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record, timeout=LOG_QUEUE_BLOCK_TIMEOUT)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped > self._reported:
+            self._report_dropped(record)
+
+    def _report_dropped(self, record: logging.LogRecord) -> None:
+        """Log how many records were dropped since the last report."""
+        count = self.dropped - self._reported
+        notice = logging.LogRecord(
+            record.name, logging.WARNING, __file__, 0,
+            f"Log queue full: dropped {count} record(s)", None, None, "enqueue",
+        )
+        try:
+            self.queue.put_nowait(notice)
+        except queue.Full:
+            return
+        self._reported += count
+
+
+def shutdown_logging() -> None:
+    """Stop the log writer thread after writing all queued records."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def setup_logging() -> logging.Logger:
     """Set up logging with structured file handler and DEBUG mode configuration.
     
     Configures:
     - BeeAI Logger level through environment variable
-    - File handler for structured JSON logging
+    - File handler for structured logging, fed through a bounded queue
+      (LOG_QUEUE_SIZE) and written by a background QueueListener thread
     - Console output suppression based on DEBUG flag
     
     Returns:
         logging.Logger: Configured Python logger instance.
     """
-    global _logger, _is_setup
+    global _logger, _is_setup, _listener, _atexit_registered
     
     if _is_setup and _logger is not None:
         return _logger
     
+    # Flush and stop a writer thread left over from an earlier setup
+    shutdown_logging()
+    
     # Create log directory if it doesn't exist
     LOG_DIR.mkdir(parents=True, exist_ok=True)
     
@@ -101,7 +183,21 @@ def setup_logging() -> logging.Logger:
     log_format = '%(asctime)s | %(levelname)-8s | %(name)s:%(module)s:%(funcName)s:%(lineno)d - %(message)s'
     file_formatter = MultilineFormatter(log_format, datefmt='%Y-%m-%d %H:%M:%S')
     file_handler.setFormatter(file_formatter)
-    _logger.addHandler(file_handler)
+    
+    # Write the file from a background thread so callers on the event loop
+    # only pay for putting the record on a bounded queue
+    queue_size = get_log_queue_size()
+    if queue_size:
+        queue_handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size))
+        queue_handler.setLevel(logging.DEBUG)
+        _listener = logging.handlers.QueueListener(queue_handler.queue, file_handler, respect_handler_level=True)
+        _listener.start()
+        if not _atexit_registered:
+            atexit.register(shutdown_logging)
+            _atexit_registered = True
+        _logger.addHandler(queue_handler)
+    else:
+        _logger.addHandler(file_handler)
     
     # In DEBUG mode, add console handler
     if debug_mode:
@@ -128,78 +224,135 @@ def get_logger() -> logging.Logger:
     return _logger
 
 
+class PayloadPreview:
+    """Lazily rendered, size-capped preview of an event payload.
+
+    Passed as a logging argument, so nothing is rendered unless a handler
+    actually formats the record, and rendering stops once ``limit``
+    characters are produced instead of stringifying the whole payload
+    (e.g. the full conversation on every LLM event) and truncating it.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int = EVENT_PAYLOAD_LIMIT) -> None:
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        parts: List[str] = []
+        remaining = _render_preview(self.value, parts, self.limit, depth=0)
+        text = "".join(parts)
+        return text if remaining > 0 else text[:self.limit] + "... (truncated)"
+
+
+def _render_preview(value: Any, parts: List[str], budget: int, depth: int) -> int:
+    """Append a rendering of value to parts; return the budget left."""
+    if budget <= 0:
+        return budget
+    if isinstance(value, str):
+        parts.append(repr(value[:budget + 1]))
+        return budget - len(parts[-1])
+    if value is None or isinstance(value, (bool, int, float)):
+        parts.append(repr(value))
+        return budget - len(parts[-1])
+
+    if isinstance(value, dict):
+        items, opening, closing = value.items(), "{", "}"
+    elif isinstance(value, (list, tuple, set)):
+        items, opening, closing = ((None, item) for item in value), "[", "]"
+    elif hasattr(value, "__dict__") and depth < EVENT_PAYLOAD_DEPTH:
+        items, opening, closing = vars(value).items(), f"{type(value).__name__}(", ")"
+    else:
+        # Leaf objects without fields: their str() is assumed to be small
+        parts.append(str(value)[:budget + 1])
+        return budget - len(parts[-1])
+
+    if depth >= EVENT_PAYLOAD_DEPTH:
+        parts.append(f"{opening}...{closing}")
+        return budget - len(parts[-1])
+
+    parts.append(opening)
+    budget -= len(opening)
+    for index, (key, item) in enumerate(items):
+        if budget <= 0:
+            break
+        if index:
+            parts.append(", ")
+            budget -= 2
+        if key is not None:
+            parts.append(f"{key}=" if closing == ")" else f"{key!r}: ")
+            budget -= len(parts[-1])
+        budget = _render_preview(item, parts, budget, depth + 1)
+    parts.append(closing)
+    return budget - len(closing)
+
+
+def _is_logged_event(event: Any) -> bool:
+    """Select the events the DEBUG observer logs.
+
+    Only start/success/error of tools, chat models and agents are logged;
+    run.* mirrors of the same events and per-token events are skipped.
+    """
+    return event.name in LOGGED_EVENTS and not event.path.startswith("run.")
+
+
 def create_event_observer() -> Callable:
     """Create an event observer for comprehensive agent interaction logging.
     
-    The observer logs ALL agent events to file with full details when DEBUG=true.
-    In normal mode, only logs are captured via event observer, console stays clean.
+    When DEBUG=true the observer logs the start, success and error events of
+    tools, chat models and agents to file, with a lazily rendered payload
+    preview capped at EVENT_PAYLOAD_LIMIT characters. In normal mode nothing is
+    subscribed, so events cost nothing extra and the console stays clean.
+    With TRACE_ENABLED=true it also writes the JSONL span trace (config.tracing),
+    and with metrics enabled it records run metrics (config.metrics).
     
     Returns:
         Callable: Event observer function for agent.run().observe()
     """
+    from config.metrics import create_metrics_observer, is_metrics_enabled
+    from config.tracing import create_trace_observer, is_trace_enabled
+    
     logger = get_logger()
     debug_mode = is_debug_mode()
+    trace_observer = create_trace_observer() if is_trace_enabled() else None
+    metrics_observer = create_metrics_observer() if is_metrics_enabled() else None
     
     def event_observer(emitter):
         """Observe agent events and log them appropriately."""
         
+        if trace_observer is not None:
+            trace_observer(emitter)
+        if metrics_observer is not None:
+            metrics_observer(emitter)
+        
         # Only log events in DEBUG mode
         if not debug_mode:
             return
         
-        # Log ALL events to capture complete agent behavior
-        def log_all_events(data, event):
-            """Log every event with full context."""
-            # Get event details
-            event_path = event.path if hasattr(event, 'path') else 'unknown'
-            creator_name = type(event.creator).__name__ if hasattr(event, 'creator') else 'unknown'
-            tool_name = getattr(event.creator, 'name', creator_name) if hasattr(event, 'creator') else 'unknown'
-            
-            # Extract data details
-            data_str = None
-            if hasattr(data, '__dict__'):
-                data_str = str(vars(data))
-            elif isinstance(data, dict):
-                data_str = str(data)
-            elif data is not None:
-                data_str = str(data)
-            
-            # Log based on event type
-            if 'start' in event_path.lower():
-                logger.info(f"--> 🛠️  {tool_name}[{creator_name}][start]")
-                if data_str:
-                    # Log full input for comprehensive tracking
-                    max_length = 10000  # DEBUG mode, use higher limit
-                    if len(data_str) > max_length:
-                        data_preview = data_str[:max_length] + f"... (truncated, {len(data_str)} total chars)"
-                    else:
-                        data_preview = data_str
-                    logger.info(f"    Input: {data_preview}")
-            
-            elif 'finish' in event_path.lower() or 'success' in event_path.lower():
-                logger.info(f"<-- 🛠️  {tool_name}[{creator_name}][finish]")
-                if data_str:
-                    # Log full output for comprehensive tracking
-                    max_length = 10000  # DEBUG mode, use higher limit
-                    if len(data_str) > max_length:
-                        data_preview = data_str[:max_length] + f"... (truncated, {len(data_str)} total chars)"
-                    else:
-                        data_preview = data_str
-                    logger.info(f"    Output: {data_preview}")
-            
-            elif 'error' in event_path.lower() or 'fail' in event_path.lower():
-                logger.error(f"❌ {tool_name}[{creator_name}][error]")
-                if data_str:
-                    logger.error(f"    Error: {data_str}")
+        def log_event(data, event):
+            """Log a lifecycle event; the payload is only rendered if written."""
+            creator = event.creator
+            creator_name = type(creator).__name__
+            tool_name = getattr(creator, 'name', creator_name)
             
+            if event.name == 'start':
+                logger.info("--> 🛠️  %s[%s][start]", tool_name, creator_name)
+                if data is not None:
+                    logger.info("    Input: %s", PayloadPreview(data))
+            elif event.name == 'success':
+                logger.info("<-- 🛠️  %s[%s][finish]", tool_name, creator_name)
+                if data is not None:
+                    logger.info("    Output: %s", PayloadPreview(data))
             else:
-                # Log other events at debug level
-                logger.debug(f"Event: {event_path} | {tool_name} | {creator_name}")
-                if data_str and len(data_str) < 500:
-                    logger.debug(f"    Data: {data_str}")
+                logger.error("❌ %s[%s][error]", tool_name, creator_name)
+                if data is not None:
+                    logger.error("    Error: %s", PayloadPreview(data))
+        
+        from beeai_framework.emitter import EmitterOptions
         
-        # Register catch-all event handler
-        emitter.on("*", log_all_events)
+        # Subscribe only to lifecycle events, including those of nested runs
+        emitter.on(_is_logged_event, log_event, EmitterOptions(match_nested=True))
     
     return event_observer
 
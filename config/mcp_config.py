@@ -0,0 +1,118 @@
+"""Configuration for the linux-mcp-server session pool and result cache."""
+import os
+from dataclasses import dataclass, field
+from typing import Dict
+
+# Default result cache TTLs in seconds per linux-mcp-server tool. Hardware and
+# OS facts rarely change, while process, memory and log views go stale fast.
+DEFAULT_TOOL_CACHE_TTLS: Dict[str, float] = {
+    "get_hardware_info": 3600.0,
+    "get_system_info": 300.0,
+    "list_block_devices": 300.0,
+    "get_network_interfaces": 120.0,
+    "get_biggest_directories": 60.0,
+    "get_disk_usage": 30.0,
+    "list_services": 30.0,
+    "list_directory": 30.0,
+    "search_files": 30.0,
+    "get_service_status": 15.0,
+    "get_listening_ports": 15.0,
+    "get_file_info": 15.0,
+    "get_journal_logs": 10.0,
+    "get_service_logs": 10.0,
+    "get_audit_logs": 10.0,
+    "read_log_file": 10.0,
+    "read_file": 10.0,
+    "list_processes": 5.0,
+    "get_process_info": 5.0,
+    "get_memory_info": 5.0,
+    "get_cpu_info": 5.0,
+    "get_network_connections": 5.0,
+}
+
+
+def _get_int(name: str, default: int, minimum: int = 1) -> int:
+    """Read an integer environment variable, falling back to default when invalid."""
+    try:
+        return max(minimum, int(os.getenv(name, str(default))))
+    except (ValueError, TypeError):
+        return default
+
+
+def _get_float(name: str, default: float) -> float:
+    """Read a positive float environment variable, falling back to default when invalid."""
+    try:
+        value = float(os.getenv(name, str(default)))
+        return value if value > 0 else default
+    except (ValueError, TypeError):
+        return default
+
+
+def _get_ttl_overrides(name: str) -> Dict[str, float]:
+    """Parse a 'tool=seconds,tool=seconds' environment variable, skipping invalid entries."""
+    overrides: Dict[str, float] = {}
+    for entry in os.getenv(name, "").split(","):
+        tool, _, ttl = entry.partition("=")
+        try:
+            overrides[tool.strip()] = max(0.0, float(ttl))
+        except ValueError:
+            continue
+    overrides.pop("", None)
+    return overrides
+
+
+@dataclass
+class MCPPoolConfig:
+    """Configuration for the pool of long-lived linux-mcp-server sessions."""
+
+    size: int = 2
+    max_concurrency: int = 4
+    health_check_interval: float = 30.0
+    ping_timeout: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> "MCPPoolConfig":
+        """Load MCP pool configuration from environment variables.
+
+        Returns:
+            MCPPoolConfig: Configuration loaded from environment.
+        """
+        return cls(
+            size=_get_int("LINUX_MCP_POOL_SIZE", cls.size),
+            max_concurrency=_get_int("LINUX_MCP_MAX_CONCURRENCY", cls.max_concurrency),
+            health_check_interval=_get_float("LINUX_MCP_HEALTH_CHECK_INTERVAL", cls.health_check_interval),
+            ping_timeout=_get_float("LINUX_MCP_PING_TIMEOUT", cls.ping_timeout),
+        )
+
+
+@dataclass
+class MCPCacheConfig:
+    """Configuration for the TTL cache of read-only MCP tool results."""
+
+    enabled: bool = True
+    max_size: int = 256
+    default_ttl: float = 30.0
+    ttls: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_TOOL_CACHE_TTLS))
+
+    def ttl_for(self, tool_name: str) -> float:
+        """Get the TTL in seconds for a tool (0 disables caching for it)."""
+        return self.ttls.get(tool_name, self.default_ttl)
+
+    @classmethod
+    def from_env(cls) -> "MCPCacheConfig":
+        """Load MCP result cache configuration from environment variables.
+
+        LINUX_MCP_CACHE_TTLS overrides per-tool TTLs, e.g.
+        "list_processes=2,get_hardware_info=86400" (0 disables a tool's cache).
+
+        Returns:
+            MCPCacheConfig: Configuration loaded from environment.
+        """
+        ttls = dict(DEFAULT_TOOL_CACHE_TTLS)
+        ttls.update(_get_ttl_overrides("LINUX_MCP_CACHE_TTLS"))
+        return cls(
+            enabled=os.getenv("LINUX_MCP_CACHE_ENABLED", "true").lower() != "false",
+            max_size=_get_int("LINUX_MCP_CACHE_SIZE", cls.max_size),
+            default_ttl=_get_float("LINUX_MCP_CACHE_DEFAULT_TTL", cls.default_ttl),
+            ttls=ttls,
+        )
@@ -0,0 +1,363 @@
+"""In-process metrics with Prometheus text export.
+
+A small, dependency-free registry of labelled counters and histograms:
+
+- LLM requests, latency and prompt/completion tokens per model
+- Tool calls and latency per tool name, RAG searches and latency
+- Agent runs and latency
+- Cache hits/misses of the MCP result cache and the embedding cache
+- MCP session restarts and transport errors
+
+Run metrics are fed by the emitter events (create_metrics_observer, attached
+by create_event_observer); the cache and session pool wrappers record their
+counters directly. The registry is rendered in the Prometheus text format
+by the agent daemon (``agent_client.py --metrics`` or an HTTP /metrics
+endpoint on METRICS_PORT) and written to METRICS_FILE at exit.
+
+Enable with METRICS_ENABLED=true (implied by METRICS_PORT or METRICS_FILE).
+"""
+import asyncio
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config.tracing import span_kind
+
+# Latency histogram buckets in seconds
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+_dump_registered: bool = False
+
+
+def get_metrics_port() -> Optional[int]:
+    """Get the port of the daemon's HTTP /metrics endpoint.
+
+    Returns:
+        Optional[int]: METRICS_PORT, or None when the endpoint is disabled.
+    """
+    port = os.getenv("METRICS_PORT")
+    return int(port) if port else None
+
+
+def get_metrics_file() -> Optional[Path]:
+    """Get the file the metrics are written to at exit.
+
+    Returns:
+        Optional[Path]: METRICS_FILE, or None when not set.
+    """
+    path = os.getenv("METRICS_FILE")
+    return Path(path) if path else None
+
+
+def is_metrics_enabled() -> bool:
+    """Check if run metrics are collected from agent events.
+
+    Returns:
+        bool: True if METRICS_ENABLED=true or an export (METRICS_PORT,
+        METRICS_FILE) is configured.
+    """
+    if os.getenv("METRICS_ENABLED", "false").lower() == "true":
+        return True
+    return get_metrics_port() is not None or get_metrics_file() is not None
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter of a label combination."""
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Current value of a label combination."""
+        return self._values.get(tuple(str(labels.get(name, "")) for name in self.labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram:
+    """Cumulative histogram with labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # Per label combination: bucket counts (last is +Inf), sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for a label combination."""
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        """Number of observations of a label combination."""
+        entry = self._values.get(tuple(str(labels.get(name, "")) for name in self.labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {}
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(name, lambda: Counter(name, documentation, labels))
+
+    def histogram(
+        self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(name, lambda: Histogram(name, documentation, labels, buckets))
+
+    def _get_or_create(self, name: str, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry and the metrics recorded by the agent
+REGISTRY = MetricsRegistry()
+
+AGENT_RUNS = REGISTRY.counter("agent_runs_total", "Agent runs by status.", ["status"])
+AGENT_RUN_SECONDS = REGISTRY.histogram("agent_run_duration_seconds", "Agent run latency.")
+LLM_REQUESTS = REGISTRY.counter("llm_requests_total", "Chat model requests by model and status.", ["model", "status"])
+LLM_SECONDS = REGISTRY.histogram("llm_request_duration_seconds", "Chat model request latency.", ["model"])
+LLM_TOKENS = REGISTRY.counter("llm_tokens_total", "Chat model tokens by direction (prompt/completion).",
+                              ["model", "direction"])
+LLM_TURNS = REGISTRY.counter("llm_turns_total", "Turns of a fallback chain or router by serving model and route "
+                             "(primary/fallback/hedge/triage/direct/synthesis/escalated).", ["model", "route"])
+LLM_ATTEMPT_FAILURES = REGISTRY.counter("llm_attempt_failures_total", "Failed or timed out attempts of a fallback "
+                                        "chain by model.", ["model", "reason"])
+RATE_LIMIT_WAIT_SECONDS = REGISTRY.histogram("rate_limit_wait_seconds", "Time requests queued for a provider's "
+                                             "client-side rate limit.", ["provider"])
+RATE_LIMITED = REGISTRY.counter("rate_limited_total", "Requests answered with a rate limit error (HTTP 429) by "
+                                "provider.", ["provider"])
+TOOL_CALLS = REGISTRY.counter("tool_calls_total", "Tool calls by tool and status.", ["tool", "status"])
+TOOL_SECONDS = REGISTRY.histogram("tool_call_duration_seconds", "Tool call latency.", ["tool"])
+RAG_SEARCHES = REGISTRY.counter("rag_searches_total", "Knowledge base searches by status.", ["status"])
+RAG_SECONDS = REGISTRY.histogram("rag_search_duration_seconds", "Knowledge base search latency.")
+CACHE_REQUESTS = REGISTRY.counter("cache_requests_total", "Cache lookups by cache and result (hit/miss).",
+                                  ["cache", "result"])
+MCP_RESTARTS = REGISTRY.counter("mcp_session_restarts_total", "MCP server session restarts.", ["pool"])
+MCP_TRANSPORT_ERRORS = REGISTRY.counter("mcp_transport_errors_total", "MCP tool calls that lost their session.",
+                                        ["pool"])
+
+
+def record_cache_lookups(cache: str, hits: int = 0, misses: int = 0) -> None:
+    """Count cache hits and misses.
+
+    Args:
+        cache: Cache name, e.g. "mcp_tool" or "embedding".
+        hits: Number of hits.
+        misses: Number of misses.
+    """
+    if hits:
+        CACHE_REQUESTS.inc(hits, cache=cache, result="hit")
+    if misses:
+        CACHE_REQUESTS.inc(misses, cache=cache, result="miss")
+
+
+def record_span(kind: str, name: str, duration: float, ok: bool, usage: Any = None) -> None:
+    """Record a finished agent, LLM, tool or retrieval run.
+
+    Args:
+        kind: Span kind (see config.tracing.SPAN_KINDS).
+        name: Tool or model name.
+        duration: Latency in seconds.
+        ok: Whether the run succeeded.
+        usage: Token usage of LLM runs (prompt_tokens/completion_tokens).
+    """
+    status = "ok" if ok else "error"
+    if kind == "llm":
+        LLM_REQUESTS.inc(model=name, status=status)
+        LLM_SECONDS.observe(duration, model=name)
+        if usage is not None:
+            LLM_TOKENS.inc(usage.prompt_tokens, model=name, direction="prompt")
+            LLM_TOKENS.inc(usage.completion_tokens, model=name, direction="completion")
+    elif kind == "tool":
+        TOOL_CALLS.inc(tool=name, status=status)
+        TOOL_SECONDS.observe(duration, tool=name)
+    elif kind == "retrieval":
+        RAG_SEARCHES.inc(status=status)
+        RAG_SECONDS.observe(duration)
+    elif kind == "agent":
+        AGENT_RUNS.inc(status=status)
+        AGENT_RUN_SECONDS.observe(duration)
+
+
+def create_metrics_observer() -> Callable:
+    """Create an emitter observer recording run metrics.
+
+    Returns:
+        Callable: Observer for ``agent.run(...).observe()``.
+    """
+    started: Dict[str, Tuple[str, str, float]] = {}
+
+    def on_run_event(data: Any, event: Any) -> None:
+        trace = event.trace
+        if trace is None:
+            return
+        if event.name == "start":
+            kind = span_kind(event.path)
+            if kind in ("llm", "tool", "retrieval", "agent"):
+                instance = getattr(event.creator, "instance", event.creator)
+                name = getattr(instance, "model_id", None) if kind == "llm" else getattr(instance, "name", None)
+                started[trace.run_id] = (kind, name or type(instance).__name__, time.perf_counter())
+        elif event.name == "finish" and trace.run_id in started:
+            kind, name, start = started.pop(trace.run_id)
+            output = getattr(data, "output", None)
+            record_span(
+                kind,
+                name,
+                time.perf_counter() - start,
+                ok=getattr(data, "error", None) is None,
+                usage=getattr(output, "usage", None) if kind == "llm" else None,
+            )
+
+    def metrics_observer(emitter: Any) -> None:
+        """Register the metrics listener on a run emitter."""
+        from beeai_framework.emitter import EmitterOptions
+
+        emitter.on(
+            lambda event: event.name in ("start", "finish") and event.path.startswith("run."),
+            on_run_event,
+            EmitterOptions(match_nested=True),
+        )
+
+    return metrics_observer
+
+
+def write_metrics_file(path: Optional[Path] = None) -> None:
+    """Write the current metrics to a file in the Prometheus text format."""
+    path = path or get_metrics_file()
+    if path is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(REGISTRY.render(), encoding="utf-8")
+
+
+def install_metrics_dump() -> None:
+    """Write the metrics to METRICS_FILE when the process exits (if set)."""
+    global _dump_registered
+
+    if get_metrics_file() is not None and not _dump_registered:
+        atexit.register(write_metrics_file)
+        _dump_registered = True
+
+
+async def _handle_http(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer one HTTP request: GET /metrics returns the registry."""
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            status, body = "200 OK", REGISTRY.render().encode("utf-8")
+        else:
+            status, body = "404 Not Found", b"Not found\n"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(port: int, host: str = "127.0.0.1") -> asyncio.AbstractServer:
+    """Serve GET /metrics over HTTP on localhost.
+
+    Args:
+        port: TCP port (0 picks a free port).
+        host: Interface to bind.
+
+    Returns:
+        asyncio.AbstractServer: The started server; close it to stop serving.
+    """
+    return await asyncio.start_server(_handle_http, host, port)
@@ -0,0 +1,260 @@
+"""Structured JSONL trace log of agent runs.
+
+Every run of the agent, its requirements, the chat model and each tool is a
+span. When a span finishes, one JSON record is written with its ids, kind,
+name, agent step, start/end timestamps, duration, payload sizes and token
+usage, e.g.::
+
+    {"trace_id": "…", "span_id": "…", "parent_id": "…", "kind": "tool",
+     "name": "get_disk_usage", "step": 2, "start": 1718000000.12,
+     "end": 1718000000.19, "duration_ms": 71.3, "status": "ok",
+     "input_chars": 2, "output_chars": 241}
+
+Records are serialized and written by a background thread through the same
+bounded queue as the log file, so tracing adds almost nothing to the event
+loop. utils/trace_summary.py turns a trace file into a latency breakdown.
+
+Enable with TRACE_ENABLED=true; TRACE_FILE overrides the default
+logs/trace_<date>.jsonl.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from config.logging_config import LOG_DIR, BoundedQueueHandler, get_log_queue_size
+
+# Emitter path prefixes of run lifecycle events and the span kind they map to
+SPAN_KINDS = (
+    ("run.agent.", "agent"),
+    ("run.requirement.", "requirement"),
+    ("run.tool.search.retrieval.", "retrieval"),
+    ("run.tool.", "tool"),
+    # Models wrapping other models (fallback chains, triage router, rate limiting)
+    ("run.backend.fallback.", "llm_chain"),
+    ("run.backend.router.", "llm_chain"),
+    ("run.backend.ratelimit.", "llm_chain"),
+    ("run.backend.", "llm"),
+)
+
+_sink: Optional["TraceSink"] = None
+_atexit_registered: bool = False
+
+
+def is_trace_enabled() -> bool:
+    """Check if the JSONL trace log is enabled.
+
+    Returns:
+        bool: True if TRACE_ENABLED=true, False otherwise.
+    """
+    return os.getenv("TRACE_ENABLED", "false").lower() == "true"
+
+
+def get_trace_file() -> Path:
+    """Get the trace file path.
+
+    Returns:
+        Path: TRACE_FILE, or logs/trace_<date>.jsonl by default.
+    """
+    configured = os.getenv("TRACE_FILE")
+    if configured:
+        return Path(configured)
+    return LOG_DIR / f"trace_{datetime.now().strftime('%Y%m%d')}.jsonl"
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Serialize trace records (dicts) as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        if isinstance(record.msg, dict):
+            return json.dumps(record.msg, default=str, ensure_ascii=False)
+        return json.dumps({"notice": record.getMessage()}, ensure_ascii=False)
+
+
+class TraceQueueHandler(BoundedQueueHandler):
+    """Bounded queue handler that leaves serialization to the writer thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Trace records are fresh dicts owned by the queue; no need to format here
+        return record
+
+
+class TraceSink:
+    """Append trace records to a JSONL file from a background thread."""
+
+    def __init__(self, path: Path, queue_size: int = 10000) -> None:
+        """Open the trace file.
+
+        Args:
+            path: JSONL file to append to.
+            queue_size: Maximum records waiting to be written; 0 writes synchronously.
+        """
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(path, mode="a", encoding="utf-8")
+        file_handler.setFormatter(JsonLinesFormatter())
+
+        self._logger = logging.getLogger(f"command-line-agent.trace.{id(self)}")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._logger.handlers.clear()
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        if queue_size:
+            handler = TraceQueueHandler(queue.Queue(maxsize=queue_size))
+            self._listener = logging.handlers.QueueListener(handler.queue, file_handler)
+            self._listener.start()
+            self._logger.addHandler(handler)
+        else:
+            self._logger.addHandler(file_handler)
+        self._file_handler = file_handler
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Queue one trace record."""
+        self._logger.info(record)
+
+    def close(self) -> None:
+        """Write all queued records and close the file."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        self._file_handler.close()
+        self._logger.handlers.clear()
+
+
+def get_trace_sink() -> TraceSink:
+    """Get the process-wide trace sink, opening the trace file on first use.
+
+    Returns:
+        TraceSink: Sink writing to get_trace_file().
+    """
+    global _sink, _atexit_registered
+
+    if _sink is None:
+        _sink = TraceSink(get_trace_file(), queue_size=get_log_queue_size())
+        if not _atexit_registered:
+            atexit.register(close_trace_sink)
+            _atexit_registered = True
+    return _sink
+
+
+def close_trace_sink() -> None:
+    """Flush and close the process-wide trace sink."""
+    global _sink
+
+    if _sink is not None:
+        _sink.close()
+        _sink = None
+
+
+def span_kind(path: str) -> Optional[str]:
+    """Map the emitter path of a run lifecycle event to a span kind (None if not traced)."""
+    for prefix, kind in SPAN_KINDS:
+        if path.startswith(prefix):
+            return kind
+    return None
+
+
+def _span_name(instance: Any) -> str:
+    for attribute in ("name", "model_id"):
+        value = getattr(instance, attribute, None)
+        if isinstance(value, str) and value:
+            return value
+    meta = getattr(instance, "meta", None)
+    return getattr(meta, "name", None) or type(instance).__name__
+
+
+def _payload_chars(value: Any) -> int:
+    """Approximate payload size in characters."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_payload_chars(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_payload_chars(item) for item in value)
+    text_content = getattr(value, "get_text_content", None)
+    if callable(text_content):
+        return len(text_content())
+    return len(str(value))
+
+
+def _usage(output: Any) -> Optional[Any]:
+    usage = getattr(output, "usage", None)
+    if usage is None:
+        usage = getattr(getattr(output, "state", None), "usage", None)
+    return usage
+
+
+def create_trace_observer(sink: Optional[TraceSink] = None) -> Callable:
+    """Create an emitter observer writing one trace record per finished span.
+
+    Args:
+        sink: Destination of the records (default: the process-wide sink).
+
+    Returns:
+        Callable: Observer for ``agent.run(...).observe()``.
+    """
+    sink = sink or get_trace_sink()
+    spans: Dict[str, Dict[str, Any]] = {}
+    steps: Dict[str, int] = {}
+
+    def on_agent_start(data: Any, event: Any) -> None:
+        """Remember the step each agent run is in."""
+        state = getattr(data, "state", None)
+        if event.trace is not None and state is not None:
+            steps[event.trace.run_id] = state.iteration
+
+    def on_run_event(data: Any, event: Any) -> None:
+        trace = event.trace
+        kind = span_kind(event.path)
+        if trace is None or kind is None:
+            return
+
+        if event.name == "start":
+            spans[trace.run_id] = {
+                "trace_id": trace.id,
+                "span_id": trace.run_id,
+                "parent_id": trace.parent_run_id,
+                "kind": kind,
+                "name": _span_name(getattr(event.creator, "instance", event.creator)),
+                "step": steps.get(trace.parent_run_id) if trace.parent_run_id else None,
+                "start": event.created_at.timestamp(),
+                "input_chars": _payload_chars(getattr(data, "input", None)),
+            }
+        elif event.name == "error" and trace.run_id in spans:
+            spans[trace.run_id]["error"] = str(data)
+        elif event.name == "finish" and trace.run_id in spans:
+            span = spans.pop(trace.run_id)
+            steps.pop(trace.run_id, None)
+            end = event.created_at.timestamp()
+            output = getattr(data, "output", None)
+            span.update(
+                end=end,
+                duration_ms=round((end - span["start"]) * 1000, 3),
+                status="error" if getattr(data, "error", None) is not None or "error" in span else "ok",
+                output_chars=_payload_chars(output),
+            )
+            usage = _usage(output)
+            if usage is not None:
+                span.update(
+                    prompt_tokens=usage.prompt_tokens,
+                    completion_tokens=usage.completion_tokens,
+                    total_tokens=usage.total_tokens,
+                )
+            sink.write(span)
+
+    def trace_observer(emitter: Any) -> None:
+        """Register the span listeners on a run emitter."""
+        from beeai_framework.emitter import EmitterOptions
+
+        options = EmitterOptions(match_nested=True)
+        emitter.on(lambda event: event.path.startswith("run."), on_run_event, options)
+        emitter.on(lambda event: event.name == "start" and event.path.startswith("agent."), on_agent_start, options)
+
+    return trace_observer
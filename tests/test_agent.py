@@ -65,3 +65,249 @@ class TestTroubleshootingAgent:
             assert 'think' in tool_names
             # RAG tool may or may not be present depending on DB connectivity
 
+
+
+class ChatModelStub:
+    """Minimal stand-in for a ChatModel used when constructing the agent."""
+
+    provider_id = "stub"
+    model_id = "stub-model"
+
+
+class TestConcurrentStartup:
+    """Test the concurrent startup pipeline of create_troubleshooting_agent."""
+
+    @staticmethod
+    def _slow_rag_tool():
+        import time
+        from unittest.mock import Mock
+        from beeai_framework.tools import Tool
+        time.sleep(0.3)
+        rag_tool = Mock(spec=Tool)
+        rag_tool.name = "VectorStoreSearch"
+        return rag_tool
+
+    @staticmethod
+    async def _slow_linux_tools(**kwargs):
+        import asyncio
+        from unittest.mock import Mock
+        from beeai_framework.tools import Tool
+        await asyncio.sleep(0.3)
+        linux_tool = Mock(spec=Tool)
+        linux_tool.name = "get_system_info"
+        return [linux_tool]
+
+    @staticmethod
+    def _slow_instructions():
+        import time
+        time.sleep(0.3)
+        return "Test instructions"
+
+    @pytest.mark.asyncio
+    async def test_components_initialize_concurrently(self):
+        """Startup time should be close to the slowest component, not the sum."""
+        import time
+        import agent as agent_module
+        # The framework is imported lazily on first use; keep that out of the measurement
+        import beeai_framework.agents.requirement  # noqa: F401
+        import beeai_framework.middleware.trajectory  # noqa: F401
+
+        with patch("agent.create_chat_model", return_value=ChatModelStub()), \
+             patch("agent.create_rag_tool", side_effect=self._slow_rag_tool), \
+             patch("agent.create_linux_tools", side_effect=self._slow_linux_tools), \
+             patch("agent.load_agent_instructions", side_effect=self._slow_instructions):
+            start = time.perf_counter()
+            agent = await agent_module.create_troubleshooting_agent()
+            elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.8
+        tool_names = [tool.name for tool in agent._tools]
+        assert "VectorStoreSearch" in tool_names
+        assert "get_system_info" in tool_names
+
+        report = agent_module.last_startup_report
+        assert [t.component for t in report.timings] == ["llm", "rag", "mcp", "instructions"]
+        assert all(t.status == "ok" for t in report.timings)
+        assert report.sequential_total > report.total
+
+    @pytest.mark.asyncio
+    async def test_component_timeout_degrades_gracefully(self):
+        """A component exceeding its timeout is skipped and reported."""
+        import agent as agent_module
+
+        with patch.dict(os.environ, {"STARTUP_TIMEOUT_MCP": "0.05"}), \
+             patch("agent.create_chat_model", return_value=ChatModelStub()), \
+             patch("agent.create_rag_tool", side_effect=self._slow_rag_tool), \
+             patch("agent.create_linux_tools", side_effect=self._slow_linux_tools), \
+             patch("agent.load_agent_instructions", return_value="Test instructions"):
+            agent = await agent_module.create_troubleshooting_agent()
+
+        tool_names = [tool.name for tool in agent._tools]
+        assert "get_system_info" not in tool_names
+        timings = {t.component: t for t in agent_module.last_startup_report.timings}
+        assert timings["mcp"].status == "timeout"
+        assert "timed out" in timings["mcp"].error
+
+    @pytest.mark.asyncio
+    async def test_rag_can_be_disabled(self):
+        """With RAG_ENABLED=false the RAG tool should never be created."""
+        import agent as agent_module
+
+        with patch.dict(os.environ, {"RAG_ENABLED": "false"}), \
+             patch("agent.create_chat_model", return_value=ChatModelStub()), \
+             patch("agent.create_rag_tool") as mock_rag, \
+             patch("agent.create_linux_tools", side_effect=self._slow_linux_tools), \
+             patch("agent.load_agent_instructions", return_value="Test instructions"):
+            agent = await agent_module.create_troubleshooting_agent()
+
+        mock_rag.assert_not_called()
+        assert "VectorStoreSearch" not in [tool.name for tool in agent._tools]
+        timings = {t.component: t for t in agent_module.last_startup_report.timings}
+        assert timings["rag"].status == "disabled"
+
+    @pytest.mark.asyncio
+    async def test_missing_instructions_aborts_startup(self):
+        """Instructions are mandatory, so their failure still aborts startup."""
+        import agent as agent_module
+
+        with patch("agent.create_chat_model", return_value=ChatModelStub()), \
+             patch("agent.create_rag_tool", side_effect=ValueError("no db")), \
+             patch("agent.create_linux_tools", side_effect=ValueError("no server")), \
+             patch("agent.load_agent_instructions", side_effect=FileNotFoundError("missing")):
+            with pytest.raises(RuntimeError, match="Cannot start agent without instructions"):
+                await agent_module.create_troubleshooting_agent()
+
+    @pytest.mark.asyncio
+    async def test_failed_startup_closes_session_pools(self):
+        """Started MCP servers should be stopped when a mandatory component fails."""
+        import agent as agent_module
+        from unittest.mock import AsyncMock
+
+        with patch("agent.create_chat_model", side_effect=ValueError("no provider")), \
+             patch("agent.get_rag_enabled", return_value=False), \
+             patch("agent.create_linux_tools", side_effect=self._slow_linux_tools), \
+             patch("agent.load_agent_instructions", return_value="Test instructions"), \
+             patch("tools.mcp_session_pool.close_session_pools", new_callable=AsyncMock) as mock_close:
+            with pytest.raises(RuntimeError, match="Cannot start agent without a chat model"):
+                await agent_module.create_troubleshooting_agent()
+
+        mock_close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_agent_construction_closes_session_pools(self):
+        """Started MCP servers should be stopped when building the agent itself fails."""
+        import agent as agent_module
+        from unittest.mock import AsyncMock
+
+        with patch("agent.create_chat_model", return_value=ChatModelStub()), \
+             patch("agent.get_rag_enabled", return_value=False), \
+             patch("agent.create_linux_tools", side_effect=self._slow_linux_tools), \
+             patch("agent.load_agent_instructions", return_value="Test instructions"), \
+             patch("beeai_framework.agents.requirement.RequirementAgent", side_effect=ValueError("bad tool")), \
+             patch("tools.mcp_session_pool.close_session_pools", new_callable=AsyncMock) as mock_close:
+            with pytest.raises(ValueError, match="bad tool"):
+                await agent_module.create_troubleshooting_agent()
+
+        mock_close.assert_awaited_once()
+
+
+class TestForkAgent:
+    """Test forking an agent for independent queries."""
+
+    def test_fork_keeps_agent_options(self):
+        """A fork should keep every option of the agent but get its own memory."""
+        from beeai_framework.agents.requirement import RequirementAgent
+        from beeai_framework.tools.think import ThinkTool
+        from agent import fork_agent
+
+        agent = RequirementAgent(
+            name="SystemTroubleshootingAgent",
+            description="Diagnoses Linux systems",
+            llm=_scripted_chat_model(),
+            tools=[ThinkTool()],
+            tool_call_checker=False,
+            final_answer_as_tool=False,
+            save_intermediate_steps=False,
+        )
+
+        forked = fork_agent(agent)
+
+        assert forked.meta.name == "SystemTroubleshootingAgent"
+        assert forked.meta.description == "Diagnoses Linux systems"
+        assert forked._llm is agent._llm
+        assert forked._tool_call_checker is False
+        assert forked._final_answer_as_tool is False
+        assert forked._save_intermediate_steps is False
+        assert forked.memory is not agent.memory
+
+
+def _scripted_chat_model():
+    """Build a streaming chat model that calls ThinkTool, then streams a final answer."""
+    from beeai_framework.backend import AssistantMessage, ChatModel, ChatModelOutput, ChatModelParameters
+    from beeai_framework.backend.message import MessageToolCallContent
+
+    class ScriptedChatModel(ChatModel):
+        model_id = "scripted"
+        provider_id = "ollama"
+
+        def __init__(self):
+            super().__init__(parameters=ChatModelParameters(stream=True))
+            self.turn = 0
+
+        async def _create(self, input, run):
+            raise NotImplementedError
+
+        async def _create_stream(self, input, run):
+            self.turn += 1
+            if self.turn == 1:
+                args = '{"thoughts": "check disk usage", "next_step": ["answer"]}'
+                yield ChatModelOutput(output=[AssistantMessage(MessageToolCallContent(id="1", tool_name="think", args=args))])
+                return
+            for piece in ['{"response": "Disk', ' is', ' full"}']:
+                yield ChatModelOutput(output=[AssistantMessage(MessageToolCallContent(id="2", tool_name="final_answer", args=piece))])
+
+    return ScriptedChatModel()
+
+
+class RecordingStream:
+    """Text stream recording each write separately."""
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+    def flush(self):
+        pass
+
+
+class TestStreamingOutput:
+    """Test streaming of tool progress and final-answer tokens."""
+
+    @pytest.mark.asyncio
+    async def test_streams_tool_progress_then_answer_tokens(self):
+        """Tool progress should precede the answer, which arrives token by token."""
+        from beeai_framework.agents.requirement import RequirementAgent
+        from beeai_framework.memory import UnconstrainedMemory
+        from beeai_framework.tools.think import ThinkTool
+        from agent import StreamingPrinter, run_with_streaming
+
+        agent = RequirementAgent(llm=_scripted_chat_model(), tools=[ThinkTool()], memory=UnconstrainedMemory())
+        stream = RecordingStream()
+
+        answer = await run_with_streaming(agent, "Why does nginx fail?", StreamingPrinter(stream=stream))
+
+        assert answer == "Disk is full"
+        assert stream.writes[0] == "   ⏳ think...\n"
+        assert stream.writes[1].startswith("   ✓ think (")
+        assert stream.writes[2:] == ["🤖 Agent: ", "Disk", " is", " full", "\n"]
+
+    def test_prints_whole_answer_when_nothing_was_streamed(self):
+        """Without streamed tokens, finish() should print the complete answer."""
+        from agent import StreamingPrinter
+
+        stream = RecordingStream()
+        StreamingPrinter(stream=stream).finish("All good")
+
+        assert "".join(stream.writes) == "🤖 Agent: All good\n"
@@ -0,0 +1,189 @@
+"""Tests for batch query mode."""
+import asyncio
+import io
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from beeai_framework.agents.requirement import RequirementAgent
+from beeai_framework.backend import AssistantMessage, ChatModel, ChatModelOutput, ChatModelParameters, UserMessage
+from beeai_framework.backend.message import MessageToolCallContent
+from beeai_framework.backend.types import ChatModelUsage
+from beeai_framework.memory import UnconstrainedMemory
+
+from agent_batch import BatchResult, parse_batch_args, parse_queries, run_batch, summarize
+from benchmarks.fakes import HashingEmbeddingModel
+from config.agent_config import AnswerCacheConfig, get_batch_concurrency
+from tools.answer_cache import SemanticAnswerCache
+
+
+class BatchChatModel(ChatModel):
+    """Chat model answering every query after a delay, failing on 'explode'."""
+
+    model_id = "batch"
+    provider_id = "ollama"
+
+    def __init__(self, delay=0.0):
+        super().__init__(parameters=ChatModelParameters(stream=True), max_retries=0)
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _create(self, input, run):
+        raise NotImplementedError
+
+    async def _create_stream(self, input, run):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            question = next(msg.text for msg in reversed(input.messages) if isinstance(msg, UserMessage))
+            if "explode" in question:
+                raise RuntimeError("provider exploded")
+        finally:
+            self.in_flight -= 1
+        args = json.dumps({"response": "Looks healthy"})
+        yield ChatModelOutput(
+            output=[AssistantMessage(MessageToolCallContent(id="1", tool_name="final_answer", args=args))],
+            usage=ChatModelUsage(prompt_tokens=100, completion_tokens=10, total_tokens=110),
+        )
+
+
+def make_agent(llm):
+    """Build a small agent around a chat model."""
+    return RequirementAgent(name="BatchAgent", llm=llm, memory=UnconstrainedMemory())
+
+
+class TestParseQueries:
+    """Tests for parse_queries."""
+
+    def test_accepts_jsonl_strings_and_plain_text(self):
+        """JSON objects, JSON strings and plain lines should all be queries."""
+        lines = [
+            '{"id": "web-01", "query": "Is nginx running?"}\n',
+            '"Check disk usage"\n',
+            "\n",
+            "# comment\n",
+            "Why is the load high?\n",
+        ]
+
+        queries = parse_queries(lines)
+
+        assert [(q.index, q.id, q.query) for q in queries] == [
+            (0, "web-01", "Is nginx running?"),
+            (1, "2", "Check disk usage"),
+            (2, "3", "Why is the load high?"),
+        ]
+
+    def test_rejects_objects_without_query(self):
+        """A JSON object without a query is an input error."""
+        with pytest.raises(ValueError, match="Line 1"):
+            parse_queries(['{"id": 1}'])
+
+
+class TestRunBatch:
+    """Tests for run_batch."""
+
+    @pytest.mark.asyncio
+    async def test_runs_queries_with_bounded_concurrency(self):
+        """At most `concurrency` runs should share the model at once."""
+        llm = BatchChatModel(delay=0.05)
+        queries = parse_queries([f"question {i}" for i in range(10)])
+        output = io.StringIO()
+
+        results = await run_batch(make_agent(llm), queries, output, concurrency=3)
+
+        assert llm.peak == 3
+        assert [result.index for result in results] == list(range(10))
+        assert all(result.response == "Looks healthy" for result in results)
+        assert results[0].total_tokens == 110
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert sorted(record["id"] for record in records) == sorted(str(i) for i in range(1, 11))
+        assert all(record["latency"] > 0 for record in records)
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_per_query(self):
+        """A failing query should produce an error record without stopping the batch."""
+        queries = parse_queries(["all good", "please explode", "fine too"])
+
+        results = await run_batch(make_agent(BatchChatModel()), queries, io.StringIO(), concurrency=2)
+
+        assert [result.ok for result in results] == [True, False, True]
+        assert results[1].response is None
+        assert results[1].error
+
+    @pytest.mark.asyncio
+    async def test_repeated_questions_are_answered_from_the_answer_cache(self, tmp_path):
+        """With the answer cache enabled, a repeated question should not run the agent."""
+        cache = SemanticAnswerCache(
+            HashingEmbeddingModel(), AnswerCacheConfig(path=str(tmp_path / "answers.sqlite"), host="web-1")
+        )
+        llm = BatchChatModel()
+        queries = parse_queries(["is the disk full", "is the disk full"])
+
+        with patch("agent_batch.get_answer_cache", return_value=cache):
+            results = await run_batch(make_agent(llm), queries, io.StringIO(), concurrency=1)
+
+        assert [result.cached for result in results] == [False, True]
+        assert results[1].response == results[0].response
+        assert summarize(results, wall_time=1.0)["cached"] == 1
+
+    @pytest.mark.asyncio
+    async def test_answer_cache_errors_do_not_fail_queries(self, tmp_path):
+        """A broken answer cache should leave the batch to run uncached."""
+        cache = SemanticAnswerCache(
+            HashingEmbeddingModel(), AnswerCacheConfig(path=str(tmp_path / "answers.sqlite"), host="web-1")
+        )
+        queries = parse_queries(["is the disk full", "is nginx up"])
+
+        with patch("agent_batch.get_answer_cache", return_value=cache), \
+             patch.object(cache, "lookup", side_effect=RuntimeError("database is locked")), \
+             patch.object(cache, "store", side_effect=RuntimeError("database is locked")):
+            results = await run_batch(make_agent(BatchChatModel()), queries, io.StringIO(), concurrency=2)
+
+        assert [result.ok for result in results] == [True, True]
+        assert all(result.response == "Looks healthy" for result in results)
+
+    def test_summary_aggregates_latency_and_tokens(self):
+        """The summary should count failures and sum tokens."""
+        results = [
+            BatchResult(0, "1", "a", "ok", None, 1.0, 100, 10, 110),
+            BatchResult(1, "2", "b", "ok", None, 3.0, 200, 20, 220),
+            BatchResult(2, "3", "c", None, "boom", 2.0),
+        ]
+
+        summary = summarize(results, wall_time=2.0)
+
+        assert summary["succeeded"] == 2
+        assert summary["failed"] == 1
+        assert summary["latency_p50"] == 2.0
+        assert summary["latency_max"] == 3.0
+        assert summary["total_tokens"] == 330
+        assert summary["queries_per_second"] == 1.5
+
+
+class TestBatchArgs:
+    """Tests for batch argument parsing."""
+
+    def test_concurrency_defaults_to_env(self, tmp_path):
+        """--concurrency should default to BATCH_CONCURRENCY."""
+        questions = tmp_path / "questions.jsonl"
+        questions.write_text("Why is nginx down?\n")
+        with patch.dict(os.environ, {"BATCH_CONCURRENCY": "8"}):
+            assert get_batch_concurrency() == 8
+            args = parse_batch_args([str(questions)])
+        assert args.concurrency == 8
+        assert args.output == "-"
+
+    def test_rejects_non_positive_concurrency(self):
+        """A concurrency below one is a usage error."""
+        with pytest.raises(SystemExit):
+            parse_batch_args(["-", "--concurrency", "0"])
+
+    def test_rejects_unreadable_files(self, tmp_path):
+        """A missing input file or output directory should be reported before startup."""
+        with pytest.raises(SystemExit):
+            parse_batch_args([str(tmp_path / "missing.jsonl")])
+        with pytest.raises(SystemExit):
+            parse_batch_args(["-", "--output", str(tmp_path / "missing" / "answers.jsonl")])
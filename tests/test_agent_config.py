@@ -0,0 +1,32 @@
+"""Tests for agent runtime configuration module."""
+import os
+from unittest.mock import patch
+
+from config.agent_config import DEFAULT_STARTUP_TIMEOUTS, get_startup_timeout
+
+
+class TestGetStartupTimeout:
+    """Tests for get_startup_timeout function."""
+
+    def test_returns_component_default_when_not_set(self):
+        """Should fall back to the per-component default."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_startup_timeout("mcp") == DEFAULT_STARTUP_TIMEOUTS["mcp"]
+            assert get_startup_timeout("instructions") == DEFAULT_STARTUP_TIMEOUTS["instructions"]
+
+    def test_reads_timeout_from_env(self):
+        """Should read STARTUP_TIMEOUT_<COMPONENT> from the environment."""
+        with patch.dict(os.environ, {"STARTUP_TIMEOUT_RAG": "12.5"}):
+            assert get_startup_timeout("rag") == 12.5
+
+    def test_invalid_or_non_positive_values_use_default(self):
+        """Should ignore unparsable or non-positive timeouts."""
+        with patch.dict(os.environ, {"STARTUP_TIMEOUT_LLM": "abc"}):
+            assert get_startup_timeout("llm") == DEFAULT_STARTUP_TIMEOUTS["llm"]
+        with patch.dict(os.environ, {"STARTUP_TIMEOUT_LLM": "0"}):
+            assert get_startup_timeout("llm") == DEFAULT_STARTUP_TIMEOUTS["llm"]
+
+    def test_unknown_component_uses_generic_default(self):
+        """Should use a 30s default for components without an explicit default."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_startup_timeout("something-else") == 30.0
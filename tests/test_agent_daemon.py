@@ -0,0 +1,254 @@
+"""Tests for the agent daemon and its thin client."""
+import asyncio
+import io
+import os
+import stat
+from unittest.mock import patch
+
+import pytest
+from beeai_framework.agents.requirement import RequirementAgent
+from beeai_framework.backend import AssistantMessage, ChatModel, ChatModelOutput, ChatModelParameters
+from beeai_framework.backend.message import MessageToolCallContent
+from beeai_framework.memory import UnconstrainedMemory
+
+from agent_client import main as client_main, parse_args, send_request
+from agent_daemon import AgentDaemon
+from config.agent_config import get_daemon_address, get_daemon_max_concurrency, get_default_daemon_socket
+
+
+class AnsweringChatModel(ChatModel):
+    """Chat model streaming the same final answer for every query."""
+
+    model_id = "answering"
+    provider_id = "ollama"
+
+    def __init__(self, delay=0.0):
+        super().__init__(parameters=ChatModelParameters(stream=True))
+        self.delay = delay
+        self.calls = 0
+
+    async def _create(self, input, run):
+        raise NotImplementedError
+
+    async def _create_stream(self, input, run):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        for piece in ['{"response": "Disk', ' is full"}']:
+            yield ChatModelOutput(output=[AssistantMessage(MessageToolCallContent(id="1", tool_name="final_answer", args=piece))])
+
+
+def make_agent(delay=0.0):
+    """Build a small agent backed by AnsweringChatModel."""
+    return RequirementAgent(name="TestAgent", llm=AnsweringChatModel(delay), memory=UnconstrainedMemory())
+
+
+async def start_daemon(agent, socket_path, max_concurrency=4):
+    """Start a daemon in the background and wait for its socket."""
+    daemon = AgentDaemon(agent, max_concurrency=max_concurrency)
+    task = asyncio.create_task(daemon.serve(socket_path))
+    for _ in range(100):
+        if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            break
+        await asyncio.sleep(0.01)
+    return daemon, task
+
+
+class TestAgentDaemon:
+    """Tests for AgentDaemon served over a Unix socket."""
+
+    @pytest.mark.asyncio
+    async def test_streams_answer_to_client(self, tmp_path):
+        """The client should receive streamed output followed by the answer."""
+        socket_path = str(tmp_path / "agent.sock")
+        agent = make_agent()
+        daemon, task = await start_daemon(agent, socket_path)
+        output = io.StringIO()
+
+        reply = await send_request({"query": "Why is nginx down?"}, socket_path, output=output)
+
+        assert reply["type"] == "done"
+        assert reply["response"] == "Disk is full"
+        assert output.getvalue() == "🤖 Agent: Disk is full\n"
+        # Queries run on forks, so the warm agent's memory stays empty
+        assert agent.memory.messages == []
+
+        await send_request({"command": "shutdown"}, socket_path)
+        await asyncio.wait_for(task, timeout=5)
+        assert not os.path.exists(socket_path)
+
+    @pytest.mark.asyncio
+    async def test_answers_queries_concurrently(self, tmp_path):
+        """Independent queries should overlap up to the concurrency limit."""
+        socket_path = str(tmp_path / "agent.sock")
+        daemon, task = await start_daemon(make_agent(delay=0.3), socket_path, max_concurrency=3)
+
+        start = asyncio.get_running_loop().time()
+        replies = await asyncio.gather(*[
+            send_request({"query": f"question {i}"}, socket_path, output=io.StringIO()) for i in range(3)
+        ])
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert [reply["type"] for reply in replies] == ["done"] * 3
+        assert elapsed < 0.8
+        assert (await send_request({"command": "ping"}, socket_path))["queries"] == 3
+
+        await send_request({"command": "shutdown"}, socket_path)
+        await asyncio.wait_for(task, timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_request(self, tmp_path):
+        """A request without query or command should get an error reply."""
+        socket_path = str(tmp_path / "agent.sock")
+        daemon, task = await start_daemon(make_agent(), socket_path)
+
+        reply = await send_request({"query": "  "}, socket_path)
+
+        assert reply["type"] == "error"
+        await send_request({"command": "shutdown"}, socket_path)
+        await asyncio.wait_for(task, timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_malformed_requests_get_error_replies(self, tmp_path):
+        """Non-object JSON and lines over the stream limit should be answered with an error."""
+        socket_path = str(tmp_path / "agent.sock")
+        daemon, task = await start_daemon(make_agent(), socket_path)
+
+        replies = []
+        for line in (b"[]\n", b'"x"\n', b"{" + b" " * (2 ** 20 + 1) + b"}\n"):
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            writer.write(line)
+            await writer.drain()
+            replies.append(await reader.readline())
+            writer.close()
+
+        assert all(b'"type": "error"' in reply for reply in replies)
+        assert b"JSON object" in replies[0]
+        await send_request({"command": "shutdown"}, socket_path)
+        await asyncio.wait_for(task, timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_serves_metrics(self, tmp_path):
+        """The metrics command should return the registry in Prometheus text format."""
+        socket_path = str(tmp_path / "agent.sock")
+        with patch.dict(os.environ, {"METRICS_ENABLED": "true"}):
+            daemon, task = await start_daemon(make_agent(), socket_path)
+            await send_request({"query": "Why is nginx down?"}, socket_path, output=io.StringIO())
+
+            reply = await send_request({"command": "metrics"}, socket_path)
+
+        assert reply["type"] == "metrics"
+        assert "# TYPE agent_runs_total counter" in reply["text"]
+        assert 'llm_requests_total{model="answering",status="ok"}' in reply["text"]
+        await send_request({"command": "shutdown"}, socket_path)
+        await asyncio.wait_for(task, timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_refuses_to_replace_a_running_daemon(self, tmp_path):
+        """A second daemon on the same socket should fail, a stale file is replaced."""
+        socket_path = str(tmp_path / "agent.sock")
+        daemon, task = await start_daemon(make_agent(), socket_path)
+
+        with pytest.raises(RuntimeError, match="already listening"):
+            await AgentDaemon(make_agent()).serve(socket_path)
+
+        await send_request({"command": "shutdown"}, socket_path)
+        await asyncio.wait_for(task, timeout=5)
+
+        open(socket_path, "w").close()
+        daemon, task = await start_daemon(make_agent(), socket_path)
+        assert (await send_request({"command": "ping"}, socket_path))["type"] == "pong"
+        await send_request({"command": "shutdown"}, socket_path)
+        await asyncio.wait_for(task, timeout=5)
+
+
+class TestDaemonSecurity:
+    """Tests for restricting who can talk to the daemon."""
+
+    @pytest.mark.asyncio
+    async def test_requires_token_when_set(self, tmp_path):
+        """Requests without the shared token should be rejected."""
+        socket_path = str(tmp_path / "agent.sock")
+        daemon = AgentDaemon(make_agent(), token="s3cret")
+        task = asyncio.create_task(daemon.serve(socket_path))
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            await asyncio.sleep(0.01)
+
+        with patch.dict(os.environ, {}, clear=True):
+            rejected = await send_request({"command": "ping"}, socket_path)
+        with patch.dict(os.environ, {"AGENT_DAEMON_TOKEN": "s3cret"}):
+            accepted = await send_request({"command": "ping"}, socket_path)
+            await send_request({"command": "shutdown"}, socket_path)
+        await asyncio.wait_for(task, timeout=5)
+
+        assert rejected["type"] == "error"
+        assert accepted["type"] == "pong"
+
+    @pytest.mark.asyncio
+    async def test_refuses_tcp_without_token(self):
+        """Listening on TCP without a token should fail."""
+        with pytest.raises(RuntimeError, match="AGENT_DAEMON_TOKEN"):
+            await AgentDaemon(make_agent()).serve(("127.0.0.1", 0))
+
+    @pytest.mark.asyncio
+    async def test_default_socket_in_private_directory(self, tmp_path):
+        """The default socket directory should be created with mode 0700 and the socket bound privately."""
+        with patch.dict(os.environ, {"XDG_RUNTIME_DIR": ""}), \
+                patch("config.agent_config.tempfile.gettempdir", return_value=str(tmp_path)):
+            socket_path = get_default_daemon_socket()
+            daemon, task = await start_daemon(make_agent(), socket_path)
+            try:
+                assert stat.S_IMODE(os.stat(os.path.dirname(socket_path)).st_mode) == 0o700
+                assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+            finally:
+                await send_request({"command": "shutdown"}, socket_path)
+                await asyncio.wait_for(task, timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_client_refuses_socket_of_another_user(self, tmp_path):
+        """The client should not talk to a socket owned by someone else."""
+        socket_path = str(tmp_path / "agent.sock")
+        daemon, task = await start_daemon(make_agent(), socket_path)
+        try:
+            with patch("agent_client.os.getuid", return_value=os.getuid() + 1):
+                with pytest.raises(PermissionError):
+                    await send_request({"command": "ping"}, socket_path)
+        finally:
+            await send_request({"command": "shutdown"}, socket_path)
+            await asyncio.wait_for(task, timeout=5)
+
+
+class TestAgentClient:
+    """Tests for the thin client CLI."""
+
+    def test_requires_query_or_command(self):
+        """Running the client without arguments should be an error."""
+        with pytest.raises(SystemExit):
+            parse_args([])
+        assert parse_args(["disk", "full"]).query == ["disk", "full"]
+
+    @pytest.mark.asyncio
+    async def test_unreachable_daemon_exits_with_2(self, tmp_path):
+        """A missing daemon should be reported with exit code 2."""
+        with patch.dict(os.environ, {"AGENT_DAEMON_SOCKET": str(tmp_path / "missing.sock")}):
+            assert await client_main(["--ping"]) == 2
+
+
+class TestDaemonConfig:
+    """Tests for daemon configuration getters."""
+
+    def test_defaults_to_unix_socket(self):
+        """Without configuration the daemon should use a socket in a per-user directory."""
+        with patch.dict(os.environ, {}, clear=True):
+            address = get_daemon_address()
+            assert isinstance(address, str)
+            assert address.endswith(os.path.join(f"troubleshooting-agent-{os.getuid()}", "agent.sock"))
+            assert get_daemon_max_concurrency() == 4
+        with patch.dict(os.environ, {"XDG_RUNTIME_DIR": "/run/user/1000"}, clear=True):
+            assert get_daemon_address() == "/run/user/1000/troubleshooting-agent.sock"
+
+    def test_port_selects_localhost_tcp(self):
+        """AGENT_DAEMON_PORT should switch to a localhost TCP address."""
+        with patch.dict(os.environ, {"AGENT_DAEMON_PORT": "8765"}):
+            assert get_daemon_address() == ("127.0.0.1", 8765)
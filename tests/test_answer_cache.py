@@ -0,0 +1,208 @@
+"""Tests for the semantic answer cache."""
+import io
+import os
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+from beeai_framework.agents.requirement import RequirementAgent
+from beeai_framework.backend.embedding import EmbeddingModel
+from beeai_framework.backend.types import EmbeddingModelOutput
+from beeai_framework.memory import UnconstrainedMemory
+from beeai_framework.tools.think import ThinkTool
+
+from agent import StreamingPrinter, run_with_streaming
+from benchmarks.fakes import ScriptedChatModel
+from config.agent_config import AnswerCacheConfig
+from tools.answer_cache import SIMILARITY_WINDOW, SemanticAnswerCache
+
+VOCABULARY = ["disk", "full", "var", "nginx", "down", "memory", "cpu", "restart"]
+
+
+class BagOfWordsEmbeddingModel(EmbeddingModel):
+    """Embedding model counting vocabulary words, so paraphrases land close together."""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = 0
+
+    @property
+    def model_id(self):
+        return "bag-of-words"
+
+    @property
+    def provider_id(self):
+        return "ollama"
+
+    async def _create(self, input, run):
+        self.requests += 1
+        embeddings = []
+        for text in input.values:
+            words = text.lower().replace("?", " ").split()
+            embeddings.append([float(words.count(term)) + 0.01 for term in VOCABULARY])
+        return EmbeddingModelOutput(values=input.values, embeddings=embeddings)
+
+
+class FailingEmbeddingModel(BagOfWordsEmbeddingModel):
+    async def _create(self, input, run):
+        raise ConnectionError("embedding provider down")
+
+
+def make_cache(tmp_path, model=None, **overrides):
+    config = AnswerCacheConfig(path=str(tmp_path / "answers.sqlite"), host="web-1", threshold=0.9, **overrides)
+    return SemanticAnswerCache(model or BagOfWordsEmbeddingModel(), config)
+
+
+class TestAnswerCacheConfig:
+    """Tests for answer cache configuration."""
+
+    def test_disabled_by_default(self):
+        """The cache should be off unless ANSWER_CACHE_PATH is set."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert AnswerCacheConfig.from_env().enabled is False
+
+    def test_reads_settings_from_env(self):
+        """Settings should be read and clamped to valid ranges."""
+        env = {
+            "ANSWER_CACHE_PATH": "/tmp/answers.sqlite",
+            "ANSWER_CACHE_THRESHOLD": "1.5",
+            "ANSWER_CACHE_MAX_AGE": "60",
+            "ANSWER_CACHE_VERIFY_RATE": "oops",
+            "ANSWER_CACHE_HOST": "db-1",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            config = AnswerCacheConfig.from_env()
+
+        assert config.enabled is True
+        assert config.threshold == 1.0
+        assert config.max_age == 60.0
+        assert config.verify_rate == 0.0
+        assert config.host == "db-1"
+
+
+class TestSemanticAnswerCache:
+    """Test suite for SemanticAnswerCache."""
+
+    @pytest.mark.asyncio
+    async def test_paraphrase_hits_and_unrelated_query_misses(self, tmp_path):
+        """A similar query should return the stored answer; an unrelated one should not."""
+        cache = make_cache(tmp_path)
+        await cache.store("Why is the disk full?", "Clean /var/log.")
+
+        hit = await cache.lookup("disk almost full on /var disk")
+        miss = await cache.lookup("nginx is down")
+
+        assert hit.answer == "Clean /var/log."
+        assert hit.query == "Why is the disk full?"
+        assert hit.similarity >= 0.9
+        assert miss is None
+        assert cache.stats()["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_scoped_by_host(self, tmp_path):
+        """Answers about one host should not be served for another."""
+        await make_cache(tmp_path).store("disk full", "Clean /var/log.")
+
+        other = SemanticAnswerCache(
+            BagOfWordsEmbeddingModel(),
+            AnswerCacheConfig(path=str(tmp_path / "answers.sqlite"), host="db-1", threshold=0.9),
+        )
+
+        assert await other.lookup("disk full") is None
+
+    @pytest.mark.asyncio
+    async def test_stale_answers_miss(self, tmp_path):
+        """Answers older than the freshness window should not be served."""
+        cache = make_cache(tmp_path, max_age=60.0)
+        with patch("tools.answer_cache.time.time", return_value=1000.0):
+            await cache.store("disk full", "Clean /var/log.")
+        with patch("tools.answer_cache.time.time", return_value=1061.0):
+            assert await cache.lookup("disk full") is None
+
+    @pytest.mark.asyncio
+    async def test_verification_measures_precision(self, tmp_path):
+        """Verified hits should be counted as confirmed or rejected."""
+        cache = make_cache(tmp_path)
+        await cache.store("disk full", "disk full: clean var")
+        hit = await cache.lookup("disk full")
+
+        assert await cache.verify(hit, "the disk is full, clean var") is True
+        assert await cache.verify(hit, "restart nginx") is False
+        assert cache.stats()["precision"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_embedding_errors_are_misses(self, tmp_path):
+        """A failing embedding provider should not fail the query."""
+        cache = make_cache(tmp_path, model=FailingEmbeddingModel())
+
+        await cache.store("disk full", "Clean /var/log.")
+
+        assert await cache.lookup("disk full") is None
+
+    @pytest.mark.asyncio
+    async def test_database_errors_are_logged(self, tmp_path):
+        """A locked database should neither fail a store nor a lookup."""
+        cache = make_cache(tmp_path)
+
+        with patch.object(cache, "_insert", side_effect=sqlite3.OperationalError("database is locked")), \
+             patch("tools.answer_cache.get_logger") as mock_logger:
+            await cache.store("disk full", "Clean /var/log.")
+        with patch.object(cache, "_candidates", side_effect=sqlite3.OperationalError("database is locked")):
+            assert await cache.lookup("disk full") is None
+
+        assert "store failed" in mock_logger.return_value.warning.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_similarity_window_is_bounded(self, tmp_path):
+        """Only the last SIMILARITY_WINDOW hits should be kept for the mean similarity."""
+        cache = make_cache(tmp_path)
+        await cache.store("disk full", "Clean /var/log.")
+
+        for _ in range(SIMILARITY_WINDOW + 5):
+            await cache.lookup("disk full")
+
+        assert len(cache._similarities) == SIMILARITY_WINDOW
+        assert cache.stats()["hits"] == SIMILARITY_WINDOW + 5
+
+
+class TestCachedRuns:
+    """Tests for the cache in front of agent runs."""
+
+    def make_agent(self, model):
+        return RequirementAgent(llm=model, tools=[ThinkTool()], memory=UnconstrainedMemory())
+
+    @pytest.mark.asyncio
+    async def test_similar_query_skips_the_agent(self, tmp_path):
+        """A paraphrase of an answered query should be answered without running the agent."""
+        cache = make_cache(tmp_path)
+        model = ScriptedChatModel(first_token_latency=0.0, token_latency=0.0, answer_tokens=3)
+
+        with patch("agent.get_answer_cache", return_value=cache):
+            first = await run_with_streaming(
+                self.make_agent(model), "Why is the disk full?", StreamingPrinter(stream=io.StringIO())
+            )
+            calls = model.calls
+            output = io.StringIO()
+            second = await run_with_streaming(
+                self.make_agent(model), "disk almost full on /var disk", StreamingPrinter(stream=output)
+            )
+
+        assert second == first
+        assert model.calls == calls
+        assert "cached answer" in output.getvalue()
+
+    @pytest.mark.asyncio
+    async def test_follow_up_questions_bypass_the_cache(self, tmp_path):
+        """An agent with conversation history should always run."""
+        cache = make_cache(tmp_path)
+        await cache.store("disk full", "Clean /var/log.")
+        model = ScriptedChatModel(first_token_latency=0.0, token_latency=0.0, answer_tokens=3)
+        agent = self.make_agent(model)
+        printer = StreamingPrinter(stream=io.StringIO())
+
+        with patch("agent.get_answer_cache", return_value=cache):
+            await run_with_streaming(agent, "Why is nginx down?", printer)
+            calls = model.calls
+            await run_with_streaming(agent, "disk full", printer)
+
+        assert model.calls > calls
@@ -0,0 +1,39 @@
+"""Tests for the offline benchmark suite."""
+import pytest
+
+from benchmarks.run_benchmarks import compare, run_suite
+
+
+class TestRunSuite:
+    """Tests for run_suite."""
+
+    @pytest.mark.asyncio
+    async def test_runs_agent_end_to_end_offline(self):
+        """A short run should start the agent on the fakes and time each query."""
+        result = await run_suite(queries=2, first_token_latency=0.0, token_latency=0.0)
+
+        components = result["cold_start"]["components"]
+        assert components["mcp"]["status"] == "ok"
+        assert components["rag"]["status"] == "ok"
+        assert result["queries"]["count"] == 2
+        for run in result["runs"]:
+            assert 0 < run["ttft"] <= run["latency"]
+            assert run["steps"] == 3
+            assert run["tool_calls"] >= 4
+        assert result["memory"]["tracemalloc_peak_mb"] > 0
+
+
+class TestCompare:
+    """Tests for compare."""
+
+    def test_flags_metrics_above_threshold(self):
+        """Only metrics that grew by more than the threshold are regressions."""
+        baseline = {"import_ms": 100.0, "queries": {"latency_p50": 1.0}}
+        current = {"import_ms": 130.0, "queries": {"latency_p50": 1.05}}
+
+        rows = {row["metric"]: row for row in compare(current, baseline, threshold=20)}
+
+        assert rows["import_ms"]["regression"]
+        assert rows["import_ms"]["change"] == pytest.approx(30.0)
+        assert not rows["queries.latency_p50"]["regression"]
+        assert "cold_start.total" not in rows
@@ -2,7 +2,7 @@
 import os
 from unittest.mock import patch
 import pytest
-from config.db_config import DatabaseConfig, get_connection_string
+from config.db_config import DatabaseConfig, get_connection_string, get_engine_args
 
 
 class TestDatabaseConfig:
@@ -61,3 +61,69 @@ class TestDatabaseConfig:
             assert 'localhost' in conn_str
             assert 'rag_db' in conn_str
 
+
+
+class TestEngineArgs:
+    """Test connection pool settings."""
+
+    def test_pool_defaults(self):
+        """Test default pool settings when env vars not set."""
+        with patch.dict(os.environ, {}, clear=True):
+            args = get_engine_args()
+            assert args['pool_size'] == 5
+            assert args['max_overflow'] == 10
+            assert args['pool_recycle'] == 1800
+            assert args['pool_pre_ping'] is True
+            assert args['connect_args']['options'] == '-c statement_timeout=30000'
+
+    def test_pool_settings_from_env(self):
+        """Test loading pool settings from environment variables."""
+        with patch.dict(os.environ, {
+            'POSTGRES_POOL_SIZE': '2',
+            'POSTGRES_MAX_OVERFLOW': '0',
+            'POSTGRES_POOL_RECYCLE': '300',
+            'POSTGRES_POOL_PRE_PING': 'false',
+            'POSTGRES_POOL_TIMEOUT': '5',
+            'POSTGRES_CONNECT_TIMEOUT': '3',
+            'POSTGRES_STATEMENT_TIMEOUT_MS': '1500'
+        }):
+            config = DatabaseConfig.from_env()
+            args = config.engine_args()
+            assert args['pool_size'] == 2
+            assert args['max_overflow'] == 0
+            assert args['pool_recycle'] == 300
+            assert args['pool_pre_ping'] is False
+            assert args['pool_timeout'] == 5.0
+            assert args['connect_args'] == {
+                'connect_timeout': 3,
+                'options': '-c statement_timeout=1500'
+            }
+
+    def test_ann_search_settings_from_env(self):
+        """Test HNSW ef_search and IVFFlat probes are applied per connection."""
+        with patch.dict(os.environ, {
+            'POSTGRES_HNSW_EF_SEARCH': '80',
+            'POSTGRES_IVFFLAT_PROBES': '10'
+        }, clear=True):
+            options = get_engine_args()['connect_args']['options']
+            assert '-c hnsw.ef_search=80' in options
+            assert '-c ivfflat.probes=10' in options
+
+    def test_invalid_settings_fall_back_to_defaults(self):
+        """Malformed or non-positive values should be ignored instead of breaking startup."""
+        with patch.dict(os.environ, {
+            'POSTGRES_POOL_SIZE': 'five',
+            'POSTGRES_MAX_OVERFLOW': '-1',
+            'POSTGRES_POOL_TIMEOUT': '0',
+            'POSTGRES_STATEMENT_TIMEOUT_MS': '0',
+            'POSTGRES_HNSW_EF_SEARCH': '0',
+            'POSTGRES_IVFFLAT_PROBES': 'many'
+        }, clear=True):
+            config = DatabaseConfig.from_env()
+            conn_str = get_connection_string()
+
+        assert (config.pool_size, config.max_overflow, config.pool_timeout) == (5, 10, 30.0)
+        assert config.statement_timeout_ms == 0
+        assert config.hnsw_ef_search is None
+        assert config.ivfflat_probes is None
+        assert conn_str.startswith('postgresql+psycopg://')
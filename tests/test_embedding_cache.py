@@ -0,0 +1,116 @@
+"""Tests for the embedding cache wrapper."""
+import os
+from unittest.mock import patch
+
+import pytest
+from beeai_framework.backend.embedding import EmbeddingModel
+from beeai_framework.backend.types import EmbeddingModelOutput
+
+from tools.embedding_cache import CachedEmbeddingModel, DiskEmbeddingStore
+from tools.rag_integration import create_embedding_model
+
+
+class FakeEmbeddingModel(EmbeddingModel):
+    """Embedding model stub recording the texts it embeds."""
+
+    def __init__(self, model_id="fake-embed"):
+        super().__init__()
+        self._model_id = model_id
+        self.requests = []
+
+    @property
+    def model_id(self):
+        return self._model_id
+
+    @property
+    def provider_id(self):
+        return "ollama"
+
+    async def _create(self, input, run):
+        self.requests.append(list(input.values))
+        return EmbeddingModelOutput(
+            values=input.values,
+            embeddings=[[float(len(text)), 0.5] for text in input.values],
+        )
+
+
+class TestCachedEmbeddingModel:
+    """Test suite for CachedEmbeddingModel."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_skips_provider(self):
+        """A repeated query should be answered from memory."""
+        inner = FakeEmbeddingModel()
+        model = CachedEmbeddingModel(inner, truncate_input_tokens=500)
+
+        first = await model.create(["disk full on /var"])
+        second = await model.create(["  disk full   on /var "])
+
+        assert inner.requests == [["disk full on /var"]]
+        assert second.embeddings == first.embeddings
+        assert model.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_only_missing_texts_are_embedded(self):
+        """Mixed batches should only send uncached, deduplicated texts."""
+        inner = FakeEmbeddingModel()
+        model = CachedEmbeddingModel(inner)
+        await model.create(["a"])
+
+        result = await model.create(["a", "bb", "bb"])
+
+        assert inner.requests[-1] == ["bb"]
+        assert result.embeddings == [[1.0, 0.5], [2.0, 0.5], [2.0, 0.5]]
+        assert (model.stats()["hits"], model.stats()["misses"]) == (1, 2)
+
+    @pytest.mark.asyncio
+    async def test_memory_is_lru_bounded(self):
+        """The in-memory cache should evict the least recently used entry."""
+        inner = FakeEmbeddingModel()
+        model = CachedEmbeddingModel(inner, max_size=2)
+        for text in ["a", "b", "a", "c", "b"]:
+            await model.create([text])
+
+        assert model.stats()["size"] == 2
+        assert inner.requests == [["a"], ["b"], ["c"], ["b"]]
+
+    def test_key_depends_on_model_and_truncation(self):
+        """Different models or truncation settings should not share entries."""
+        base = CachedEmbeddingModel(FakeEmbeddingModel(), truncate_input_tokens=500)
+        other_model = CachedEmbeddingModel(FakeEmbeddingModel("other"), truncate_input_tokens=500)
+        other_truncation = CachedEmbeddingModel(FakeEmbeddingModel(), truncate_input_tokens=256)
+
+        keys = {model.cache_key("query") for model in (base, other_model, other_truncation)}
+        assert len(keys) == 3
+
+    @pytest.mark.asyncio
+    async def test_disk_store_persists_across_instances(self, tmp_path):
+        """Embeddings should be reused from disk by a new process."""
+        path = str(tmp_path / "embeddings.sqlite")
+        first = CachedEmbeddingModel(FakeEmbeddingModel(), disk_store=DiskEmbeddingStore(path))
+        await first.create(["nginx fails to start"])
+
+        inner = FakeEmbeddingModel()
+        second = CachedEmbeddingModel(inner, disk_store=DiskEmbeddingStore(path))
+        result = await second.create(["nginx fails to start"])
+
+        assert inner.requests == []
+        assert result.embeddings == [[20.0, 0.5]]
+
+
+class TestCreateEmbeddingModelCache:
+    """Tests for cache wiring in create_embedding_model."""
+
+    @patch('tools.rag_integration.EmbeddingModel.from_name')
+    def test_wraps_model_in_cache_by_default(self, mock_from_name):
+        """Should return a cached model by default."""
+        with patch.dict(os.environ, {}, clear=True):
+            model = create_embedding_model("ollama", "nomic-embed-text")
+            assert isinstance(model, CachedEmbeddingModel)
+
+    @patch('tools.rag_integration.EmbeddingModel.from_name')
+    def test_cache_can_be_disabled(self, mock_from_name):
+        """Should return the raw model when EMBEDDING_CACHE_SIZE=0."""
+        with patch.dict(os.environ, {"EMBEDDING_CACHE_SIZE": "0"}):
+            model = create_embedding_model("ollama", "nomic-embed-text")
+            assert model is mock_from_name.return_value
@@ -0,0 +1,169 @@
+"""Tests for the on-disk LLM response cache."""
+import os
+from unittest.mock import patch
+
+import pytest
+from beeai_framework.agents.requirement import RequirementAgent
+from beeai_framework.agents.requirement.requirements.conditional import ConditionalRequirement
+from beeai_framework.backend import AssistantMessage, ChatModelOutput, MessageToolCallContent
+from beeai_framework.backend.types import ChatModelUsage
+from beeai_framework.memory import UnconstrainedMemory
+from beeai_framework.tools.think import ThinkTool
+
+from benchmarks.fakes import ScriptedChatModel
+from config.llm_config import create_chat_model
+from tools.llm_cache import DiskChatModelCache
+
+
+def make_output(text="disk is full"):
+    message = AssistantMessage(
+        [MessageToolCallContent(id="call_0", tool_name="think", args='{"thoughts": "check"}'), text]
+    )
+    return ChatModelOutput(
+        output=[message],
+        usage=ChatModelUsage(prompt_tokens=10, completion_tokens=3, total_tokens=13),
+        finish_reason="stop",
+    )
+
+
+async def run_agent(model):
+    agent = RequirementAgent(
+        llm=model,
+        tools=[ThinkTool()],
+        memory=UnconstrainedMemory(),
+        requirements=[ConditionalRequirement(ThinkTool, force_at_step=1)],
+    )
+    response = await agent.run("Why is nginx down?")
+    return response.last_message.text
+
+
+class TestDiskChatModelCache:
+    """Test suite for DiskChatModelCache."""
+
+    @pytest.mark.asyncio
+    async def test_round_trips_response(self, tmp_path):
+        """Stored chunks should come back with tool calls, text and usage."""
+        cache = DiskChatModelCache(str(tmp_path / "llm.sqlite"), "ollama:llama3.2")
+        await cache.set("request", [make_output()])
+
+        cached = await cache.get("request")
+
+        assert cached[0].get_tool_calls()[0].tool_name == "think"
+        assert cached[0].get_text_content() == "disk is full"
+        assert cached[0].usage.total_tokens == 13
+        assert cached[0].finish_reason == "stop"
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_key_includes_model(self, tmp_path):
+        """The same request sent to another model should miss."""
+        path = str(tmp_path / "llm.sqlite")
+        await DiskChatModelCache(path, "ollama:llama3.2").set("request", [make_output()])
+
+        assert await DiskChatModelCache(path, "openai:gpt-4o-mini").get("request") is None
+        assert await DiskChatModelCache(path, "ollama:llama3.2").get("request") is not None
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_miss(self, tmp_path):
+        """Entries older than the TTL should be dropped on lookup."""
+        cache = DiskChatModelCache(str(tmp_path / "llm.sqlite"), "ollama:llama3.2", ttl=60)
+        with patch("tools.llm_cache.time.time", return_value=1000.0):
+            await cache.set("request", [make_output()])
+        with patch("tools.llm_cache.time.time", return_value=1061.0):
+            assert await cache.get("request") is None
+
+        assert await cache.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, tmp_path):
+        """Above max_entries the least recently used response should go."""
+        cache = DiskChatModelCache(str(tmp_path / "llm.sqlite"), "ollama:llama3.2", ttl=0, max_entries=2)
+        with patch("tools.llm_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+            await cache.set("a", [make_output()])
+            await cache.set("b", [make_output()])
+            await cache.get("a")
+            await cache.set("c", [make_output()])
+
+        assert await cache.size() == 2
+        assert await cache.has("a")
+        assert not await cache.has("b")
+
+    @pytest.mark.asyncio
+    async def test_hits_do_not_write(self, tmp_path):
+        """A hit should only record its access time in memory until the next store."""
+        cache = DiskChatModelCache(str(tmp_path / "llm.sqlite"), "ollama:llama3.2")
+        await cache.set("request", [make_output()])
+        changes = cache._conn.total_changes
+
+        assert await cache.get("request") is not None
+        assert await cache.get("request") is not None
+
+        assert cache._conn.total_changes == changes
+
+    @pytest.mark.asyncio
+    async def test_bypass_skips_lookups_but_stores(self, tmp_path):
+        """In bypass mode responses are refreshed, never served."""
+        path = str(tmp_path / "llm.sqlite")
+        bypassed = DiskChatModelCache(path, "ollama:llama3.2", bypass=True)
+        await bypassed.set("request", [make_output("fresh")])
+
+        assert await bypassed.get("request") is None
+        cached = await DiskChatModelCache(path, "ollama:llama3.2").get("request")
+        assert cached[0].get_text_content() == "fresh"
+
+
+class TestCachedAgentRuns:
+    """Tests for the cache plugged into a chat model."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_run_is_served_from_cache(self, tmp_path):
+        """An identical second run should not call the provider at all."""
+        path = str(tmp_path / "llm.sqlite")
+        first = ScriptedChatModel(first_token_latency=0.0, token_latency=0.0, answer_tokens=3)
+        first.config(cache=DiskChatModelCache(path, "ollama:scripted"))
+        first_answer = await run_agent(first)
+
+        second = ScriptedChatModel(first_token_latency=0.0, token_latency=0.0, answer_tokens=3)
+        cache = DiskChatModelCache(path, "ollama:scripted")
+        second.config(cache=cache)
+        second_answer = await run_agent(second)
+
+        assert first.calls == 2
+        assert second.calls == 0
+        assert second_answer == first_answer
+        assert cache.stats()["hits"] == 2
+
+
+class TestCreateChatModelCache:
+    """Tests for enabling the cache from the environment."""
+
+    @patch("beeai_framework.backend.ChatModel.from_name")
+    def test_cache_disabled_by_default(self, mock_from_name):
+        """Without LLM_CACHE_PATH the model should be left as is."""
+        with patch.dict(os.environ, {}, clear=True):
+            create_chat_model("ollama", "llama3.2")
+
+        mock_from_name.return_value.config.assert_not_called()
+
+    @patch("beeai_framework.backend.ChatModel.from_name")
+    def test_attaches_configured_cache(self, mock_from_name, tmp_path):
+        """LLM_CACHE_* should configure a disk cache on the model."""
+        env = {
+            "LLM_CACHE_PATH": str(tmp_path / "llm.sqlite"),
+            "LLM_CACHE_TTL": "600",
+            "LLM_CACHE_MAX_ENTRIES": "50",
+            "LLM_CACHE_BYPASS": "true",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            create_chat_model("ollama", "llama3.2")
+
+        cache = mock_from_name.return_value.config.call_args.kwargs["cache"]
+        assert isinstance(cache, DiskChatModelCache)
+        assert cache.stats() == {
+            "model": "ollama:llama3.2",
+            "ttl": 600,
+            "max_entries": 50,
+            "bypass": True,
+            "hits": 0,
+            "misses": 0,
+        }
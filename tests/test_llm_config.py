@@ -11,6 +11,14 @@ from config.llm_config import (
     get_llm_temperature,
     get_llm_max_tokens,
     get_memory_max_tokens,
+    get_llm_parallel_tool_calls,
+    get_llm_stream,
+    get_embedding_cache_size,
+    get_embedding_cache_path,
+    get_llm_cache_path,
+    get_llm_cache_ttl,
+    get_llm_cache_max_entries,
+    get_llm_cache_bypass,
     get_agent_instructions_file,
     load_agent_instructions,
 )
@@ -119,6 +127,61 @@ class TestGetEmbeddingModelConfig:
             assert model == "nomic-embed-text"  # Ollama embedding default
 
 
+class TestEmbeddingCacheConfig:
+    """Tests for embedding cache configuration getters."""
+
+    def test_defaults(self):
+        """Should cache 1024 embeddings in memory only by default."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_embedding_cache_size() == 1024
+            assert get_embedding_cache_path() is None
+
+    def test_reads_cache_settings_from_env(self):
+        """Should read size and path from the environment."""
+        with patch.dict(os.environ, {
+            "EMBEDDING_CACHE_SIZE": "0",
+            "EMBEDDING_CACHE_PATH": "/tmp/embeddings.sqlite"
+        }):
+            assert get_embedding_cache_size() == 0
+            assert get_embedding_cache_path() == "/tmp/embeddings.sqlite"
+
+    def test_handles_invalid_cache_size_gracefully(self):
+        """Should default to 1024 on invalid size."""
+        with patch.dict(os.environ, {"EMBEDDING_CACHE_SIZE": "lots"}):
+            assert get_embedding_cache_size() == 1024
+
+
+class TestLLMCacheConfig:
+    """Tests for LLM response cache configuration getters."""
+
+    def test_disabled_by_default(self):
+        """Should not cache responses unless LLM_CACHE_PATH is set."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_llm_cache_path() is None
+            assert get_llm_cache_ttl() == 86400
+            assert get_llm_cache_max_entries() == 1000
+            assert get_llm_cache_bypass() is False
+
+    def test_reads_cache_settings_from_env(self):
+        """Should read path, TTL, size cap and bypass from the environment."""
+        with patch.dict(os.environ, {
+            "LLM_CACHE_PATH": "/tmp/llm.sqlite",
+            "LLM_CACHE_TTL": "0",
+            "LLM_CACHE_MAX_ENTRIES": "10",
+            "LLM_CACHE_BYPASS": "true"
+        }):
+            assert get_llm_cache_path() == "/tmp/llm.sqlite"
+            assert get_llm_cache_ttl() == 0
+            assert get_llm_cache_max_entries() == 10
+            assert get_llm_cache_bypass() is True
+
+    def test_handles_invalid_values_gracefully(self):
+        """Should fall back to the defaults on invalid numbers."""
+        with patch.dict(os.environ, {"LLM_CACHE_TTL": "soon", "LLM_CACHE_MAX_ENTRIES": "many"}):
+            assert get_llm_cache_ttl() == 86400
+            assert get_llm_cache_max_entries() == 1000
+
+
 class TestCreateChatModel:
     """Tests for create_chat_model function."""
 
@@ -169,6 +232,23 @@ class TestCreateChatModel:
         assert params.temperature == 0.8
         assert params.max_tokens == 4096
 
+    @patch('beeai_framework.backend.ChatModel.from_name')
+    def test_passes_parallel_tool_calls_option(self, mock_from_name):
+        """Should forward parallel_tool_calls as allow_parallel_tool_calls."""
+        create_chat_model("openai", "gpt-4", parallel_tool_calls=True)
+
+        call_args = mock_from_name.call_args
+        assert call_args[0][0] == "openai:gpt-4"
+        assert call_args[1]["allow_parallel_tool_calls"] is True
+
+    @patch('beeai_framework.backend.ChatModel.from_name')
+    def test_passes_stream_parameter(self, mock_from_name):
+        """Should enable streaming in ChatModelParameters when requested."""
+        create_chat_model("openai", "gpt-4", stream=True)
+
+        params = mock_from_name.call_args[0][1]
+        assert params.stream is True
+
 
 class TestGetLLMTemperature:
     """Tests for get_llm_temperature function."""
@@ -224,6 +304,34 @@ class TestGetLLMMaxTokens:
             assert max_tokens == 16000
 
 
+class TestGetLLMParallelToolCalls:
+    """Tests for get_llm_parallel_tool_calls function."""
+
+    def test_defaults_to_enabled(self):
+        """Should allow parallel tool calls by default."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_llm_parallel_tool_calls() is True
+
+    def test_can_be_disabled_from_env(self):
+        """Should disable parallel tool calls when LLM_PARALLEL_TOOL_CALLS=false."""
+        with patch.dict(os.environ, {"LLM_PARALLEL_TOOL_CALLS": "false"}):
+            assert get_llm_parallel_tool_calls() is False
+
+
+class TestGetLLMStream:
+    """Tests for get_llm_stream function."""
+
+    def test_defaults_to_enabled(self):
+        """Should stream responses by default."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_llm_stream() is True
+
+    def test_can_be_disabled_from_env(self):
+        """Should disable streaming when LLM_STREAM=false."""
+        with patch.dict(os.environ, {"LLM_STREAM": "false"}):
+            assert get_llm_stream() is False
+
+
 class TestGetMemoryMaxTokens:
     """Tests for get_memory_max_tokens function."""
 
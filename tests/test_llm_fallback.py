@@ -0,0 +1,164 @@
+"""Tests for provider fallback and hedged chat model requests."""
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+from beeai_framework.agents.requirement import RequirementAgent
+from beeai_framework.backend import AssistantMessage, ChatModel, ChatModelOutput, ChatModelParameters, UserMessage
+from beeai_framework.backend.errors import ChatModelError
+from beeai_framework.memory import UnconstrainedMemory
+from beeai_framework.tools.think import ThinkTool
+
+from benchmarks.fakes import ScriptedChatModel
+from config.llm_config import create_chat_model, get_llm_fallbacks
+from tools.llm_fallback import MIN_LATENCY_SAMPLES, FallbackChatModel
+
+
+class ProviderChatModel(ChatModel):
+    """Chat model answering after a delay, or failing."""
+
+    provider_id = "ollama"
+
+    def __init__(self, name, delay=0.0, fail=False, stream=True):
+        super().__init__(parameters=ChatModelParameters(stream=stream))
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    @property
+    def model_id(self):
+        return self.name
+
+    async def _create(self, input, run):
+        chunks = [chunk async for chunk in self._create_stream(input, run)]
+        return ChatModelOutput.from_chunks(chunks)
+
+    async def _create_stream(self, input, run):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise ConnectionError(f"{self.name} is down")
+        for word in ("answer ", "from ", self.name):
+            yield ChatModelOutput(output=[AssistantMessage(word)])
+
+
+async def ask(model):
+    return (await model.run([UserMessage("Why is nginx down?")])).get_text_content()
+
+
+class TestFallbackChatModel:
+    """Test suite for FallbackChatModel."""
+
+    @pytest.mark.asyncio
+    async def test_fails_over_on_error(self):
+        """An error from the first model should move the turn to the next one."""
+        model = FallbackChatModel([ProviderChatModel("watsonx", fail=True), ProviderChatModel("local")])
+
+        assert await ask(model) == "answer from local"
+        stats = model.stats()
+        assert stats["served"] == {"ollama:local": 1}
+        assert stats["routes"] == {"fallback": 1}
+        assert stats["failures"] == {"ollama:watsonx": 1}
+
+    @pytest.mark.asyncio
+    async def test_fails_over_on_timeout(self):
+        """A model silent for longer than the attempt timeout should be abandoned."""
+        slow = ProviderChatModel("watsonx", delay=5.0)
+        model = FallbackChatModel([slow, ProviderChatModel("local")], attempt_timeout=0.05)
+
+        assert await ask(model) == "answer from local"
+        assert slow.cancelled == 1
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_wins_when_first_is_slow(self):
+        """With hedging, a second request should fire after the delay and the first answer win."""
+        slow = ProviderChatModel("watsonx", delay=5.0)
+        fast = ProviderChatModel("local", delay=0.01)
+        model = FallbackChatModel([slow, fast], hedge=True, hedge_delay=0.05)
+
+        assert await ask(model) == "answer from local"
+        assert slow.cancelled == 1
+        assert model.stats()["routes"] == {"hedge": 1}
+        assert model.hedges == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_when_first_answers_in_time(self):
+        """A fast first model should not trigger a hedged request."""
+        backup = ProviderChatModel("local")
+        model = FallbackChatModel([ProviderChatModel("watsonx"), backup], hedge=True, hedge_delay=1.0)
+
+        assert await ask(model) == "answer from watsonx"
+        assert backup.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_hedge_delay_learns_p95(self):
+        """Once enough turns were seen, the hedge delay should follow the p95 latency."""
+        model = FallbackChatModel([ProviderChatModel("watsonx")], hedge=True, hedge_delay=5.0)
+        assert model.hedge_delay_for("ollama:watsonx") == 5.0
+
+        model._latencies["ollama:watsonx"].extend([0.1] * (MIN_LATENCY_SAMPLES - 1) + [2.0])
+
+        assert model.hedge_delay_for("ollama:watsonx") == 0.1
+
+    @pytest.mark.asyncio
+    async def test_raises_when_all_models_fail(self):
+        """The turn should fail with every model's error when the chain is exhausted."""
+        model = FallbackChatModel([ProviderChatModel("watsonx", fail=True), ProviderChatModel("local", fail=True)])
+
+        with pytest.raises(ChatModelError):
+            await ask(model)
+        assert model.stats()["failures"] == {"ollama:watsonx": 1, "ollama:local": 1}
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_requests(self):
+        """Without streaming, the first complete response should be used."""
+        model = FallbackChatModel(
+            [ProviderChatModel("watsonx", fail=True, stream=False), ProviderChatModel("local", stream=False)]
+        )
+
+        assert await ask(model) == "answer from local"
+
+    @pytest.mark.asyncio
+    async def test_agent_runs_through_the_chain(self):
+        """Tool calls should pass through the chain unchanged."""
+        scripted = ScriptedChatModel(first_token_latency=0.0, token_latency=0.0, answer_tokens=3)
+        agent = RequirementAgent(
+            llm=FallbackChatModel([ProviderChatModel("watsonx", fail=True), scripted]),
+            tools=[ThinkTool()],
+            memory=UnconstrainedMemory(),
+        )
+
+        response = await agent.run("Why is nginx down?")
+
+        assert response.last_message.text
+        assert scripted.calls >= 1
+
+
+class TestFallbackConfig:
+    """Tests for configuring the fallback chain."""
+
+    def test_parses_fallback_list(self):
+        """Entries should default to the provider's default model."""
+        with patch.dict(os.environ, {"LLM_FALLBACKS": "ollama:qwen2.5-coder:14b, OpenAI ,"}):
+            assert get_llm_fallbacks() == [("ollama", "qwen2.5-coder:14b"), ("openai", "gpt-4o-mini")]
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_llm_fallbacks() == []
+
+    @patch("beeai_framework.backend.ChatModel.from_name")
+    def test_create_chat_model_builds_chain(self, mock_from_name):
+        """Fallbacks should wrap one model per provider in order."""
+        mock_from_name.side_effect = lambda name, *args, **kwargs: ProviderChatModel(name)
+        env = {"LLM_ATTEMPT_TIMEOUT": "7", "LLM_HEDGE": "true", "LLM_HEDGE_DELAY": "2"}
+        with patch.dict(os.environ, env, clear=True):
+            model = create_chat_model("watsonx", "ibm/granite-3-8b-instruct", fallbacks=[("ollama", "llama3.2")])
+
+        assert isinstance(model, FallbackChatModel)
+        assert [m.model_id for m in model.models] == ["watsonx:ibm/granite-3-8b-instruct", "ollama:llama3.2"]
+        assert (model.attempt_timeout, model.hedge, model.hedge_delay) == (7.0, True, 2.0)
@@ -0,0 +1,149 @@
+"""Tests for routing agent steps between a small and a large chat model."""
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from beeai_framework.agents.requirement import RequirementAgent
+from beeai_framework.agents.requirement.requirements.conditional import ConditionalRequirement
+from beeai_framework.agents.requirement.utils._tool import FinalAnswerTool
+from beeai_framework.backend import ChatModel, ChatModelParameters, UserMessage
+from beeai_framework.memory import UnconstrainedMemory
+from beeai_framework.tools.think import ThinkTool
+
+from agent import create_agent_chat_model
+from benchmarks.fakes import ScriptedChatModel
+from config.llm_config import get_llm_router_model
+from tools.llm_router import RoutedChatModel, classify_intent
+
+
+class FailingChatModel(ChatModel):
+    """Chat model whose provider is down."""
+
+    model_id = "small"
+    provider_id = "ollama"
+
+    def __init__(self):
+        super().__init__(parameters=ChatModelParameters(stream=True))
+        self.calls = 0
+
+    async def _create(self, input, run):
+        self.calls += 1
+        raise ConnectionError("ollama is down")
+
+    async def _create_stream(self, input, run):
+        self.calls += 1
+        raise ConnectionError("ollama is down")
+        yield
+
+
+def scripted():
+    return ScriptedChatModel(first_token_latency=0.0, token_latency=0.0, answer_tokens=3)
+
+
+def make_agent(model, force_think=True):
+    requirements = [ConditionalRequirement(ThinkTool, force_at_step=1)] if force_think else []
+    return RequirementAgent(llm=model, tools=[ThinkTool()], requirements=requirements, memory=UnconstrainedMemory())
+
+
+class TestRoutedChatModel:
+    """Test suite for RoutedChatModel."""
+
+    @pytest.mark.asyncio
+    async def test_small_model_triages_and_large_model_answers(self):
+        """Thinking should be answered by the small model and the final answer by the large one."""
+        small, large = scripted(), scripted()
+        model = RoutedChatModel(small, large)
+
+        response = await make_agent(model).run("Why is nginx down?")
+
+        assert "98% full" in response.last_message.text
+        assert small.calls == 2
+        assert large.calls == 1
+        assert model.stats()["routes"] == {"triage": 1, "escalated": 1}
+
+    @pytest.mark.asyncio
+    async def test_small_model_answers_direct_questions(self):
+        """A direct question should be answered end to end by the small model."""
+        small, large = scripted(), scripted()
+        model = RoutedChatModel(small, large)
+
+        response = await make_agent(model).run("What is the disk usage of /var?")
+
+        assert "98% full" in response.last_message.text
+        assert (small.calls, large.calls) == (2, 0)
+        assert model.stats()["routes"] == {"direct": 2}
+
+    @pytest.mark.asyncio
+    async def test_draft_stops_at_final_answer(self):
+        """The small model's draft should be dropped at its first final_answer chunk, not generated in full."""
+        small = ScriptedChatModel(first_token_latency=0.0, token_latency=0.5, answer_tokens=20)
+        model = RoutedChatModel(small, scripted())
+
+        start = time.monotonic()
+        output = await model.run([UserMessage("Why is nginx down?")])
+
+        assert time.monotonic() - start < 0.4
+        assert "98% full" in output.get_tool_calls()[0].args
+        assert model.stats()["routes"] == {"escalated": 1}
+
+    @pytest.mark.asyncio
+    async def test_failing_small_model_escalates(self):
+        """Steps the small model fails should be answered by the large model."""
+        small, large = FailingChatModel(), scripted()
+        model = RoutedChatModel(small, large)
+
+        response = await make_agent(model).run("Why is nginx down?")
+
+        assert "98% full" in response.last_message.text
+        assert small.calls >= 1
+        assert model.stats()["routes"].get("triage") is None
+
+    @pytest.mark.asyncio
+    async def test_forced_final_answer_goes_to_large_model(self):
+        """A step forcing the final answer should skip the small model."""
+        small, large = scripted(), scripted()
+        model = RoutedChatModel(small, large)
+        final_answer = FinalAnswerTool(None, state=None)
+
+        output = await model.run([UserMessage("Why is nginx down?")], tools=[final_answer], tool_choice=final_answer)
+
+        assert output.get_tool_calls()[0].tool_name == "final_answer"
+        assert (small.calls, large.calls) == (0, 1)
+        assert model.stats()["routes"] == {"synthesis": 1}
+
+
+class TestClassifyIntent:
+    """Tests for classifying requests like the agent's triage."""
+
+    def test_direct_questions_and_troubleshooting(self):
+        """Symptoms should win over question phrasing; unknown requests are troubleshooting."""
+        assert classify_intent("Show me the 5 biggest directories") == "direct"
+        assert classify_intent("list failed services") == "direct"
+        assert classify_intent("What is slowing down the database?") == "troubleshooting"
+        assert classify_intent("nginx failed to start") == "troubleshooting"
+        assert classify_intent("check the box") == "troubleshooting"
+
+
+class TestRouterConfig:
+    """Tests for configuring the router."""
+
+    def test_parses_router_model(self):
+        """The router model should default to the provider's default model."""
+        with patch.dict(os.environ, {"LLM_ROUTER_MODEL": "ollama:qwen2.5:3b"}):
+            assert get_llm_router_model() == ("ollama", "qwen2.5:3b")
+        with patch.dict(os.environ, {"LLM_ROUTER_MODEL": "Ollama"}):
+            assert get_llm_router_model() == ("ollama", "llama3.2")
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_llm_router_model() is None
+
+    @patch("agent.create_chat_model")
+    def test_agent_chat_model_wraps_router(self, mock_create):
+        """Setting LLM_ROUTER_MODEL should put the small model in front of the configured one."""
+        mock_create.side_effect = lambda provider, model, **kwargs: scripted()
+        env = {"LLM_PROVIDER": "watsonx", "LLM_ROUTER_MODEL": "ollama:llama3.2"}
+        with patch.dict(os.environ, env, clear=True):
+            model = create_agent_chat_model()
+
+        assert isinstance(model, RoutedChatModel)
+        assert mock_create.call_args_list[1].kwargs["model"] == "llama3.2"
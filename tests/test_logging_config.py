@@ -2,14 +2,19 @@
 import os
 import json
 import logging
+import queue
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import pytest
 
 from config.logging_config import (
+    BoundedQueueHandler,
+    PayloadPreview,
     setup_logging,
+    shutdown_logging,
     get_logger,
+    get_log_queue_size,
     is_debug_mode,
     create_event_observer,
 )
@@ -69,6 +74,63 @@ class TestLoggingSetup:
         assert hasattr(logger, "error")
 
 
+class TestQueuedFileLogging:
+    """Tests for the bounded log queue."""
+    
+    def test_log_queue_size_defaults_and_parses_env(self):
+        """LOG_QUEUE_SIZE should be read from env, with a fallback on bad values."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_log_queue_size() == 10000
+        with patch.dict(os.environ, {"LOG_QUEUE_SIZE": "0"}):
+            assert get_log_queue_size() == 0
+        with patch.dict(os.environ, {"LOG_QUEUE_SIZE": "lots"}):
+            assert get_log_queue_size() == 10000
+    
+    def test_records_are_written_by_background_listener(self, tmp_path):
+        """Records should reach the log file through the queue after shutdown flushes it."""
+        log_dir = tmp_path / "logs"
+        with patch("config.logging_config.LOG_DIR", log_dir), \
+             patch("config.logging_config._is_setup", False), \
+             patch("config.logging_config._logger", None), \
+             patch.dict(os.environ, {"DEBUG": "false", "LOG_QUEUE_SIZE": "100"}):
+            logger = setup_logging()
+            assert any(isinstance(h, BoundedQueueHandler) for h in logger.handlers)
+            assert not any(isinstance(h, logging.FileHandler) for h in logger.handlers)
+            logger.info("queued line one\nline two")
+            shutdown_logging()
+        
+        content = next(log_dir.glob("agent_*.log")).read_text()
+        assert "queued line one\n    line two" in content
+    
+    def test_synchronous_file_handler_when_queue_disabled(self, tmp_path):
+        """LOG_QUEUE_SIZE=0 should attach the file handler directly."""
+        with patch("config.logging_config.LOG_DIR", tmp_path), \
+             patch("config.logging_config._is_setup", False), \
+             patch("config.logging_config._logger", None), \
+             patch.dict(os.environ, {"DEBUG": "false", "LOG_QUEUE_SIZE": "0"}):
+            logger = setup_logging()
+            assert any(isinstance(h, logging.FileHandler) for h in logger.handlers)
+    
+    def test_full_queue_drops_and_reports(self):
+        """A full queue should drop low-level records without blocking and report them later."""
+        log_queue = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue)
+        logger = logging.getLogger("test-bounded-queue")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.handlers = [handler]
+        
+        for i in range(5):
+            logger.debug(f"message {i}")
+        assert handler.dropped == 3
+        
+        log_queue.get_nowait()
+        log_queue.get_nowait()
+        logger.info("after drain")
+        messages = [log_queue.get_nowait().getMessage() for _ in range(log_queue.qsize())]
+        assert messages == ["after drain", "Log queue full: dropped 3 record(s)"]
+
+
 class TestEventObserver:
     """Tests for event observer functionality."""
     
@@ -116,3 +178,64 @@ class TestEventObserver:
             observer(mock_emitter)
             mock_emitter.on.assert_not_called()
 
+
+class TestPayloadPreview:
+    """Tests for lazy, capped payload previews."""
+    
+    def test_renders_nested_fields(self):
+        """Objects, dicts and lists should render like their fields."""
+        class Message:
+            def __init__(self):
+                self.role = "user"
+                self.content = ["disk full"]
+        
+        assert str(PayloadPreview({"messages": [Message()], "n": 1})) == \
+            "{'messages': [Message(role='user', content=['disk full'])], 'n': 1}"
+    
+    def test_stops_rendering_at_limit(self):
+        """Large payloads should be cut at the limit without rendering every item."""
+        class Exploding:
+            def __str__(self):
+                raise AssertionError("rendered past the limit")
+        
+        preview = str(PayloadPreview(["x" * 100, Exploding()], limit=50))
+        
+        assert preview.endswith("... (truncated)")
+        assert len(preview) == 50 + len("... (truncated)")
+    
+    def test_is_not_rendered_when_record_is_filtered(self):
+        """The preview should only be rendered if a handler formats the record."""
+        preview = MagicMock()
+        logger = logging.getLogger("test-lazy-preview")
+        logger.setLevel(logging.WARNING)
+        
+        logger.info("Input: %s", preview)
+        
+        preview.__str__.assert_not_called()
+
+
+class TestEventFiltering:
+    """Tests for the events subscribed by the DEBUG observer."""
+    
+    @pytest.mark.asyncio
+    async def test_logs_only_lifecycle_events(self):
+        """Only start/success/error should be logged, not tokens or run.* mirrors."""
+        from beeai_framework.emitter import Emitter
+        
+        logger = MagicMock()
+        with patch("config.logging_config.get_logger", return_value=logger), \
+             patch.dict(os.environ, {"DEBUG": "true", "TRACE_ENABLED": "false"}):
+            observer = create_event_observer()
+        root = Emitter(namespace=["test"])
+        observer(root)
+        tool = MagicMock()
+        tool.name = "get_disk_usage"
+        emitter = root.child(namespace=["tool", "disk"], creator=tool)
+        
+        await emitter.emit("start", {"path": "/"})
+        await emitter.emit("new_token", "tok")
+        await emitter.emit("finish", None)
+        await root.child(namespace=["run", "tool"], creator=tool).emit("start", {})
+        
+        messages = [call.args[0] % call.args[1:] for call in logger.info.call_args_list]
+        assert messages == ["--> 🛠️  get_disk_usage[MagicMock][start]", "    Input: {'path': '/'}"]
@@ -0,0 +1,174 @@
+"""Tests for the vector index management utility."""
+import pytest
+
+from utils.manage_vector_index import (
+    IndexOptions,
+    build_index_sql,
+    create_index,
+    default_lists,
+    format_benchmark,
+    parse_args,
+    percentile,
+    recall_at_k,
+)
+
+
+class TestBuildIndexSql:
+    """Tests for build_index_sql."""
+
+    def test_hnsw_index_is_partial_on_collection(self):
+        """HNSW indexes should use the tuned build parameters and collection predicate."""
+        sql = build_index_sql(IndexOptions("hnsw", "cosine", m=24, ef_construction=100), "abc-uuid")
+        assert sql.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_knowledge_base_embedding_hnsw")
+        assert "USING hnsw (embedding vector_cosine_ops)" in sql
+        assert "WITH (m = 24, ef_construction = 100)" in sql
+        assert sql.endswith("WHERE collection_id = 'abc-uuid'")
+
+    def test_ivfflat_index_uses_lists(self):
+        """IVFFlat indexes should use the list count and distance operator class."""
+        sql = build_index_sql(IndexOptions("ivfflat", "l2", lists=300), "abc-uuid", concurrently=False)
+        assert "CONCURRENTLY" not in sql
+        assert "USING ivfflat (embedding vector_l2_ops) WITH (lists = 300)" in sql
+
+    def test_rejects_unknown_method(self):
+        """Unknown index methods should be rejected."""
+        with pytest.raises(ValueError):
+            build_index_sql(IndexOptions("btree"), "abc-uuid")
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    async def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    """Connection recording statements and answering catalog queries from a dict of index states."""
+
+    def __init__(self, typmod=-1, dims=(768,), indexes=None):
+        self.typmod = typmod
+        self.dims = dims
+        self.indexes = dict(indexes or {})
+        self.statements = []
+
+    async def execute(self, sql, params=None):
+        self.statements.append(sql)
+        if "FROM langchain_pg_collection" in sql:
+            return FakeCursor([("abc-uuid",)])
+        if "FROM pg_attribute" in sql:
+            return FakeCursor([(self.typmod,)])
+        if "vector_dims" in sql:
+            return FakeCursor([(dim,) for dim in self.dims])
+        if "FROM pg_index" in sql:
+            return FakeCursor([(name, self.indexes[name]) for name in params[0] if name in self.indexes])
+        if sql.startswith("CREATE INDEX"):
+            self.indexes.setdefault(sql.split(" IF NOT EXISTS ")[1].split()[0], True)
+        elif sql.startswith("DROP INDEX"):
+            self.indexes.pop(sql.split()[-1], None)
+        elif sql.startswith("ALTER INDEX"):
+            _, _, old, _, _, new = sql.split()
+            self.indexes[new] = self.indexes.pop(old)
+        return FakeCursor([])
+
+
+class TestCreateIndex:
+    """Tests for create_index against a recorded connection."""
+
+    @pytest.mark.asyncio
+    async def test_untyped_column_is_rejected(self):
+        """An untyped column should fail loudly instead of getting an index searches never use."""
+        conn = FakeConnection()
+
+        with pytest.raises(RuntimeError, match=r"TYPE vector\(768\)"):
+            await create_index(conn, IndexOptions("hnsw"))
+
+        assert not any(sql.startswith(("CREATE INDEX", "ALTER TABLE")) for sql in conn.statements)
+
+    @pytest.mark.asyncio
+    async def test_typed_column_is_indexed_directly(self):
+        """A typed column should be indexed as the plain column PGVector searches."""
+        conn = FakeConnection(typmod=768)
+
+        await create_index(conn, IndexOptions("hnsw"))
+
+        create = next(sql for sql in conn.statements if sql.startswith("CREATE INDEX"))
+        assert "USING hnsw (embedding vector_cosine_ops)" in create
+        assert "WHERE collection_id = 'abc-uuid'" in create
+
+    @pytest.mark.asyncio
+    async def test_rejects_mixed_dimensions_in_collection(self):
+        """Vectors of different dimensions in the collection cannot share an index."""
+        with pytest.raises(RuntimeError, match="mixed"):
+            await create_index(FakeConnection(dims=(384, 768)), IndexOptions("hnsw"))
+
+    @pytest.mark.asyncio
+    async def test_invalid_index_is_dropped_and_rebuilt(self):
+        """An INVALID leftover of a failed concurrent build should not be kept."""
+        conn = FakeConnection(typmod=768, indexes={"ix_knowledge_base_embedding_hnsw": False})
+
+        await create_index(conn, IndexOptions("hnsw"))
+
+        drop = conn.statements.index("DROP INDEX CONCURRENTLY IF EXISTS ix_knowledge_base_embedding_hnsw")
+        create = next(i for i, sql in enumerate(conn.statements) if sql.startswith("CREATE INDEX"))
+        assert drop < create
+        assert conn.indexes == {"ix_knowledge_base_embedding_hnsw": True}
+
+    @pytest.mark.asyncio
+    async def test_rebuild_swaps_in_new_index(self):
+        """The old index should only be dropped once its replacement is built."""
+        conn = FakeConnection(typmod=768, indexes={"ix_knowledge_base_embedding_hnsw": True})
+
+        await create_index(conn, IndexOptions("hnsw", m=32), rebuild=True)
+
+        create = next(i for i, sql in enumerate(conn.statements) if sql.startswith("CREATE INDEX"))
+        drop = conn.statements.index("DROP INDEX CONCURRENTLY IF EXISTS ix_knowledge_base_embedding_hnsw")
+        assert "ix_knowledge_base_embedding_hnsw_new" in conn.statements[create]
+        assert create < drop
+        assert conn.statements[drop + 1] == (
+            "ALTER INDEX ix_knowledge_base_embedding_hnsw_new RENAME TO ix_knowledge_base_embedding_hnsw"
+        )
+        assert conn.indexes == {"ix_knowledge_base_embedding_hnsw": True}
+
+
+class TestBenchmarkHelpers:
+    """Tests for recall and latency helpers."""
+
+    def test_recall_at_k(self):
+        """Recall should be the overlap with the exact results."""
+        assert recall_at_k(["a", "b", "x"], ["a", "b", "c"]) == pytest.approx(2 / 3)
+        assert recall_at_k([], []) == 1.0
+
+    def test_percentile(self):
+        """Nearest-rank percentiles."""
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile([], 50) == 0.0
+
+    def test_default_lists(self):
+        """List count should follow pgvector's sizing guidance."""
+        assert default_lists(500) == 1
+        assert default_lists(200_000) == 200
+        assert default_lists(4_000_000) == 2000
+
+    def test_format_benchmark(self):
+        """The report should label the exact baseline and each setting."""
+        report = format_benchmark("hnsw", [
+            {"value": 0, "recall": 1.0, "p50_ms": 12.0, "p95_ms": 15.0},
+            {"value": 40, "recall": 0.97, "p50_ms": 1.5, "p95_ms": 2.0},
+        ], k=10)
+        assert "hnsw.ef_search" in report
+        assert "exact" in report
+        assert "0.970" in report
+
+    def test_parse_benchmark_args(self):
+        """Benchmark should accept a sweep of ef_search values."""
+        args = parse_args(["benchmark", "--ef-search", "20", "40", "--k", "5"])
+        assert args.command == "benchmark"
+        assert args.ef_search == [20, 40]
+        assert args.k == 5
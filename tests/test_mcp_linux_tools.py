@@ -28,21 +28,18 @@ class TestLinuxMCPIntegration:
     @pytest.mark.asyncio
     async def test_create_linux_tools_success(self, linux_server_path):
         """Test successful creation of Linux MCP tools."""
-        from mcp_linux_tools import create_linux_tools
+        from tools.mcp_linux_tools import create_linux_tools
         
-        # Mock the stdio_client and MCPTool.from_client
-        mock_client = MagicMock()
+        # Mock the session pool
         mock_tools = [
             Mock(name="get_system_info"),
             Mock(name="get_cpu_info"),
             Mock(name="list_services"),
         ]
         
-        with patch("mcp_linux_tools.stdio_client") as mock_stdio_client, \
-             patch("mcp_linux_tools.MCPTool.from_client", new_callable=AsyncMock) as mock_from_client:
+        with patch("tools.mcp_linux_tools.get_session_pool", new_callable=AsyncMock) as mock_get_pool:
             
-            mock_stdio_client.return_value = mock_client
-            mock_from_client.return_value = mock_tools
+            mock_get_pool.return_value.create_tools.return_value = mock_tools
             
             # Call create_linux_tools
             tools = await create_linux_tools(server_path=linux_server_path)
@@ -52,9 +49,9 @@ class TestLinuxMCPIntegration:
             assert len(tools) == 3
             assert all(isinstance(tool, Mock) for tool in tools)
             
-            # Verify stdio_client was called with correct parameters
-            mock_stdio_client.assert_called_once()
-            call_args = mock_stdio_client.call_args[0][0]
+            # Verify the pool was requested with correct server parameters
+            mock_get_pool.assert_called_once()
+            call_args = mock_get_pool.call_args[0][0]
             
             # Check that we're running the correct command (venv python)
             assert str(call_args.command).endswith(".venv/bin/python")
@@ -64,16 +61,13 @@ class TestLinuxMCPIntegration:
     @pytest.mark.asyncio
     async def test_create_linux_tools_with_log_paths(self, linux_server_path, mock_allowed_log_paths):
         """Test creating Linux tools with allowed log paths."""
-        from mcp_linux_tools import create_linux_tools
+        from tools.mcp_linux_tools import create_linux_tools
         
-        mock_client = MagicMock()
         mock_tools = [Mock(name="get_system_info")]
         
-        with patch("mcp_linux_tools.stdio_client") as mock_stdio_client, \
-             patch("mcp_linux_tools.MCPTool.from_client", new_callable=AsyncMock) as mock_from_client:
+        with patch("tools.mcp_linux_tools.get_session_pool", new_callable=AsyncMock) as mock_get_pool:
             
-            mock_stdio_client.return_value = mock_client
-            mock_from_client.return_value = mock_tools
+            mock_get_pool.return_value.create_tools.return_value = mock_tools
             
             # Call with log paths
             tools = await create_linux_tools(
@@ -82,7 +76,7 @@ class TestLinuxMCPIntegration:
             )
             
             # Verify environment variable was set in server params
-            call_args = mock_stdio_client.call_args[0][0]
+            call_args = mock_get_pool.call_args[0][0]
             assert call_args.env is not None
             assert "LINUX_MCP_ALLOWED_LOG_PATHS" in call_args.env
             assert call_args.env["LINUX_MCP_ALLOWED_LOG_PATHS"] == mock_allowed_log_paths
@@ -90,7 +84,7 @@ class TestLinuxMCPIntegration:
     @pytest.mark.asyncio
     async def test_create_linux_tools_server_path_validation(self):
         """Test that invalid server path raises appropriate error."""
-        from mcp_linux_tools import create_linux_tools
+        from tools.mcp_linux_tools import create_linux_tools
         
         # Test with non-existent path
         with pytest.raises(ValueError, match="Linux MCP server path does not exist"):
@@ -99,7 +93,7 @@ class TestLinuxMCPIntegration:
     @pytest.mark.asyncio
     async def test_create_linux_tools_venv_validation(self, tmp_path):
         """Test that missing venv raises appropriate error."""
-        from mcp_linux_tools import create_linux_tools
+        from tools.mcp_linux_tools import create_linux_tools
         
         # Create a directory without venv
         fake_server_path = tmp_path / "linux-mcp-server"
@@ -112,15 +106,13 @@ class TestLinuxMCPIntegration:
     @pytest.mark.asyncio
     async def test_create_linux_tools_default_server_path(self):
         """Test that default server path is used when none provided."""
-        from mcp_linux_tools import create_linux_tools
+        from tools.mcp_linux_tools import create_linux_tools
         
-        mock_client = MagicMock()
         mock_tools = [Mock(name="get_system_info")]
         
         # Mock Path.home() to return a test directory
-        with patch("mcp_linux_tools.stdio_client") as mock_stdio_client, \
-             patch("mcp_linux_tools.MCPTool.from_client", new_callable=AsyncMock) as mock_from_client, \
-             patch("mcp_linux_tools.Path") as mock_path_class:
+        with patch("tools.mcp_linux_tools.get_session_pool", new_callable=AsyncMock) as mock_get_pool, \
+             patch("tools.mcp_linux_tools.Path") as mock_path_class:
             
             # Setup mock path
             mock_home = MagicMock()
@@ -129,8 +121,7 @@ class TestLinuxMCPIntegration:
             mock_home.__truediv__.return_value = mock_server_path
             mock_path_class.home.return_value = mock_home
             
-            mock_stdio_client.return_value = mock_client
-            mock_from_client.return_value = mock_tools
+            mock_get_pool.return_value.create_tools.return_value = mock_tools
             
             # Call without server_path
             tools = await create_linux_tools()
@@ -141,35 +132,31 @@ class TestLinuxMCPIntegration:
     @pytest.mark.asyncio
     async def test_create_linux_tools_preserves_environment(self, linux_server_path):
         """Test that current environment variables are preserved."""
-        from mcp_linux_tools import create_linux_tools
+        from tools.mcp_linux_tools import create_linux_tools
         
-        mock_client = MagicMock()
         mock_tools = [Mock(name="get_system_info")]
         
-        with patch("mcp_linux_tools.stdio_client") as mock_stdio_client, \
-             patch("mcp_linux_tools.MCPTool.from_client", new_callable=AsyncMock) as mock_from_client:
+        with patch("tools.mcp_linux_tools.get_session_pool", new_callable=AsyncMock) as mock_get_pool:
             
-            mock_stdio_client.return_value = mock_client
-            mock_from_client.return_value = mock_tools
+            mock_get_pool.return_value.create_tools.return_value = mock_tools
             
             # Call without log paths
             tools = await create_linux_tools(server_path=linux_server_path)
             
             # Verify environment is None (will inherit from current process)
-            call_args = mock_stdio_client.call_args[0][0]
+            call_args = mock_get_pool.call_args[0][0]
             # When no log paths specified, env should be None to inherit current env
             assert call_args.env is None
 
     @pytest.mark.asyncio
     async def test_create_linux_tools_connection_error(self, linux_server_path):
         """Test handling of connection errors."""
-        from mcp_linux_tools import create_linux_tools
+        from tools.mcp_linux_tools import create_linux_tools
         
-        with patch("mcp_linux_tools.stdio_client") as mock_stdio_client, \
-             patch("mcp_linux_tools.MCPTool.from_client", new_callable=AsyncMock) as mock_from_client:
+        with patch("tools.mcp_linux_tools.get_session_pool", new_callable=AsyncMock) as mock_get_pool:
             
             # Simulate connection error
-            mock_from_client.side_effect = Exception("Connection failed")
+            mock_get_pool.side_effect = Exception("Connection failed")
             
             # Should propagate the exception
             with pytest.raises(Exception, match="Connection failed"):
@@ -182,7 +169,7 @@ class TestLinuxMCPToolsModule:
     def test_module_imports(self):
         """Test that module can be imported."""
         try:
-            import mcp_linux_tools
+            from tools import mcp_linux_tools
             assert hasattr(mcp_linux_tools, "create_linux_tools")
         except ImportError:
             pytest.fail("Could not import mcp_linux_tools module")
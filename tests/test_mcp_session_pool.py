@@ -0,0 +1,253 @@
+"""Tests for the long-lived MCP session pool.
+
+The pool is exercised against in-memory FastMCP servers, so no subprocess
+or linux-mcp-server installation is required.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import anyio
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.client.stdio import StdioServerParameters
+from mcp.shared.memory import create_client_server_memory_streams
+
+from tools.mcp_session_pool import MCPSessionPool, close_session_pools, get_session_pool
+
+
+def create_fake_server() -> FastMCP:
+    """Create a FastMCP server exposing a couple of read-only tools."""
+    server = FastMCP("fake-linux-mcp-server")
+
+    @server.tool()
+    def get_system_info() -> str:
+        """Return fake system information."""
+        return "hostname: test-host"
+
+    @server.tool()
+    async def slow_echo(text: str, delay: float = 0.2) -> str:
+        """Echo text back after a delay."""
+        await asyncio.sleep(delay)
+        return text
+
+    return server
+
+
+class FakeClientFactory:
+    """Client factory connecting to fresh in-memory server instances."""
+
+    def __init__(self):
+        self.connections = 0
+        self.fail = False
+        self.server_scopes = []
+
+    @asynccontextmanager
+    async def _client(self):
+        if self.fail:
+            raise ConnectionError("server binary missing")
+        self.connections += 1
+        server = create_fake_server()._mcp_server
+        server_scope = anyio.CancelScope()
+        self.server_scopes.append(server_scope)
+
+        async def run_server(read_stream, write_stream):
+            with server_scope:
+                await server.run(read_stream, write_stream, server.create_initialization_options())
+
+        async with create_client_server_memory_streams() as (client_streams, server_streams):
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(run_server, *server_streams)
+                yield client_streams
+                tg.cancel_scope.cancel()
+
+    def __call__(self):
+        return self._client()
+
+
+@pytest.fixture
+def client_factory():
+    """Fixture providing a fake client factory."""
+    return FakeClientFactory()
+
+
+class TestMCPSessionPool:
+    """Test suite for MCPSessionPool."""
+
+    @pytest.mark.asyncio
+    async def test_start_keeps_sessions_warm(self, client_factory):
+        """Starting the pool should open every session once."""
+        pool = await MCPSessionPool(client_factory, size=2, health_check_interval=60).start()
+        try:
+            assert client_factory.connections == 2
+            assert pool.stats()["healthy"] == 2
+
+            # Repeated calls reuse the warm sessions
+            for _ in range(3):
+                result = await pool.call_tool("get_system_info", {})
+                assert not result.isError
+            assert client_factory.connections == 2
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_create_tools_are_bound_to_pool(self, client_factory):
+        """Tools created from the pool should run through pooled sessions."""
+        pool = await MCPSessionPool(client_factory, size=1, health_check_interval=60).start()
+        try:
+            tools = await pool.create_tools()
+            by_name = {tool.name: tool for tool in tools}
+            assert set(by_name) == {"get_system_info", "slow_echo"}
+
+            output = await by_name["get_system_info"].run({})
+            assert "test-host" in output.get_text_content()
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_calls_are_spread_over_least_busy_sessions(self, client_factory):
+        """Concurrent calls should be multiplexed across all sessions."""
+        pool = await MCPSessionPool(client_factory, size=2, health_check_interval=60).start()
+        try:
+            await asyncio.gather(*(pool.call_tool("slow_echo", {"text": str(i)}) for i in range(4)))
+            calls = [session["calls"] for session in pool.stats()["sessions"]]
+            assert calls == [2, 2]
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_independent_calls_run_concurrently(self, client_factory):
+        """Independent tool calls issued together should overlap in time."""
+        pool = await MCPSessionPool(client_factory, size=2, max_concurrency=4, health_check_interval=60).start()
+        try:
+            start = asyncio.get_running_loop().time()
+            await asyncio.gather(*(pool.call_tool("slow_echo", {"text": str(i), "delay": 0.3}) for i in range(4)))
+            elapsed = asyncio.get_running_loop().time() - start
+            assert elapsed < 0.9
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_max_concurrency_bounds_in_flight_calls(self, client_factory):
+        """No more than max_concurrency calls should be in flight at once."""
+        pool = await MCPSessionPool(client_factory, size=2, max_concurrency=2, health_check_interval=60).start()
+        try:
+            peak = 0
+
+            async def watch():
+                nonlocal peak
+                while True:
+                    peak = max(peak, pool.stats()["in_flight"])
+                    await asyncio.sleep(0.01)
+
+            watcher = asyncio.create_task(watch())
+            await asyncio.gather(*(pool.call_tool("slow_echo", {"text": str(i), "delay": 0.1}) for i in range(6)))
+            watcher.cancel()
+
+            assert peak == 2
+            assert pool.stats()["max_concurrency"] == 2
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_health_check_restarts_crashed_session(self, client_factory):
+        """A session whose transport task died should be restarted by the health check."""
+        pool = await MCPSessionPool(client_factory, size=1, health_check_interval=60).start()
+        try:
+            slot = pool._slots[0]
+            slot.task.cancel()
+            await asyncio.wait([slot.task])
+            assert not slot.healthy
+
+            await asyncio.wait_for(pool.check_health(), timeout=5)
+
+            assert slot.healthy
+            assert slot.restarts == 1
+            assert client_factory.connections == 2
+            result = await pool.call_tool("get_system_info", {})
+            assert not result.isError
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_health_check_restarts_unresponsive_server(self, client_factory):
+        """A server that stops answering pings should be replaced."""
+        pool = await MCPSessionPool(client_factory, size=1, health_check_interval=60, ping_timeout=0.2).start()
+        try:
+            client_factory.server_scopes[0].cancel()
+
+            await asyncio.wait_for(pool.check_health(), timeout=5)
+
+            assert pool._slots[0].restarts == 1
+            result = await asyncio.wait_for(pool.call_tool("get_system_info", {}), timeout=5)
+            assert not result.isError
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_call_revives_dead_pool(self, client_factory):
+        """Calls should restart sessions when no healthy session is left."""
+        pool = await MCPSessionPool(client_factory, size=1, health_check_interval=60).start()
+        try:
+            pool._slots[0].task.cancel()
+            await asyncio.wait([pool._slots[0].task])
+
+            result = await asyncio.wait_for(pool.call_tool("get_system_info", {}), timeout=5)
+
+            assert not result.isError
+            assert pool._slots[0].restarts == 1
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_call_retries_when_session_goes_away(self, client_factory):
+        """A session lost after its slot was picked should be retried on another session."""
+        pool = await MCPSessionPool(client_factory, size=2, health_check_interval=60).start()
+        acquire_slot = pool._acquire_slot
+
+        async def losing_acquire_slot(exclude=None):
+            slot = await acquire_slot(exclude=exclude)
+            if exclude is None:
+                slot.session = None
+            return slot
+
+        try:
+            with patch.object(pool, "_acquire_slot", losing_acquire_slot):
+                result = await asyncio.wait_for(pool.call_tool("get_system_info", {}), timeout=5)
+
+            assert not result.isError
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_start_fails_when_no_session_starts(self, client_factory):
+        """Starting should raise when no server could be started."""
+        client_factory.fail = True
+        with pytest.raises(RuntimeError, match="Failed to start any"):
+            await MCPSessionPool(client_factory, size=2).start()
+
+    @pytest.mark.asyncio
+    async def test_closed_pool_rejects_calls(self, client_factory):
+        """Calls after close() should fail fast."""
+        pool = await MCPSessionPool(client_factory, size=1).start()
+        await pool.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            await pool.call_tool("get_system_info", {})
+
+
+class TestGetSessionPool:
+    """Tests for the process-wide pool registry."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_calls_share_one_pool(self, client_factory):
+        """Callers racing to create the pool should all get the same one."""
+        params = StdioServerParameters(command="linux-mcp-server")
+        with patch("tools.mcp_session_pool.stdio_client", lambda _: client_factory()), \
+             patch.dict("tools.mcp_session_pool._pools", clear=True):
+            try:
+                first, second = await asyncio.gather(get_session_pool(params), get_session_pool(params))
+            finally:
+                await close_session_pools()
+
+        assert first is second
+        assert client_factory.connections == 1
@@ -0,0 +1,168 @@
+"""Tests for the MCP tool result cache."""
+import os
+from unittest.mock import patch
+
+import pytest
+from beeai_framework.tools import ToolError
+from mcp.types import CallToolResult, TextContent, Tool as MCPToolInfo
+
+from config.mcp_config import MCPCacheConfig
+from tools.mcp_tool_cache import CachedMCPTool, ToolResultCache, normalize_arguments
+
+
+class FakeSession:
+    """Session stub counting tool calls."""
+
+    def __init__(self, is_error=False):
+        self.calls = []
+        self.is_error = is_error
+
+    async def call_tool(self, name, arguments=None, **kwargs):
+        self.calls.append((name, arguments))
+        return CallToolResult(
+            content=[TextContent(type="text", text=f"{name} call #{len(self.calls)}")],
+            isError=self.is_error,
+        )
+
+
+def create_tool(session, name, cache):
+    """Create a cached tool with an optional 'unit' string argument."""
+    info = MCPToolInfo(
+        name=name,
+        description=f"{name} tool",
+        inputSchema={"type": "object", "properties": {"unit": {"type": "string"}}},
+    )
+    return CachedMCPTool(session, info, result_cache=cache)
+
+
+class TestNormalizeArguments:
+    """Tests for normalize_arguments."""
+
+    def test_ignores_key_order_and_none_values(self):
+        """Equivalent argument dicts should produce the same key."""
+        assert normalize_arguments({"b": 1, "a": {"y": 2, "x": 1}}) == normalize_arguments(
+            {"a": {"x": 1, "y": 2}, "b": 1, "c": None}
+        )
+
+    def test_empty_arguments(self):
+        """None and an empty dict should be equivalent."""
+        assert normalize_arguments(None) == normalize_arguments({})
+
+
+class TestToolResultCache:
+    """Test suite for ToolResultCache."""
+
+    def test_expires_entries_after_tool_ttl(self):
+        """Entries should expire after the TTL of their tool."""
+        cache = ToolResultCache(MCPCacheConfig(ttls={"list_processes": 5.0}))
+        with patch("tools.mcp_tool_cache.time.monotonic", return_value=100.0):
+            cache.set("list_processes", "{}", "result")
+            assert cache.get("list_processes", "{}") == "result"
+        with patch("tools.mcp_tool_cache.time.monotonic", return_value=106.0):
+            assert cache.get("list_processes", "{}") is None
+        assert cache.stats()["tools"]["list_processes"] == {"hits": 1, "misses": 1}
+
+    def test_evicts_least_recently_used_entries(self):
+        """The store should stay within max_size, evicting the LRU entry."""
+        cache = ToolResultCache(MCPCacheConfig(max_size=2))
+        cache.set("get_system_info", "a", 1)
+        cache.set("get_system_info", "b", 2)
+        cache.get("get_system_info", "a")
+        cache.set("get_system_info", "c", 3)
+
+        assert cache.get("get_system_info", "b") is None
+        assert cache.get("get_system_info", "a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_zero_ttl_disables_tool(self):
+        """A TTL of 0 should disable caching for that tool only."""
+        cache = ToolResultCache(MCPCacheConfig(ttls={"list_processes": 0.0}))
+        assert not cache.enabled_for("list_processes")
+        assert cache.enabled_for("get_hardware_info")
+
+
+class TestCachedMCPTool:
+    """Test suite for CachedMCPTool."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_call_is_served_from_cache(self):
+        """Calling a tool twice with equivalent arguments should hit the host once."""
+        session = FakeSession()
+        cache = ToolResultCache()
+        tool = create_tool(session, "get_hardware_info", cache)
+
+        first = await tool.run({"unit": "GB"})
+        second = await tool.run({"unit": "GB"})
+
+        assert len(session.calls) == 1
+        assert second.get_text_content() == first.get_text_content()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_is_keyed_by_tool_and_arguments(self):
+        """Different arguments or tools should not share entries."""
+        session = FakeSession()
+        cache = ToolResultCache()
+        disk = create_tool(session, "get_disk_usage", cache)
+        memory = create_tool(session, "get_memory_info", cache)
+
+        await disk.run({"unit": "GB"})
+        await disk.run({"unit": "MB"})
+        await memory.run({"unit": "GB"})
+
+        assert len(session.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_clone_shares_session_and_cache(self):
+        """A cloned tool should call the same session and hit the same cache."""
+        session = FakeSession()
+        cache = ToolResultCache()
+        tool = create_tool(session, "get_hardware_info", cache)
+        tool.middlewares.append(lambda ctx: None)
+
+        clone = await tool.clone()
+        await tool.run({"unit": "GB"})
+        await clone.run({"unit": "GB"})
+
+        assert isinstance(clone, CachedMCPTool)
+        assert clone.middlewares == tool.middlewares
+        assert len(session.calls) == 1
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self):
+        """Failed tool calls should be re-executed."""
+        session = FakeSession(is_error=True)
+        tool = create_tool(session, "get_service_status", ToolResultCache())
+
+        for _ in range(2):
+            with pytest.raises(ToolError):
+                await tool.run({})
+
+        assert len(session.calls) == 2
+
+
+class TestMCPCacheConfig:
+    """Tests for MCPCacheConfig.from_env."""
+
+    def test_defaults(self):
+        """Should use long TTLs for hardware info and short ones for processes."""
+        with patch.dict(os.environ, {}, clear=True):
+            config = MCPCacheConfig.from_env()
+            assert config.enabled
+            assert config.ttl_for("get_hardware_info") > config.ttl_for("list_processes")
+            assert config.ttl_for("unknown_tool") == config.default_ttl
+
+    def test_reads_overrides_from_env(self):
+        """Should read size, enable flag and per-tool TTL overrides."""
+        with patch.dict(os.environ, {
+            "LINUX_MCP_CACHE_ENABLED": "false",
+            "LINUX_MCP_CACHE_SIZE": "10",
+            "LINUX_MCP_CACHE_TTLS": "list_processes=0, get_hardware_info=60,bogus",
+        }):
+            config = MCPCacheConfig.from_env()
+            assert not config.enabled
+            assert config.max_size == 10
+            assert config.ttl_for("list_processes") == 0.0
+            assert config.ttl_for("get_hardware_info") == 60.0
@@ -0,0 +1,137 @@
+"""Tests for the metrics registry and its Prometheus export."""
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+from beeai_framework.agents.requirement import RequirementAgent
+from beeai_framework.agents.requirement.requirements.conditional import ConditionalRequirement
+from beeai_framework.memory import UnconstrainedMemory
+from beeai_framework.tools.think import ThinkTool
+
+from benchmarks.fakes import ScriptedChatModel
+from config.mcp_config import MCPCacheConfig
+from config.metrics import (
+    CACHE_REQUESTS,
+    LLM_TOKENS,
+    TOOL_CALLS,
+    TOOL_SECONDS,
+    MetricsRegistry,
+    create_metrics_observer,
+    is_metrics_enabled,
+    start_metrics_server,
+    write_metrics_file,
+)
+from tools.mcp_tool_cache import ToolResultCache
+
+
+class TestRegistry:
+    """Tests for counters, histograms and rendering."""
+
+    def test_renders_prometheus_text(self):
+        """Counters and histograms should render in the exposition format."""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests.", ["tool"])
+        latency = registry.histogram("latency_seconds", "Latency.", ["tool"], buckets=(0.1, 1.0))
+        requests.inc(tool='say "hi"')
+        requests.inc(2, tool='say "hi"')
+        for value in (0.05, 0.5, 5.0):
+            latency.observe(value, tool="disk")
+
+        text = registry.render()
+
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{tool="say \\"hi\\""} 3' in text
+        assert "# TYPE latency_seconds histogram" in text
+        assert 'latency_seconds_bucket{tool="disk",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{tool="disk",le="1"} 2' in text
+        assert 'latency_seconds_bucket{tool="disk",le="+Inf"} 3' in text
+        assert 'latency_seconds_sum{tool="disk"} 5.55' in text
+        assert 'latency_seconds_count{tool="disk"} 3' in text
+
+    def test_registry_returns_existing_metric(self):
+        """Registering a name twice should return the same metric."""
+        registry = MetricsRegistry()
+        assert registry.counter("x_total", "X.") is registry.counter("x_total", "X.")
+
+    def test_enabled_by_flag_or_export(self):
+        """Metrics are enabled explicitly or by configuring an export."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert is_metrics_enabled() is False
+        with patch.dict(os.environ, {"METRICS_ENABLED": "true"}, clear=True):
+            assert is_metrics_enabled() is True
+        with patch.dict(os.environ, {"METRICS_FILE": "metrics.prom"}, clear=True):
+            assert is_metrics_enabled() is True
+
+
+class TestRecording:
+    """Tests for the sources feeding the registry."""
+
+    @pytest.mark.asyncio
+    async def test_observer_records_llm_and_tool_metrics(self):
+        """An agent run should record LLM tokens and per-tool calls and latency."""
+        agent = RequirementAgent(
+            llm=ScriptedChatModel(first_token_latency=0.0, token_latency=0.0, answer_tokens=3),
+            tools=[ThinkTool()],
+            memory=UnconstrainedMemory(),
+            requirements=[ConditionalRequirement(ThinkTool, force_at_step=1)],
+        )
+        tokens_before = LLM_TOKENS.value(model="scripted", direction="prompt")
+        calls_before = TOOL_CALLS.value(tool="think", status="ok")
+        observations_before = TOOL_SECONDS.count(tool="think")
+
+        await agent.run("Why is nginx down?").observe(create_metrics_observer())
+
+        assert LLM_TOKENS.value(model="scripted", direction="prompt") - tokens_before == 3000
+        assert TOOL_CALLS.value(tool="think", status="ok") - calls_before == 1
+        assert TOOL_SECONDS.count(tool="think") - observations_before == 1
+
+    def test_tool_cache_records_hits_and_misses(self):
+        """MCP result cache lookups should be counted."""
+        cache = ToolResultCache(MCPCacheConfig(default_ttl=60))
+        hits_before = CACHE_REQUESTS.value(cache="mcp_tool", result="hit")
+        misses_before = CACHE_REQUESTS.value(cache="mcp_tool", result="miss")
+
+        cache.get("get_disk_usage", "{}")
+        cache.set("get_disk_usage", "{}", "98%")
+        cache.get("get_disk_usage", "{}")
+
+        assert CACHE_REQUESTS.value(cache="mcp_tool", result="hit") - hits_before == 1
+        assert CACHE_REQUESTS.value(cache="mcp_tool", result="miss") - misses_before == 1
+
+
+class TestExport:
+    """Tests for the HTTP endpoint and the exit dump."""
+
+    @pytest.mark.asyncio
+    async def test_http_endpoint_serves_metrics(self):
+        """GET /metrics should return the registry; other paths 404."""
+        server = await start_metrics_server(0)
+        port = server.sockets[0].getsockname()[1]
+
+        async def get(path):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response.decode()
+
+        try:
+            metrics = await get("/metrics")
+            missing = await get("/")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        assert metrics.startswith("HTTP/1.1 200 OK")
+        assert "# TYPE tool_calls_total counter" in metrics
+        assert missing.startswith("HTTP/1.1 404")
+
+    def test_writes_metrics_file(self, tmp_path):
+        """write_metrics_file should dump the registry to METRICS_FILE."""
+        path = tmp_path / "metrics" / "agent.prom"
+        with patch.dict(os.environ, {"METRICS_FILE": str(path)}):
+            write_metrics_file()
+
+        assert "# TYPE llm_requests_total counter" in path.read_text()
@@ -0,0 +1,53 @@
+"""Tests for the import-time profile and the lazy-import guard."""
+import pytest
+
+from utils.profile_imports import (
+    DEFAULT_FORBIDDEN,
+    find_forbidden,
+    module_records,
+    parse_importtime,
+    profile_module,
+    total_ms,
+)
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 | site
+import time:       300 |        300 |     json.decoder
+import time:       200 |        500 |   json
+import time:       900 |       1400 | agent
+"""
+
+
+class TestParseImporttime:
+    """Tests for parsing -X importtime output."""
+
+    def test_parses_names_times_and_depth(self):
+        """Each line should become a record with its nesting depth."""
+        records = parse_importtime(SAMPLE)
+
+        assert [(r.name, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+            ("site", 120, 120, 0),
+            ("json.decoder", 300, 300, 2),
+            ("json", 200, 500, 1),
+            ("agent", 900, 1400, 0),
+        ]
+        assert total_ms(records, "agent") == 1.4
+
+    def test_module_records_exclude_interpreter_startup(self):
+        """Only the module and its nested imports should be attributed to it."""
+        records = module_records(parse_importtime(SAMPLE), "agent")
+
+        assert [r.name for r in records] == ["json.decoder", "json", "agent"]
+        assert find_forbidden(records, ["json", "site"]) == ["json"]
+
+
+class TestLazyImports:
+    """Guard against heavy packages being imported by the CLI entry modules."""
+
+    @pytest.mark.parametrize("module", ["agent", "agent_client"])
+    def test_entry_modules_defer_heavy_packages(self, module):
+        """Importing the entry modules should not load the framework, MCP or RAG stacks."""
+        records = module_records(profile_module(module), module)
+
+        assert records, f"{module} was not imported"
+        assert find_forbidden(records, DEFAULT_FORBIDDEN) == []
@@ -112,3 +112,34 @@ class TestRAGIntegration:
                     
                     assert rag_tool is not None
 
+
+    def test_create_rag_tool_uses_pooled_engine(self):
+        """The PGVector store should be created with connection pool settings."""
+        with patch.dict(os.environ, {
+            'EMBEDDING_PROVIDER': 'ollama',
+            'POSTGRES_POOL_SIZE': '3',
+            'POSTGRES_STATEMENT_TIMEOUT_MS': '5000'
+        }, clear=True):
+            with patch('tools.rag_integration.VectorStore') as mock_vector_store:
+                with patch('tools.rag_integration.VectorStoreSearchTool'):
+                    with patch('tools.rag_integration.EmbeddingModel.from_name'):
+                        create_rag_tool()
+
+                    engine_args = mock_vector_store.from_name.call_args[1]['engine_args']
+                    assert engine_args['pool_size'] == 3
+                    assert engine_args['pool_pre_ping'] is True
+                    assert 'statement_timeout=5000' in engine_args['connect_args']['options']
+
+    def test_create_rag_tool_types_embedding_column(self):
+        """The PGVector store should declare the embedding dimensions so ANN indexes are used."""
+        with patch.dict(os.environ, {'EMBEDDING_PROVIDER': 'ollama'}, clear=True):
+            with patch('tools.rag_integration.VectorStore') as mock_vector_store:
+                with patch('tools.rag_integration.VectorStoreSearchTool'):
+                    with patch('tools.rag_integration.EmbeddingModel.from_name'):
+                        create_rag_tool()
+                        with patch.dict(os.environ, {'EMBEDDING_DIMENSIONS': '384'}):
+                            create_rag_tool()
+
+        first, second = mock_vector_store.from_name.call_args_list
+        assert first[1]['embedding_length'] == 768
+        assert second[1]['embedding_length'] == 384
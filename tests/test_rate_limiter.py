@@ -0,0 +1,262 @@
+"""Tests for client-side provider rate limiting."""
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from beeai_framework.backend import AssistantMessage, ChatModel, ChatModelOutput, ChatModelParameters, UserMessage
+from beeai_framework.backend.embedding import EmbeddingModel
+from beeai_framework.backend.errors import ChatModelError
+from beeai_framework.backend.types import EmbeddingModelOutput
+
+from config.llm_config import RateLimitConfig, create_chat_model
+from tools.rate_limiter import (
+    ProviderRateLimiter,
+    RateLimitedChatModel,
+    RateLimitedEmbeddingModel,
+    get_rate_limiter,
+    retry_after,
+)
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.status_code = 429
+        self.headers = headers
+
+
+class RateLimitError(Exception):
+    """Provider error for HTTP 429, as raised by the provider SDKs."""
+
+    def __init__(self, headers=None):
+        super().__init__("429 Too Many Requests")
+        self.response = FakeResponse(headers or {})
+
+
+class ThrottledChatModel(ChatModel):
+    """Chat model rejecting its first requests with a rate limit error."""
+
+    provider_id = "watsonx"
+    model_id = "granite"
+
+    def __init__(self, rejections=1, error=None):
+        super().__init__(parameters=ChatModelParameters(stream=True))
+        self.rejections = rejections
+        self.error = error or RateLimitError({"retry-after": "0.05"})
+        self.calls = 0
+
+    async def _create(self, input, run):
+        chunks = [chunk async for chunk in self._create_stream(input, run)]
+        return ChatModelOutput.from_chunks(chunks)
+
+    async def _create_stream(self, input, run):
+        self.calls += 1
+        if self.calls <= self.rejections:
+            raise self.error
+        for word in ("disk ", "is ", "full"):
+            yield ChatModelOutput(output=[AssistantMessage(word)])
+
+
+class ThrottledEmbeddingModel(EmbeddingModel):
+    """Embedding model rejecting its first request with a rate limit error."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    @property
+    def model_id(self):
+        return "slate"
+
+    @property
+    def provider_id(self):
+        return "watsonx"
+
+    async def _create(self, input, run):
+        self.calls += 1
+        if self.calls == 1:
+            raise RateLimitError()
+        return EmbeddingModelOutput(values=input.values, embeddings=[[1.0, 0.0] for _ in input.values])
+
+
+def make_limiter(**limits):
+    return ProviderRateLimiter("watsonx", RateLimitConfig(backoff=0.01, **limits))
+
+
+class TestRetryAfter:
+    """Tests for recognizing rate limit errors."""
+
+    def test_reads_retry_after_through_wrapping_errors(self):
+        """Retry-After should be found on the provider error behind a ChatModelError."""
+        error = ChatModelError("Chat model failed", cause=RateLimitError({"retry-after": "7"}))
+
+        assert retry_after(error) == 7.0
+        assert retry_after(RateLimitError({"retry-after-ms": "250"})) == 0.25
+        assert retry_after(RateLimitError()) == 0.0
+
+    def test_other_errors_are_not_rate_limits(self):
+        """Errors other than 429 should not be retried."""
+        assert retry_after(ChatModelError("failed", cause=ConnectionError("down"))) is None
+
+
+class TestProviderRateLimiter:
+    """Test suite for ProviderRateLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_tokens_per_minute_queue_requests(self):
+        """Once a minute's tokens are used, requests should wait for the bucket to refill."""
+        limiter = make_limiter(tokens_per_minute=6000)
+
+        await limiter.acquire(6000)
+        limiter.release(6000)
+        start = time.monotonic()
+        await limiter.acquire(10)
+
+        assert time.monotonic() - start >= 0.08
+        assert limiter.stats()["queued"] == 1
+
+    @pytest.mark.asyncio
+    async def test_reported_usage_corrects_estimate(self):
+        """Tokens reserved but not used should be returned to the bucket."""
+        limiter = make_limiter(tokens_per_minute=6000)
+
+        await limiter.acquire(6000)
+        limiter.release(6000, used=100)
+
+        assert limiter.tokens.delay(5000) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_max_in_flight(self):
+        """Requests beyond the in-flight cap should wait for a release."""
+        limiter = make_limiter(max_in_flight=1)
+        await limiter.acquire(1)
+
+        second = asyncio.ensure_future(limiter.acquire(1))
+        await asyncio.sleep(0.02)
+        assert not second.done()
+
+        limiter.release(1)
+        await asyncio.wait_for(second, 1.0)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_queued_request_frees_its_slot(self):
+        """A request cancelled while waiting for the rate limit should not keep its in-flight slot."""
+        limiter = make_limiter(max_in_flight=1, requests_per_minute=600)
+        limiter.retry_delay(RateLimitError({"retry-after": "5"}), 0, "watsonx:granite")
+
+        queued = asyncio.ensure_future(limiter.acquire(1))
+        await asyncio.sleep(0.02)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        limiter._paused_until = 0.0
+
+        await asyncio.wait_for(limiter.acquire(1), 1.0)
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_pauses_all_requests(self):
+        """After a 429, every request to the provider should hold off for Retry-After."""
+        limiter = make_limiter(requests_per_minute=600)
+
+        assert limiter.retry_delay(RateLimitError({"retry-after": "0.1"}), 0, "watsonx:granite") == 0.1
+        start = time.monotonic()
+        await limiter.acquire(1)
+
+        assert time.monotonic() - start >= 0.08
+        assert limiter.stats()["rate_limited"] == 1
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Without Retry-After, the delay should grow exponentially with jitter up to the cap."""
+        limiter = ProviderRateLimiter("watsonx", RateLimitConfig(max_in_flight=1, backoff=1.0, max_backoff=4.0))
+
+        first = limiter.retry_delay(RateLimitError(), 0, "watsonx:granite")
+        late = limiter.retry_delay(RateLimitError(), 3, "watsonx:granite")
+
+        assert 0.5 <= first <= 1.5
+        assert 2.0 <= late <= 6.0
+        assert limiter.retry_delay(RateLimitError(), 4, "watsonx:granite") is None
+
+
+class TestRateLimitedModels:
+    """Tests for chat and embedding models behind a limiter."""
+
+    @pytest.mark.asyncio
+    async def test_chat_request_retried_after_rate_limit(self):
+        """A 429 before the first chunk should be retried once the provider allows it."""
+        inner = ThrottledChatModel()
+        limiter = make_limiter(requests_per_minute=600)
+        model = RateLimitedChatModel(inner, limiter)
+
+        output = await model.run([UserMessage("Why is nginx down?")])
+
+        assert output.get_text_content() == "disk is full"
+        assert inner.calls == 2
+        assert limiter.stats()["retries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """A provider that keeps rejecting should fail the request."""
+        limiter = ProviderRateLimiter("watsonx", RateLimitConfig(max_in_flight=2, max_retries=1, backoff=0.01))
+        model = RateLimitedChatModel(ThrottledChatModel(rejections=5, error=RateLimitError()), limiter)
+
+        with pytest.raises(ChatModelError):
+            await model.run([UserMessage("Why is nginx down?")])
+        assert limiter.stats()["rate_limited"] == 2
+
+    @pytest.mark.asyncio
+    async def test_other_errors_fail_at_once(self):
+        """Errors other than rate limits should not be retried."""
+        inner = ThrottledChatModel(error=ConnectionError("down"))
+        model = RateLimitedChatModel(inner, make_limiter(max_in_flight=1))
+
+        with pytest.raises(ChatModelError):
+            await model.run([UserMessage("Why is nginx down?")])
+        assert inner.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_embedding_request_retried_after_rate_limit(self):
+        """Embedding calls should share the limiter and retry rate limits."""
+        inner = ThrottledEmbeddingModel()
+        limiter = make_limiter(tokens_per_minute=60000)
+        model = RateLimitedEmbeddingModel(inner, limiter)
+
+        output = await model.create(["disk full"])
+
+        assert output.embeddings == [[1.0, 0.0]]
+        assert inner.calls == 2
+        assert limiter.stats()["admitted"] == 2
+
+
+class TestRateLimitConfig:
+    """Tests for configuring provider limits."""
+
+    def test_reads_provider_limits(self):
+        """Limits should be read per provider; invalid values should be ignored."""
+        env = {
+            "RATE_LIMIT_WATSONX_RPM": "120",
+            "RATE_LIMIT_WATSONX_TPM": "oops",
+            "RATE_LIMIT_WATSONX_MAX_IN_FLIGHT": "4",
+            "RATE_LIMIT_MAX_RETRIES": "2",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            config = RateLimitConfig.from_env("watsonx")
+            other = RateLimitConfig.from_env("openai")
+
+        assert (config.requests_per_minute, config.tokens_per_minute, config.max_in_flight) == (120.0, None, 4)
+        assert config.max_retries == 2
+        assert config.enabled is True
+        assert other.enabled is False
+
+    @patch.dict("tools.rate_limiter._limiters", clear=True)
+    @patch("beeai_framework.backend.ChatModel.from_name")
+    def test_create_chat_model_shares_provider_limiter(self, mock_from_name):
+        """Chat models of a limited provider should be wrapped with one shared limiter."""
+        mock_from_name.side_effect = lambda name, *args, **kwargs: ThrottledChatModel()
+        with patch.dict(os.environ, {"RATE_LIMIT_WATSONX_RPM": "120"}, clear=True):
+            first = create_chat_model("watsonx", "granite")
+            second = create_chat_model("watsonx", "granite")
+            unlimited = create_chat_model("ollama", "llama3.2")
+
+        assert isinstance(first, RateLimitedChatModel)
+        assert first.limiter is second.limiter is get_rate_limiter("watsonx")
+        assert not isinstance(unlimited, RateLimitedChatModel)
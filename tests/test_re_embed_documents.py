@@ -0,0 +1,396 @@
+"""Tests for the re-embedding utility."""
+import asyncio
+import os
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from utils.re_embed_documents import (
+    AdaptiveBatchSizer,
+    BatchWatermark,
+    Checkpoint,
+    ThroughputMeter,
+    build_embedding_row,
+    build_select_query,
+    content_hash,
+    create_embedding_model,
+    embed_documents_concurrently,
+    is_rate_limit_error,
+    iter_document_batches,
+    load_checkpoint,
+    parse_args,
+    re_embed_all,
+    row_to_document,
+    save_checkpoint,
+    swap_in_staging,
+)
+
+
+class FakeServerCursor:
+    """Named cursor stub serving rows in fetchmany() chunks."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.position = 0
+        self.fetch_sizes = []
+        self.query = None
+        self.itersize = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, query, params=None):
+        self.query = query
+
+    async def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        chunk = self.rows[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+
+class FakeConnection:
+    """Connection stub recording the cursors it opens."""
+
+    def __init__(self, rows):
+        self.server_cursor = FakeServerCursor(rows)
+        self.cursor_names = []
+
+    def cursor(self, name=None):
+        self.cursor_names.append(name)
+        return self.server_cursor
+
+
+def make_rows(count):
+    """Build fake data_vectors rows."""
+    return [(i, f"text {i}", {"file_name": f"file_{i}.md"}) for i in range(count)]
+
+
+class TestRowToDocument:
+    """Tests for row_to_document."""
+
+    def test_uses_file_name_as_source(self):
+        """Should use the file name from metadata as the source."""
+        doc = row_to_document(7, "content", {"file_name": "guide.md"}, embedding_model="ollama:nomic-embed-text")
+        assert doc.content == "content"
+        assert doc.row_id == 7
+        assert doc.metadata == {
+            "source": "guide.md",
+            "original_id": "7",
+            "content_hash": content_hash("content"),
+            "embedding_model": "ollama:nomic-embed-text",
+        }
+
+    def test_falls_back_to_row_id(self):
+        """Should derive a source from the row id without metadata."""
+        doc = row_to_document(7, "content", None)
+        assert doc.metadata["source"] == "doc_7"
+
+
+class TestIterDocumentBatches:
+    """Tests for iter_document_batches."""
+
+    @pytest.mark.asyncio
+    async def test_streams_bounded_batches_from_server_side_cursor(self):
+        """Rows should be fetched through a named cursor in bounded chunks."""
+        conn = FakeConnection(make_rows(250))
+
+        batches = [batch async for batch in iter_document_batches(conn, batch_size=100)]
+
+        assert conn.cursor_names == ["re_embed_documents"]
+        assert [len(batch) for batch in batches] == [100, 100, 50]
+        assert set(conn.server_cursor.fetch_sizes) == {100}
+        assert batches[-1][-1].metadata["original_id"] == "249"
+
+    @pytest.mark.asyncio
+    async def test_empty_table_yields_nothing(self):
+        """An empty table should produce no batches."""
+        conn = FakeConnection([])
+        batches = [batch async for batch in iter_document_batches(conn)]
+        assert batches == []
+
+
+class TestIncrementalSelection:
+    """Tests for incremental query building and checkpoints."""
+
+    def test_full_query_selects_everything(self):
+        """Full mode without a checkpoint should select all rows."""
+        query, _ = build_select_query()
+        assert "WHERE" not in query
+        assert query.endswith("ORDER BY d.id")
+
+    def test_incremental_query_skips_up_to_date_rows(self):
+        """Incremental mode should compare content hash and model server-side."""
+        query, params = build_select_query(incremental=True, embedding_model="ollama:nomic-embed-text", after_id=41)
+        assert "NOT EXISTS" in query
+        assert "sha256(convert_to(d.text, 'UTF8'))" in query
+        assert "d.id > %(after_id)s" in query
+        assert params["embedding_model"] == "ollama:nomic-embed-text"
+        assert params["after_id"] == 41
+
+    def test_count_query(self):
+        """count=True should build a COUNT(*) query."""
+        query, _ = build_select_query(incremental=True, embedding_model="m", count=True)
+        assert query.startswith("SELECT COUNT(*) FROM data_vectors d WHERE")
+
+    def test_content_hash_matches_sql_encoding(self):
+        """The hash should be the hex SHA-256 of the UTF-8 text."""
+        assert content_hash("abc") == "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+
+    def test_checkpoint_round_trip(self, tmp_path):
+        """Checkpoints should survive a save/load cycle; bad files are ignored."""
+        path = str(tmp_path / "checkpoint.json")
+        save_checkpoint(path, Checkpoint("ollama:nomic-embed-text", True, 1234))
+        assert load_checkpoint(path) == Checkpoint("ollama:nomic-embed-text", True, 1234)
+
+        (tmp_path / "broken.json").write_text("{not json")
+        assert load_checkpoint(str(tmp_path / "broken.json")) is None
+        assert load_checkpoint(str(tmp_path / "missing.json")) is None
+
+    def test_watermark_only_advances_over_contiguous_batches(self):
+        """Out-of-order completion should not move the resume point past a pending batch."""
+        docs = [row_to_document(*row) for row in make_rows(30)]
+        watermark = BatchWatermark()
+        for seq in range(3):
+            watermark.register(seq, docs[seq * 10:(seq + 1) * 10])
+
+        assert watermark.complete(1) == (False, None)
+        assert watermark.complete(0) == (True, 19)
+        assert watermark.complete(2) == (True, 29)
+
+
+class RateLimitError(Exception):
+    """Provider error carrying an HTTP status code."""
+
+    status_code = 429
+
+
+async def stream(batches):
+    """Turn a list of batches into an async iterator."""
+    for batch in batches:
+        yield batch
+
+
+class TestAdaptiveBatchSizer:
+    """Tests for AdaptiveBatchSizer."""
+
+    def test_grows_additively_when_fast(self):
+        """Fast batches should grow the size by one step."""
+        sizer = AdaptiveBatchSizer(initial=100, target_latency=10.0)
+        sizer.record_success(1.0)
+        assert sizer.size == 125
+
+    def test_halves_when_slow_or_rate_limited(self):
+        """Slow or rejected batches should halve the size, within bounds."""
+        sizer = AdaptiveBatchSizer(initial=100, minimum=30, target_latency=10.0)
+        sizer.record_success(20.0)
+        assert sizer.size == 50
+        sizer.record_rate_limited()
+        assert sizer.size == 30
+
+    def test_detects_rate_limit_errors(self):
+        """429 status codes and rate limit exception types should be recognized, also as causes."""
+        assert is_rate_limit_error(RateLimitError())
+        wrapped = RuntimeError("embedding failed")
+        wrapped.__cause__ = RateLimitError()
+        assert is_rate_limit_error(wrapped)
+        assert not is_rate_limit_error(ValueError("bad input"))
+
+    def test_messages_mentioning_429_are_not_rate_limits(self):
+        """Only status codes and exception types count, not numbers in the message."""
+        assert not is_rate_limit_error(ValueError("batch of 429 documents has a dimension mismatch"))
+
+
+class TestEmbedDocumentsConcurrently:
+    """Tests for embed_documents_concurrently."""
+
+    @pytest.mark.asyncio
+    async def test_keeps_several_batches_in_flight(self):
+        """Writes should overlap up to the configured concurrency."""
+        docs = [row_to_document(*row) for row in make_rows(80)]
+        in_flight = peak = 0
+
+        async def write_batch(batch):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+
+        meter = ThroughputMeter(total=80)
+        sizer = AdaptiveBatchSizer(initial=10, minimum=10, maximum=10)
+        await embed_documents_concurrently(stream([docs[:40], docs[40:]]), write_batch, meter, concurrency=4, sizer=sizer)
+
+        assert peak == 4
+        assert meter.processed == 80
+        assert meter.batches == 8
+        assert meter.docs_per_second > 0
+
+    @pytest.mark.asyncio
+    async def test_retries_rate_limited_batches_with_smaller_size(self):
+        """A 429 should shrink future batches and retry the rejected one."""
+        docs = [row_to_document(*row) for row in make_rows(60)]
+        written = []
+        rejected = False
+
+        async def write_batch(batch):
+            nonlocal rejected
+            if not rejected:
+                rejected = True
+                raise RateLimitError("rate limited")
+            written.extend(doc.metadata["original_id"] for doc in batch)
+
+        meter = ThroughputMeter(total=60)
+        sizer = AdaptiveBatchSizer(initial=20, minimum=5, target_latency=10.0)
+        with patch("utils.re_embed_documents.RATE_LIMIT_BACKOFF", 0):
+            await embed_documents_concurrently(stream([docs]), write_batch, meter, concurrency=1, sizer=sizer)
+
+        assert sorted(written, key=int) == [str(i) for i in range(60)]
+        assert meter.rate_limited == 1
+        assert meter.processed == 60
+
+    @pytest.mark.asyncio
+    async def test_zero_concurrency_runs_one_worker(self):
+        """A concurrency below 1 should still finish with a single worker."""
+        written = []
+
+        async def write_batch(batch):
+            written.extend(batch)
+
+        docs = [row_to_document(*row) for row in make_rows(10)]
+        meter = ThroughputMeter(total=10)
+        await asyncio.wait_for(
+            embed_documents_concurrently(stream([docs]), write_batch, meter, concurrency=0), timeout=5
+        )
+        assert meter.processed == 10
+
+    def test_rejects_concurrency_below_one(self):
+        """--concurrency 0 should be a usage error."""
+        with pytest.raises(SystemExit):
+            parse_args(["--concurrency", "0"])
+
+    @pytest.mark.asyncio
+    async def test_propagates_other_errors(self):
+        """Non rate-limit failures should abort the run."""
+        async def write_batch(batch):
+            raise ValueError("dimension mismatch")
+
+        docs = [row_to_document(*row) for row in make_rows(10)]
+        with pytest.raises(ExceptionGroup) as exc_info:
+            await embed_documents_concurrently(stream([docs]), write_batch, ThroughputMeter(total=10), concurrency=2)
+        assert exc_info.group_contains(ValueError)
+
+    @pytest.mark.asyncio
+    async def test_reports_checkpoints(self):
+        """The resume point should end at the last row id."""
+        docs = [row_to_document(*row) for row in make_rows(35)]
+        checkpoints = []
+
+        async def write_batch(batch):
+            await asyncio.sleep(0.01 * (len(batch) % 3))
+
+        sizer = AdaptiveBatchSizer(initial=10, minimum=10, maximum=10)
+        await embed_documents_concurrently(
+            stream([docs]), write_batch, ThroughputMeter(total=35),
+            concurrency=3, sizer=sizer, on_checkpoint=checkpoints.append,
+        )
+
+        assert checkpoints == sorted(checkpoints)
+        assert checkpoints[-1] == 34
+
+
+class RecordingConnection:
+    """Connection stub recording statements and transaction boundaries."""
+
+    def __init__(self, rows=None):
+        self.events = []
+        self.rows = rows or []
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.events.append("BEGIN")
+        yield
+        self.events.append("COMMIT")
+
+    async def execute(self, query, params=None):
+        self.events.append(query.split(" (")[0].split(" WHERE")[0].split(" ON ")[0])
+        cursor = Mock()
+        cursor.fetchall = AsyncMock(return_value=self.rows)
+        return cursor
+
+
+class TestBulkLoad:
+    """Tests for the COPY-based bulk loader."""
+
+    def test_builds_rows_for_langchain_postgres_schema(self):
+        """Rows should follow the table's column order with a varchar id."""
+        columns = [("id", "varchar"), ("collection_id", "uuid"), ("embedding", "vector"),
+                   ("document", "varchar"), ("cmetadata", "jsonb")]
+        doc = row_to_document(3, "text", None, embedding_model="m")
+
+        row = build_embedding_row(columns, "collection-uuid", doc, [0.1, 0.2])
+
+        assert isinstance(row[0], str)
+        assert row[1:4] == ["collection-uuid", [0.1, 0.2], "text"]
+        assert row[4].obj == doc.metadata
+
+    def test_builds_rows_for_community_schema(self):
+        """A uuid key and custom_id column should be filled as well."""
+        columns = [("collection_id", "uuid"), ("embedding", "vector"), ("document", "varchar"),
+                   ("cmetadata", "json"), ("custom_id", "varchar"), ("uuid", "uuid")]
+        doc = row_to_document(3, "text", None)
+
+        row = build_embedding_row(columns, "collection-uuid", doc, [0.1])
+
+        assert row[4] == "3"
+        assert isinstance(row[5], uuid.UUID)
+
+    @pytest.mark.asyncio
+    async def test_swap_replaces_collection_in_one_transaction(self):
+        """The ANN index should be dropped for the swap and rebuilt inside the same transaction."""
+        index = ("ix_knowledge_base_embedding_hnsw",
+                 "CREATE INDEX ix_knowledge_base_embedding_hnsw ON public.langchain_pg_embedding USING hnsw")
+        conn = RecordingConnection(rows=[index])
+
+        await swap_in_staging(conn, [("id", "varchar"), ("document", "varchar")])
+
+        assert conn.events == [
+            "BEGIN",
+            "SELECT indexname, indexdef FROM pg_indexes",
+            'DROP INDEX "ix_knowledge_base_embedding_hnsw"',
+            "DELETE FROM langchain_pg_embedding",
+            "INSERT INTO langchain_pg_embedding",
+            "DROP TABLE langchain_pg_embedding_staging",
+            "CREATE INDEX ix_knowledge_base_embedding_hnsw",
+            "COMMIT",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_bulk_mode_rejects_incremental(self):
+        """Bulk loading is only available for full re-embedding."""
+        with pytest.raises(ValueError, match="incremental"):
+            await re_embed_all(bulk=True, incremental=True)
+
+
+class TestCreateEmbeddingModel:
+    """Tests for the re-embed job's embedding model."""
+
+    @patch.dict("tools.rate_limiter._limiters", clear=True)
+    @patch("utils.re_embed_documents.EmbeddingModel.from_name")
+    def test_wraps_model_in_provider_limiter(self, mock_from_name):
+        """The job's workers should share the provider's rate limiter."""
+        from tools.rate_limiter import RateLimitedEmbeddingModel, get_rate_limiter
+
+        with patch.dict(os.environ, {"RATE_LIMIT_OLLAMA_TPM": "60000"}, clear=True):
+            limited = create_embedding_model("ollama", "nomic-embed-text")
+            unlimited = create_embedding_model("openai", "text-embedding-3-small")
+
+        assert isinstance(limited, RateLimitedEmbeddingModel)
+        assert limited.limiter is get_rate_limiter("ollama")
+        assert unlimited is mock_from_name.return_value
+        mock_from_name.assert_any_call("ollama:nomic-embed-text", truncate_input_tokens=500)
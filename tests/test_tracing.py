@@ -0,0 +1,106 @@
+"""Tests for the JSONL trace log."""
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from beeai_framework.agents.requirement import RequirementAgent
+from beeai_framework.agents.requirement.requirements.conditional import ConditionalRequirement
+from beeai_framework.memory import UnconstrainedMemory
+from beeai_framework.tools.think import ThinkTool
+
+from benchmarks.fakes import ScriptedChatModel
+from config.logging_config import create_event_observer
+from config.tracing import TraceSink, create_trace_observer, get_trace_file, is_trace_enabled
+from utils.trace_summary import read_spans, summarize
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestTraceConfig:
+    """Tests for trace configuration."""
+
+    def test_disabled_by_default(self):
+        """Tracing should be off unless TRACE_ENABLED=true."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert is_trace_enabled() is False
+        with patch.dict(os.environ, {"TRACE_ENABLED": "true"}):
+            assert is_trace_enabled() is True
+
+    def test_trace_file_from_env(self, tmp_path):
+        """TRACE_FILE should override the dated default file."""
+        with patch.dict(os.environ, {"TRACE_FILE": str(tmp_path / "t.jsonl")}):
+            assert get_trace_file() == tmp_path / "t.jsonl"
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_trace_file().name.startswith("trace_")
+
+    def test_event_observer_includes_tracing_when_enabled(self):
+        """create_event_observer should register the span listeners when tracing is on."""
+        trace_observer = MagicMock()
+        with patch.dict(os.environ, {"TRACE_ENABLED": "true", "DEBUG": "false"}), \
+             patch("config.tracing.create_trace_observer", return_value=trace_observer):
+            emitter = MagicMock()
+            create_event_observer()(emitter)
+
+        trace_observer.assert_called_once_with(emitter)
+
+
+class TestTraceObserver:
+    """Tests for span records written during an agent run."""
+
+    @pytest.mark.asyncio
+    async def test_writes_one_record_per_span(self, tmp_path):
+        """An agent run should produce linked agent, llm and tool spans with timings."""
+        sink = TraceSink(tmp_path / "trace.jsonl")
+        agent = RequirementAgent(
+            llm=ScriptedChatModel(first_token_latency=0.0, token_latency=0.0, answer_tokens=3),
+            tools=[ThinkTool()],
+            memory=UnconstrainedMemory(),
+            requirements=[ConditionalRequirement(ThinkTool, force_at_step=1)],
+        )
+
+        await agent.run("Why is nginx down?").observe(create_trace_observer(sink))
+        sink.close()
+
+        records = read_records(tmp_path / "trace.jsonl")
+        root = next(r for r in records if r["kind"] == "agent")
+        assert root["parent_id"] is None
+        assert {r["trace_id"] for r in records} == {root["trace_id"]}
+
+        llm = [r for r in records if r["kind"] == "llm"]
+        tools = {r["name"]: r for r in records if r["kind"] == "tool"}
+        assert len(llm) == 2
+        assert llm[0]["prompt_tokens"] == 1500
+        assert set(tools) == {"think", "final_answer"}
+        assert tools["think"]["parent_id"] == root["span_id"]
+        assert tools["think"]["step"] == 1
+        assert tools["final_answer"]["step"] == 2
+        for record in records:
+            assert record["status"] == "ok"
+            assert record["end"] >= record["start"]
+            assert record["duration_ms"] >= 0
+
+
+class TestTraceSummary:
+    """Tests for utils/trace_summary.py."""
+
+    def test_breaks_down_run_time_by_kind(self, tmp_path):
+        """Span time should be aggregated per kind relative to total run time."""
+        spans = [
+            {"span_id": "a", "parent_id": None, "kind": "agent", "name": "agent", "duration_ms": 1000.0},
+            {"span_id": "l", "parent_id": "a", "kind": "llm", "name": "m", "duration_ms": 600.0, "total_tokens": 50},
+            {"span_id": "t", "parent_id": "a", "kind": "tool", "name": "get_disk_usage", "duration_ms": 300.0,
+             "status": "error"},
+        ]
+        path = tmp_path / "trace.jsonl"
+        path.write_text("\n".join(json.dumps(span) for span in spans) + '\n{"notice": "dropped"}\n')
+
+        summary = summarize(read_spans([str(path)]), by_name=True)
+
+        assert summary["runs"] == 1
+        assert summary["tokens"] == 50
+        assert summary["kinds"]["llm"]["share"] == pytest.approx(0.6)
+        assert summary["kinds"]["tool"]["errors"] == 1
+        assert summary["kinds"]["tool"]["names"]["get_disk_usage"]["total_ms"] == 300.0
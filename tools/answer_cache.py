@@ -0,0 +1,228 @@
+"""Semantic cache of final answers keyed on query embeddings.
+
+Users ask the same question in many words ("why is disk full", "disk almost
+full on /var"), and each paraphrase ends in the same tool plan and answer.
+SemanticAnswerCache embeds an incoming query with the knowledge-base
+embedding model, compares it with earlier queries asked about the same host
+within a freshness window, and returns the stored answer when the cosine
+similarity reaches a threshold, so the agent does not run at all.
+
+Answers are kept in a SQLite file shared across runs. Since a diagnostic
+answer is only as good as the host state it was based on, entries expire
+after max_age seconds. To measure precision, a fraction of hits
+(verify_rate) is still answered by the agent; the cached and the fresh
+answer are compared by embedding similarity and the hit is counted as
+confirmed or rejected. SQLite work runs in a worker thread to keep the
+event loop free.
+"""
+import asyncio
+import math
+import random
+import sqlite3
+import threading
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.agent_config import AnswerCacheConfig
+from config.logging_config import get_logger
+from config.metrics import record_cache_lookups
+
+_cache: Optional["SemanticAnswerCache"] = None
+
+# Hits whose similarity is kept for the mean_similarity statistic
+SIMILARITY_WINDOW = 1000
+
+
+@dataclass
+class CachedAnswer:
+    """An answer served from the cache."""
+
+    query: str
+    answer: str
+    similarity: float
+    age: float
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length (so cosine similarity is a dot product)."""
+    norm = math.sqrt(sum(value * value for value in vector))
+    return [value / norm for value in vector] if norm else list(vector)
+
+
+def _dot(left: List[float], right: List[float]) -> float:
+    return math.fsum(a * b for a, b in zip(left, right))
+
+
+class SemanticAnswerCache:
+    """SQLite-backed store of answers looked up by query similarity."""
+
+    def __init__(self, embedding_model: Any, config: AnswerCacheConfig) -> None:
+        """Open (or create) the cache.
+
+        Args:
+            embedding_model: beeai EmbeddingModel used to embed queries.
+            config: Cache configuration (path, threshold, freshness window, host).
+        """
+        self.embedding_model = embedding_model
+        self.config = config
+        self.model_name = f"{embedding_model.provider_id}:{embedding_model.model_id}"
+        self.lookups = 0
+        self.hits = 0
+        self.confirmed = 0
+        self.rejected = 0
+        self._similarities: "deque[float]" = deque(maxlen=SIMILARITY_WINDOW)
+
+        path = Path(config.path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "id INTEGER PRIMARY KEY, host TEXT NOT NULL, model TEXT NOT NULL, created REAL NOT NULL, "
+            "query TEXT NOT NULL, embedding BLOB NOT NULL, answer TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS answers_scope ON answers (host, model, created)")
+        self._conn.commit()
+
+    async def _embed(self, text: str) -> List[float]:
+        output = await self.embedding_model.create([text])
+        return _normalize(output.embeddings[0])
+
+    def _candidates(self, now: float) -> List[Tuple[str, str, float, List[float]]]:
+        """Fresh entries of this host and embedding model."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query, answer, created, embedding FROM answers "
+                "WHERE host = ? AND model = ? AND created >= ?",
+                (self.config.host, self.model_name, now - self.config.max_age),
+            ).fetchall()
+        return [(query, answer, created, array("d", blob).tolist()) for query, answer, created, blob in rows]
+
+    async def lookup(self, query: str) -> Optional[CachedAnswer]:
+        """Find the answer of the most similar fresh query above the threshold.
+
+        Errors (e.g. the embedding provider being down) are logged and
+        treated as a miss, so the cache never fails a query.
+        """
+        self.lookups += 1
+        now = time.time()
+        try:
+            embedding = await self._embed(query)
+            candidates = await asyncio.to_thread(self._candidates, now)
+        except Exception as e:
+            get_logger().warning(f"Answer cache lookup failed: {e}")
+            record_cache_lookups("answer", misses=1)
+            return None
+
+        best: Optional[CachedAnswer] = None
+        for cached_query, answer, created, vector in candidates:
+            if len(vector) != len(embedding):
+                continue
+            similarity = _dot(embedding, vector)
+            if similarity >= self.config.threshold and (best is None or similarity > best.similarity):
+                best = CachedAnswer(cached_query, answer, similarity, now - created)
+
+        if best is None:
+            record_cache_lookups("answer", misses=1)
+            return None
+        self.hits += 1
+        self._similarities.append(best.similarity)
+        record_cache_lookups("answer", hits=1)
+        return best
+
+    async def store(self, query: str, answer: str) -> None:
+        """Remember the answer to a query, dropping expired and excess entries."""
+        try:
+            embedding = await self._embed(query)
+        except Exception as e:
+            get_logger().warning(f"Answer cache store failed: {e}")
+            return
+
+        try:
+            await asyncio.to_thread(self._insert, query, embedding, answer, time.time())
+        except Exception as e:
+            get_logger().warning(f"Answer cache store failed: {e}")
+
+    def _insert(self, query: str, embedding: List[float], answer: str, now: float) -> None:
+        """Insert an entry, dropping expired and excess ones."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO answers (host, model, created, query, embedding, answer) VALUES (?, ?, ?, ?, ?, ?)",
+                (self.config.host, self.model_name, now, query, array("d", embedding).tobytes(), answer),
+            )
+            self._conn.execute("DELETE FROM answers WHERE created < ?", (now - self.config.max_age,))
+            self._conn.execute(
+                "DELETE FROM answers WHERE id IN (SELECT id FROM answers ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.config.max_entries,),
+            )
+            self._conn.commit()
+
+    def should_verify(self) -> bool:
+        """Whether a hit should still be answered by the agent to measure precision."""
+        return self.config.verify_rate > 0 and random.random() < self.config.verify_rate
+
+    async def verify(self, cached: CachedAnswer, fresh_answer: str) -> bool:
+        """Compare a cached answer with the agent's fresh one.
+
+        Returns:
+            bool: True if the answers are similar enough to count the hit as correct.
+        """
+        try:
+            cached_embedding, fresh_embedding = await self._embed(cached.answer), await self._embed(fresh_answer)
+        except Exception as e:
+            get_logger().warning(f"Answer cache verification failed: {e}")
+            return False
+        confirmed = _dot(cached_embedding, fresh_embedding) >= self.config.threshold
+        if confirmed:
+            self.confirmed += 1
+        else:
+            self.rejected += 1
+        return confirmed
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters, hit rate and measured precision.
+
+        mean_similarity covers the last SIMILARITY_WINDOW hits.
+        """
+        verified = self.confirmed + self.rejected
+        return {
+            "host": self.config.host,
+            "threshold": self.config.threshold,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "mean_similarity": sum(self._similarities) / len(self._similarities) if self._similarities else None,
+            "verified": verified,
+            "precision": self.confirmed / verified if verified else None,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    """Get the process-wide answer cache, creating it on first use.
+
+    Returns:
+        Optional[SemanticAnswerCache]: The cache, or None unless ANSWER_CACHE_PATH is set.
+    """
+    global _cache
+
+    if _cache is None:
+        config = AnswerCacheConfig.from_env()
+        if not config.enabled:
+            return None
+        from tools.rag_integration import get_embedding_model
+
+        try:
+            _cache = SemanticAnswerCache(get_embedding_model(), config)
+        except Exception as e:
+            get_logger().warning(f"Answer cache disabled: {e}")
+            return None
+    return _cache
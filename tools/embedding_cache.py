@@ -0,0 +1,176 @@
+"""Caching wrapper for embedding models.
+
+Every knowledge-base search embeds the agent's query with the remote
+embedding provider, which often dominates the latency of a RAG lookup.
+CachedEmbeddingModel keeps recent embeddings in an in-memory LRU and,
+optionally, in a SQLite file shared across runs, so repeated queries skip
+the network call. Entries are keyed by (provider, model,
+truncate_input_tokens, hash of the whitespace-normalized text). SQLite
+reads and writes run in a worker thread to keep the event loop free.
+"""
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from beeai_framework.backend.embedding import EmbeddingModel
+from beeai_framework.backend.types import EmbeddingModelInput, EmbeddingModelOutput, EmbeddingModelUsage
+from beeai_framework.context import RunContext
+
+from config.metrics import record_cache_lookups
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace and strip the ends of a text."""
+    return " ".join(text.split())
+
+
+class DiskEmbeddingStore:
+    """SQLite-backed store of embedding vectors."""
+
+    def __init__(self, path: str) -> None:
+        """Open (or create) the store.
+
+        Args:
+            path: Path of the SQLite database file.
+        """
+        Path(path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(Path(path).expanduser()), check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Get the stored vectors of the given keys (missing keys are omitted)."""
+        vectors: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+                if row:
+                    vectors[key] = array("d", row[0]).tolist()
+        return vectors
+
+    def set_many(self, vectors: Dict[str, List[float]]) -> None:
+        """Store vectors by key."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array("d", vector).tobytes()) for key, vector in vectors.items()],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddingModel(EmbeddingModel):
+    """EmbeddingModel that serves repeated texts from a cache."""
+
+    def __init__(
+        self,
+        model: EmbeddingModel,
+        truncate_input_tokens: Optional[int] = None,
+        max_size: int = 1024,
+        disk_store: Optional[DiskEmbeddingStore] = None,
+    ) -> None:
+        """Wrap an embedding model.
+
+        Args:
+            model: The embedding model doing the actual work.
+            truncate_input_tokens: Truncation setting of the model (part of the key).
+            max_size: Maximum number of embeddings kept in memory.
+            disk_store: Optional on-disk store consulted on memory misses.
+        """
+        super().__init__()
+        self._model = model
+        self._truncate_input_tokens = truncate_input_tokens
+        self._max_size = max_size
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._disk_store = disk_store
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def model_id(self) -> str:
+        return self._model.model_id
+
+    @property
+    def provider_id(self) -> Any:
+        return self._model.provider_id
+
+    def cache_key(self, text: str) -> str:
+        """Build the cache key of a text for this model."""
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{self.provider_id}:{self.model_id}:{self._truncate_input_tokens}:{digest}"
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        """Store a vector in memory (LRU-bounded)."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_size:
+            self._memory.popitem(last=False)
+
+    async def _create(self, input: EmbeddingModelInput, run: RunContext) -> EmbeddingModelOutput:
+        keys = [self.cache_key(text) for text in input.values]
+        vectors: Dict[str, List[float]] = {}
+        for key in keys:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                vectors[key] = self._memory[key]
+
+        # Consult the disk store for memory misses, promoting its hits to memory
+        if self._disk_store is not None and len(vectors) < len(keys):
+            unresolved = [key for key in dict.fromkeys(keys) if key not in vectors]
+            for key, vector in (await asyncio.to_thread(self._disk_store.get_many, unresolved)).items():
+                vectors[key] = vector
+                self._remember(key, vector)
+
+        # Texts repeated within the batch are embedded (and counted as a miss) once
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, input.values):
+            if key not in vectors:
+                missing.setdefault(key, text)
+
+        hits = sum(key in vectors for key in keys)
+        self.hits += hits
+        self.misses += len(missing)
+        record_cache_lookups("embedding", hits=hits, misses=len(missing))
+
+        usage = EmbeddingModelUsage()
+        if missing:
+            output = await self._model.create(list(missing.values()), signal=input.signal)
+            usage = output.usage
+            embedded = dict(zip(missing, output.embeddings))
+            for key, vector in embedded.items():
+                vectors[key] = vector
+                self._remember(key, vector)
+            if self._disk_store is not None:
+                await asyncio.to_thread(self._disk_store.set_many, embedded)
+
+        return EmbeddingModelOutput(values=input.values, embeddings=[vectors[key] for key in keys], usage=usage)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters for diagnostics."""
+        return {
+            "size": len(self._memory),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk": self._disk_store is not None,
+        }
+
+    async def clone(self) -> "CachedEmbeddingModel":
+        cloned = CachedEmbeddingModel(
+            await self._model.clone(),
+            truncate_input_tokens=self._truncate_input_tokens,
+            max_size=self._max_size,
+            disk_store=self._disk_store,
+        )
+        cloned._memory = self._memory
+        return cloned
@@ -0,0 +1,226 @@
+"""On-disk cache of chat model responses.
+
+Scheduled health checks ask the same question with the same tool output
+over and over, and at a low temperature the answer does not change.
+DiskChatModelCache plugs into the ``cache`` of a beeai ChatModel: the
+framework looks every request up by a canonical JSON rendering of its
+messages, tools and parameters before calling the provider, and stores the
+response (all streamed chunks) afterwards. Entries live in a SQLite file
+shared across runs, keyed by a hash of provider, model and that request,
+and expire after a TTL; the least recently used entries are evicted once
+the cache holds more than max_entries responses. SQLite work runs in a
+worker thread to keep the event loop free; the access times of hits are
+kept in memory and written together with the next stored response, so a
+hit does not cost a write and a commit.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from beeai_framework.backend import AssistantMessage, ChatModelOutput
+from beeai_framework.backend.types import ChatModelUsage
+from beeai_framework.cache import BaseCache
+
+from config.metrics import record_cache_lookups
+
+
+def _dump_output(output: ChatModelOutput) -> Dict[str, Any]:
+    """Convert one response chunk to plain JSON data."""
+    messages = []
+    for message in output.output:
+        if not isinstance(message, AssistantMessage):
+            raise TypeError(f"Unexpected {type(message).__name__} in chat model output")
+        meta = {key: value for key, value in message.meta.items() if key != "createdAt"}
+        messages.append({"content": message.to_plain()["content"], "meta": meta, "id": message.id})
+    return {
+        "output": messages,
+        "usage": output.usage.model_dump() if output.usage else None,
+        "finish_reason": output.finish_reason,
+    }
+
+
+def _load_output(data: Dict[str, Any]) -> ChatModelOutput:
+    """Rebuild a response chunk stored by _dump_output."""
+    return ChatModelOutput(
+        output=[AssistantMessage(message["content"], message["meta"], id=message["id"]) for message in data["output"]],
+        usage=ChatModelUsage(**data["usage"]) if data["usage"] else None,
+        finish_reason=data["finish_reason"],
+    )
+
+
+class DiskChatModelCache(BaseCache[List[ChatModelOutput]]):
+    """SQLite-backed ChatModel cache with a TTL and a size cap."""
+
+    def __init__(
+        self,
+        path: str,
+        model_name: str,
+        ttl: int = 86400,
+        max_entries: int = 1000,
+        bypass: bool = False,
+    ) -> None:
+        """Open (or create) the cache.
+
+        Args:
+            path: Path of the SQLite database file.
+            model_name: ``provider:model`` of the chat model (part of the key).
+            ttl: Seconds a response stays valid (0 keeps it until evicted).
+            max_entries: Maximum number of responses kept.
+            bypass: Never serve cached responses, but keep storing fresh ones.
+        """
+        super().__init__()
+        self.model_name = model_name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        # Access times of hits not yet written to the database
+        self._touched: Dict[str, float] = {}
+        Path(path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(Path(path).expanduser()), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, created REAL NOT NULL, last_used REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self._conn.commit()
+
+    def cache_key(self, key: str) -> str:
+        """Build the stored key from the framework's request key."""
+        return hashlib.sha256(f"{self.model_name}\n{key}".encode("utf-8")).hexdigest()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl > 0 and now - created > self.ttl
+
+    def _size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _read(self, stored_key: str, now: float) -> Optional[str]:
+        """Read a stored response, deleting it if it expired."""
+        with self._lock:
+            row = self._conn.execute("SELECT created, value FROM responses WHERE key = ?", (stored_key,)).fetchone()
+            if row and self._expired(row[0], now):
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (stored_key,))
+                self._conn.commit()
+                return None
+        return row[1] if row else None
+
+    def _write(self, stored_key: str, data: str, now: float, touched: Dict[str, float]) -> None:
+        """Store a response, record the access times of earlier hits and evict beyond max_entries."""
+        # Replaying a hit stores it again; keep its original creation time for the
+        # TTL unless the response was fetched fresh in bypass mode
+        update = "created = excluded.created, " if self.bypass else ""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE responses SET last_used = MAX(last_used, ?) WHERE key = ?",
+                [(last_used, key) for key, last_used in touched.items()],
+            )
+            self._conn.execute(
+                "INSERT INTO responses (key, created, last_used, value) VALUES (?, ?, ?, ?) "
+                f"ON CONFLICT(key) DO UPDATE SET {update}last_used = excluded.last_used, value = excluded.value",
+                (stored_key, now, now, data),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def _has(self, stored_key: str, now: float) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT created FROM responses WHERE key = ?", (stored_key,)).fetchone()
+        return row is not None and not self._expired(row[0], now)
+
+    def _delete(self, stored_key: Optional[str]) -> int:
+        """Delete one response, or all of them if stored_key is None."""
+        with self._lock:
+            if stored_key is None:
+                cursor = self._conn.execute("DELETE FROM responses")
+            else:
+                cursor = self._conn.execute("DELETE FROM responses WHERE key = ?", (stored_key,))
+            self._conn.commit()
+        return cursor.rowcount
+
+    async def size(self) -> int:
+        return await asyncio.to_thread(self._size)
+
+    async def get(self, key: str) -> Optional[List[ChatModelOutput]]:
+        if self.bypass:
+            return None
+
+        stored_key = self.cache_key(key)
+        now = time.time()
+        value = await asyncio.to_thread(self._read, stored_key, now)
+
+        chunks = None
+        if value is not None:
+            try:
+                chunks = [_load_output(chunk) for chunk in json.loads(value)]
+            except (ValueError, KeyError, TypeError):
+                chunks = None
+        if chunks:
+            self._touched[stored_key] = now
+            self.hits += 1
+            record_cache_lookups("llm", hits=1)
+            return chunks
+        self.misses += 1
+        record_cache_lookups("llm", misses=1)
+        return None
+
+    async def set(self, key: str, value: List[ChatModelOutput]) -> None:
+        if not value:
+            return
+        try:
+            data = json.dumps([_dump_output(chunk) for chunk in value], default=str)
+        except TypeError:
+            return
+
+        touched, self._touched = self._touched, {}
+        await asyncio.to_thread(self._write, self.cache_key(key), data, time.time(), touched)
+
+    async def has(self, key: str) -> bool:
+        return await asyncio.to_thread(self._has, self.cache_key(key), time.time())
+
+    async def delete(self, key: str) -> bool:
+        stored_key = self.cache_key(key)
+        self._touched.pop(stored_key, None)
+        return await asyncio.to_thread(self._delete, stored_key) > 0
+
+    async def clear(self) -> None:
+        self._touched.clear()
+        await asyncio.to_thread(self._delete, None)
+
+    async def clone(self) -> "DiskChatModelCache":
+        # Forked agents share the same file and counters
+        return self
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters for diagnostics."""
+        return {
+            "model": self.model_name,
+            "ttl": self.ttl,
+            "max_entries": self.max_entries,
+            "bypass": self.bypass,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        """Record pending access times and close the database connection."""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE responses SET last_used = MAX(last_used, ?) WHERE key = ?",
+                [(last_used, key) for key, last_used in self._touched.items()],
+            )
+            self._conn.commit()
+            self._touched.clear()
+            self._conn.close()
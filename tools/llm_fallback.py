@@ -0,0 +1,262 @@
+"""Chat model failing over (and optionally hedging) across providers.
+
+FallbackChatModel wraps an ordered list of chat models, e.g. watsonx then a
+local Ollama model. Each turn is sent to the first model; if it fails, or
+produces no chunk within the per-attempt timeout, the next model is tried.
+With hedging enabled, a second request is sent to the next model when the
+first has not answered after its p95 first-chunk latency (learnt from
+recent turns, or a configured delay until enough turns were seen), and
+whichever answers first serves the turn while the other is cancelled.
+
+When streaming, "answers" means the first streamed chunk: once a model has
+started streaming, the turn is committed to it. The per-attempt timeout
+then also bounds the wait for each following chunk.
+"""
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Deque, Dict, List, Optional, Sequence
+
+from beeai_framework.backend import ChatModel, ChatModelOutput, ChatModelParameters
+from beeai_framework.backend.errors import ChatModelError
+from beeai_framework.backend.types import ChatModelInput
+from beeai_framework.context import RunContext
+
+from config.logging_config import get_logger
+from config.metrics import LLM_ATTEMPT_FAILURES, LLM_TURNS
+
+# First-chunk latencies remembered per model, and how many are needed before
+# their p95 replaces the configured hedge delay
+LATENCY_WINDOW = 100
+MIN_LATENCY_SAMPLES = 20
+
+
+def model_name(model: ChatModel) -> str:
+    """Name a chat model as ``provider:model``."""
+    return f"{model.provider_id}:{model.model_id}"
+
+
+async def forward_request(model: ChatModel, input: ChatModelInput) -> AsyncGenerator[ChatModelOutput, None]:
+    """Send a prepared request to another chat model, yielding its chunks.
+
+    The model runs the request as its own (nested) run, so its adapter, cache
+    and events apply. When not streaming, its complete output is yielded once.
+    """
+    options = {
+        name: getattr(input, name)
+        for name in ChatModelInput.model_fields
+        if name != "messages" and getattr(input, name) is not None
+    }
+    # Retrying is the job of the outer run; a retry here would replay chunks already passed on
+    options["max_retries"] = 0
+    if not input.stream:
+        yield await model.run(input.messages, **options)
+        return
+
+    chunks: asyncio.Queue = asyncio.Queue()
+    run = asyncio.ensure_future(
+        model.run(input.messages, **options).observe(
+            lambda emitter: emitter.on("new_token", lambda data, _: chunks.put_nowait(data.value))
+        )
+    )
+    run.add_done_callback(lambda _: chunks.put_nowait(None))
+    try:
+        while (chunk := await chunks.get()) is not None:
+            yield chunk
+        run.result()
+    finally:
+        run.cancel()
+
+
+@dataclass
+class _Attempt:
+    """A request to one model of the chain."""
+
+    model: ChatModel
+    name: str
+    route: str
+    stream: AsyncGenerator[ChatModelOutput, None]
+    started: float
+
+
+class FallbackChatModel(ChatModel):
+    """ChatModel trying an ordered list of models with timeouts and hedging."""
+
+    def __init__(
+        self,
+        models: Sequence[ChatModel],
+        attempt_timeout: float = 60.0,
+        hedge: bool = False,
+        hedge_delay: float = 5.0,
+    ) -> None:
+        """Wrap chat models.
+
+        Args:
+            models: Models in order of preference (at least one).
+            attempt_timeout: Seconds to wait for the first (and each next) chunk of an attempt.
+            hedge: Send a second request to the next model when the first is slow.
+            hedge_delay: Hedge delay used until enough latencies were observed for a p95.
+        """
+        if not models:
+            raise ValueError("FallbackChatModel needs at least one chat model")
+        primary = models[0]
+        # Requests are passed on unchanged; each model adapts tools and tool_choice itself
+        super().__init__(
+            parameters=ChatModelParameters(stream=primary.parameters.stream),
+            tool_call_fallback_via_response_format=False,
+            allow_parallel_tool_calls=primary.allow_parallel_tool_calls,
+        )
+        self.models = list(models)
+        self.attempt_timeout = attempt_timeout
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self._latencies: Dict[str, Deque[float]] = {model_name(model): deque(maxlen=LATENCY_WINDOW) for model in models}
+        self.served: Dict[str, int] = {}
+        self.routes: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+        self.hedges = 0
+
+    @property
+    def model_id(self) -> str:
+        return self.models[0].model_id
+
+    @property
+    def provider_id(self) -> Any:
+        # Own emitter namespace, so traces and metrics tell the chain from the models it calls
+        return "fallback"
+
+    def hedge_delay_for(self, name: str) -> float:
+        """Seconds to wait for a model before hedging: its p95 first-chunk latency."""
+        latencies = self._latencies.get(name)
+        if latencies is None or len(latencies) < MIN_LATENCY_SAMPLES:
+            return self.hedge_delay
+        ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, round(0.95 * len(ordered)) - 1)]
+
+    def _start(self, model: ChatModel, input: ChatModelInput, route: str) -> _Attempt:
+        return _Attempt(model, model_name(model), route, forward_request(model, input), time.perf_counter())
+
+    def _failed(self, attempt: _Attempt, reason: str, detail: str) -> str:
+        """Count a failed attempt (reason: error, empty, timeout or stalled) and describe it."""
+        self.failures[attempt.name] = self.failures.get(attempt.name, 0) + 1
+        LLM_ATTEMPT_FAILURES.inc(model=attempt.name, reason=reason)
+        get_logger().warning(f"Chat model {attempt.name} {detail}")
+        return f"{attempt.name}: {detail}"
+
+    def _served(self, attempt: _Attempt) -> None:
+        self._latencies[attempt.name].append(time.perf_counter() - attempt.started)
+        self.served[attempt.name] = self.served.get(attempt.name, 0) + 1
+        self.routes[attempt.route] = self.routes.get(attempt.route, 0) + 1
+        LLM_TURNS.inc(model=attempt.name, route=attempt.route)
+
+    @staticmethod
+    async def _cancel(task: "asyncio.Future[Any]", attempt: _Attempt) -> None:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await attempt.stream.aclose()
+
+    async def _serve(self, input: ChatModelInput) -> AsyncGenerator[ChatModelOutput, None]:
+        """Race the chain for the first chunk, then stream the winner."""
+        remaining = list(self.models)
+        pending: Dict["asyncio.Future[Any]", _Attempt] = {}
+        errors: List[str] = []
+        hedged = False
+
+        def launch(route: str) -> None:
+            attempt = self._start(remaining.pop(0), input, route)
+            pending[asyncio.ensure_future(anext(attempt.stream))] = attempt
+
+        launch("primary")
+        winner: Optional[_Attempt] = None
+        first: Optional[ChatModelOutput] = None
+        try:
+            while winner is None:
+                newest = max(pending.values(), key=lambda attempt: attempt.started)
+                deadlines = [attempt.started + self.attempt_timeout for attempt in pending.values()]
+                if self.hedge and remaining and not hedged:
+                    deadlines.append(newest.started + self.hedge_delay_for(newest.name))
+                timeout = max(0.0, min(deadlines) - time.perf_counter())
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    attempt = pending.pop(task)
+                    try:
+                        chunk = task.result()
+                    except StopAsyncIteration:
+                        errors.append(self._failed(attempt, "empty", "returned an empty response"))
+                        continue
+                    except Exception as e:
+                        errors.append(self._failed(attempt, "error", f"failed: {e}"))
+                        await attempt.stream.aclose()
+                        continue
+                    if winner is None:
+                        winner, first = attempt, chunk
+                    else:
+                        await attempt.stream.aclose()
+                if winner is not None:
+                    break
+
+                now = time.perf_counter()
+                for task, attempt in list(pending.items()):
+                    if now - attempt.started >= self.attempt_timeout:
+                        del pending[task]
+                        await self._cancel(task, attempt)
+                        errors.append(self._failed(attempt, "timeout", f"timed out after {self.attempt_timeout:g}s"))
+
+                if not pending:
+                    if not remaining:
+                        raise ChatModelError(f"All chat models failed ({'; '.join(errors)})")
+                    launch("fallback")
+                    continue
+                newest = max(pending.values(), key=lambda attempt: attempt.started)
+                if self.hedge and remaining and not hedged and now - newest.started >= self.hedge_delay_for(newest.name):
+                    hedged = True
+                    self.hedges += 1
+                    launch("hedge")
+        finally:
+            for task, attempt in pending.items():
+                await self._cancel(task, attempt)
+
+        self._served(winner)
+        try:
+            yield first
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(winner.stream), self.attempt_timeout)
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    raise ChatModelError(
+                        self._failed(winner, "stalled", f"sent nothing for {self.attempt_timeout:g}s while streaming")
+                    )
+                yield chunk
+        finally:
+            await winner.stream.aclose()
+
+    async def _create(self, input: ChatModelInput, run: RunContext) -> ChatModelOutput:
+        chunks = [chunk async for chunk in self._serve(input)]
+        return chunks[0] if len(chunks) == 1 else ChatModelOutput.from_chunks(chunks)
+
+    async def _create_stream(self, input: ChatModelInput, run: RunContext) -> AsyncGenerator[ChatModelOutput, None]:
+        async for chunk in self._serve(input):
+            yield chunk
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of which models served turns, failures and hedging."""
+        return {
+            "models": [model_name(model) for model in self.models],
+            "served": dict(self.served),
+            "routes": dict(self.routes),
+            "failures": dict(self.failures),
+            "hedges": self.hedges,
+            "hedge_delays": {name: self.hedge_delay_for(name) for name in self._latencies},
+        }
+
+    async def clone(self) -> "FallbackChatModel":
+        return FallbackChatModel(
+            [await model.clone() for model in self.models],
+            attempt_timeout=self.attempt_timeout,
+            hedge=self.hedge,
+            hedge_delay=self.hedge_delay,
+        )
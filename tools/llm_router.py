@@ -0,0 +1,193 @@
+"""Route agent steps between a small and a large chat model.
+
+Most steps of a troubleshooting run are triage: classifying the intent,
+thinking (ThinkTool) and choosing the next diagnostic tool. A small, fast
+model (e.g. a local Ollama model) handles those well. Only the final
+synthesis of a troubleshooting answer benefits from the large configured
+model.
+
+RoutedChatModel picks the route of each step up front from the user's
+request, following the triage of the agent instructions: a direct question
+("what is", "show me", "list") is answered end to end by the small model,
+whose output is streamed as it arrives. For a troubleshooting request the
+small model chooses the diagnostic tools; as soon as it starts a
+final_answer call (or answers in plain text) its draft is stopped and the
+step is asked again of the large model, whose answer is streamed to the
+user. A troubleshooting step that forces the final answer goes straight to
+the large model, and so does any step the small model fails before
+producing output.
+"""
+import re
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Dict, List, Sequence
+
+from beeai_framework.backend import ChatModel, ChatModelOutput, ChatModelParameters, UserMessage
+from beeai_framework.backend.types import ChatModelInput
+from beeai_framework.context import RunContext
+from beeai_framework.tools import Tool
+
+from config.logging_config import get_logger
+from config.metrics import LLM_TURNS
+from tools.llm_fallback import forward_request, model_name
+
+# Tool calls that end the run and are therefore answered by the large model
+SYNTHESIS_TOOLS = ("final_answer",)
+
+# Symptoms marking a troubleshooting request and phrases marking a direct
+# question, as in the triage section of prompts/linux_diagnostics_agent.md
+TROUBLESHOOTING_PATTERN = re.compile(
+    r"\b(why|slow|errors?|not working|fails|failing|failed to|failure|can'?t|cannot|unable|down|crash\w*|"
+    r"broken|problems?|issues?|stuck|hang\w*|won'?t|doesn'?t)\b",
+    re.IGNORECASE,
+)
+DIRECT_QUESTION_PATTERN = re.compile(
+    r"\b(what is|what's|what are|show me|list|how much|how many|tell me|which)\b",
+    re.IGNORECASE,
+)
+
+
+def classify_intent(text: str) -> str:
+    """Classify a request as a "direct" question or "troubleshooting".
+
+    Anything mentioning a symptom, or matching neither kind, is treated as
+    troubleshooting so that the large model writes its answer.
+    """
+    if TROUBLESHOOTING_PATTERN.search(text) or not DIRECT_QUESTION_PATTERN.search(text):
+        return "troubleshooting"
+    return "direct"
+
+
+class RoutedChatModel(ChatModel):
+    """ChatModel answering triage steps with a small model and synthesis with a large one."""
+
+    def __init__(
+        self,
+        small: ChatModel,
+        large: ChatModel,
+        synthesis_tools: Sequence[str] = SYNTHESIS_TOOLS,
+    ) -> None:
+        """Combine two chat models.
+
+        Args:
+            small: Cheap, fast model for intent classification, thinking and tool selection.
+            large: Model writing the final answer.
+            synthesis_tools: Tool names whose calls are escalated to the large model.
+        """
+        # Requests are passed on unchanged; each model adapts tools and tool_choice itself
+        super().__init__(
+            parameters=ChatModelParameters(stream=large.parameters.stream),
+            tool_call_fallback_via_response_format=False,
+            allow_parallel_tool_calls=large.allow_parallel_tool_calls,
+        )
+        self.small = small
+        self.large = large
+        self.synthesis_tools = tuple(synthesis_tools)
+        self.routes: Dict[str, int] = {}
+
+    @property
+    def model_id(self) -> str:
+        return self.large.model_id
+
+    @property
+    def provider_id(self) -> Any:
+        # Own emitter namespace, so traces and metrics tell the router from the models it calls
+        return "router"
+
+    def _intent(self, input: ChatModelInput) -> str:
+        """Intent of the user's request the step belongs to."""
+        for message in reversed(input.messages):
+            if isinstance(message, UserMessage):
+                return classify_intent(message.text)
+        return "troubleshooting"
+
+    def _forces_synthesis(self, input: ChatModelInput) -> bool:
+        choice = input.tool_choice
+        return isinstance(choice, Tool) and choice.name in self.synthesis_tools
+
+    def _starts_synthesis(self, chunk: ChatModelOutput) -> bool:
+        return any(call.tool_name in self.synthesis_tools for call in chunk.get_tool_calls())
+
+    def _routed(self, model: ChatModel, route: str) -> None:
+        self.routes[route] = self.routes.get(route, 0) + 1
+        LLM_TURNS.inc(model=model_name(model), route=route)
+
+    async def _direct(self, input: ChatModelInput) -> AsyncGenerator[ChatModelOutput, None]:
+        """Stream the small model's answer, escalating if it fails before its first chunk."""
+        started = False
+        try:
+            async for chunk in forward_request(self.small, input):
+                if not started:
+                    started = True
+                    self._routed(self.small, "direct")
+                yield chunk
+        except Exception as e:
+            if started:
+                raise
+            get_logger().warning(f"Triage model {model_name(self.small)} failed, escalating: {e}")
+        if started:
+            return
+
+        self._routed(self.large, "escalated")
+        async for chunk in forward_request(self.large, input):
+            yield chunk
+
+    async def _triage(self, input: ChatModelInput) -> List[ChatModelOutput]:
+        """Let the small model pick the next tools.
+
+        Returns:
+            List[ChatModelOutput]: Its chunks, or an empty list if the step has
+            to be escalated (it failed, started a final answer or called no tool).
+        """
+        chunks: List[ChatModelOutput] = []
+        try:
+            async with aclosing(forward_request(self.small, input)) as stream:
+                async for chunk in stream:
+                    if self._starts_synthesis(chunk):
+                        return []
+                    chunks.append(chunk)
+        except Exception as e:
+            get_logger().warning(f"Triage model {model_name(self.small)} failed, escalating: {e}")
+            return []
+        if not any(chunk.get_tool_calls() for chunk in chunks):
+            return []
+        return chunks
+
+    async def _serve(self, input: ChatModelInput) -> AsyncGenerator[ChatModelOutput, None]:
+        """Answer a step on the route its request and step type call for."""
+        if self._intent(input) == "direct":
+            async for chunk in self._direct(input):
+                yield chunk
+            return
+
+        route = "synthesis"
+        if not self._forces_synthesis(input):
+            chunks = await self._triage(input)
+            if chunks:
+                self._routed(self.small, "triage")
+                for chunk in chunks:
+                    yield chunk
+                return
+            route = "escalated"
+
+        self._routed(self.large, route)
+        async for chunk in forward_request(self.large, input):
+            yield chunk
+
+    async def _create(self, input: ChatModelInput, run: RunContext) -> ChatModelOutput:
+        chunks = [chunk async for chunk in self._serve(input)]
+        return chunks[0] if len(chunks) == 1 else ChatModelOutput.from_chunks(chunks)
+
+    async def _create_stream(self, input: ChatModelInput, run: RunContext) -> AsyncGenerator[ChatModelOutput, None]:
+        async for chunk in self._serve(input):
+            yield chunk
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of how many steps each route served."""
+        return {
+            "small": model_name(self.small),
+            "large": model_name(self.large),
+            "routes": dict(self.routes),
+        }
+
+    async def clone(self) -> "RoutedChatModel":
+        return RoutedChatModel(await self.small.clone(), await self.large.clone(), self.synthesis_tools)
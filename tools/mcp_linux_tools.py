@@ -9,24 +9,47 @@ from pathlib import Path
 from typing import List
 
 from beeai_framework.tools.mcp import MCPTool
-from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.client.stdio import StdioServerParameters
+
+from config.mcp_config import MCPCacheConfig, MCPPoolConfig
+from tools.mcp_session_pool import get_session_pool
+from tools.mcp_tool_cache import CachedMCPTool, get_tool_result_cache
 
 
 async def create_linux_tools(
     server_path: str | None = None,
-    allowed_log_paths: str | None = None
+    allowed_log_paths: str | None = None,
+    pool_config: MCPPoolConfig | None = None,
+    cache_config: MCPCacheConfig | None = None,
 ) -> List[MCPTool]:
     """Create MCP Linux diagnostic tools from the linux-mcp-server.
     
     This function initializes the Linux MCP server which provides read-only
     diagnostic tools for system administration and troubleshooting.
     
+    The server runs in a process-wide session pool: one or more warm server
+    processes are kept alive, health-checked and restarted on crash, and
+    tool calls are multiplexed over them. Independent tool calls issued in
+    the same agent step run concurrently, bounded by the pool's
+    max_concurrency. Repeated calls with the same server configuration
+    reuse the running pool.
+    
+    Since all tools are read-only, their results are cached per tool name and
+    normalized arguments in a shared LRU cache with per-tool TTLs (long for
+    hardware/OS info, short for processes, memory and logs).
+    
     Args:
         server_path: Path to the linux-mcp-server directory.
                     If None, defaults to ~/development/linux-mcp-server
         allowed_log_paths: Comma-separated list of allowed log file paths.
                           Example: "/var/log/messages,/var/log/secure"
                           If None, uses server's default configuration.
+        pool_config: Session pool settings. If None, loaded from environment
+                     (LINUX_MCP_POOL_SIZE, LINUX_MCP_MAX_CONCURRENCY,
+                     LINUX_MCP_HEALTH_CHECK_INTERVAL, LINUX_MCP_PING_TIMEOUT).
+        cache_config: Result cache settings. If None, loaded from environment
+                      (LINUX_MCP_CACHE_ENABLED, LINUX_MCP_CACHE_SIZE,
+                      LINUX_MCP_CACHE_DEFAULT_TTL, LINUX_MCP_CACHE_TTLS).
     
     Returns:
         List[MCPTool]: List of Linux diagnostic tools including:
@@ -102,12 +125,28 @@ async def create_linux_tools(
         env=env,  # Pass environment variables
     )
     
-    # Create the stdio client (async context manager)
-    client = stdio_client(server_params)
+    # Get (or start) the long-lived session pool for this server
+    if pool_config is None:
+        pool_config = MCPPoolConfig.from_env()
+    pool = await get_session_pool(
+        server_params,
+        size=pool_config.size,
+        max_concurrency=pool_config.max_concurrency,
+        health_check_interval=pool_config.health_check_interval,
+        ping_timeout=pool_config.ping_timeout,
+        name="linux-mcp-server",
+    )
     
-    # Create tools from the client
-    # This will connect to the server and list all available tools
-    tools = await MCPTool.from_client(client)
+    # Create tools bound to the pool
+    # This lists all available tools on one of the warm sessions
+    if cache_config is None:
+        cache_config = MCPCacheConfig.from_env()
+    if not cache_config.enabled:
+        return await pool.create_tools()
+    tools = await pool.create_tools(
+        tool_class=CachedMCPTool,
+        result_cache=get_tool_result_cache(cache_config),
+    )
     
     return tools
 
@@ -0,0 +1,372 @@
+"""Long-lived pool of MCP client sessions.
+
+The pool keeps one or more MCP server processes (e.g. linux-mcp-server over
+stdio) warm for the whole process lifetime and multiplexes tool calls over
+them, so a tool call only costs the JSON-RPC round trip instead of a
+subprocess spawn and session handshake. Sessions are health-checked with
+MCP pings and transparently restarted when their server crashes.
+"""
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Type
+
+import anyio
+from beeai_framework.tools.mcp import MCPClient, MCPTool
+from mcp import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.types import CallToolResult, ListToolsResult
+
+from config.logging_config import get_logger
+from config.metrics import MCP_RESTARTS, MCP_TRANSPORT_ERRORS
+
+# Errors raised by the client when the server process or its pipes are gone
+TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+)
+
+
+class _PoolSlot:
+    """A single MCP server session managed by the pool."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.session: Optional[ClientSession] = None
+        self.task: Optional[asyncio.Task] = None
+        self.ready = asyncio.Event()
+        self.stopping = asyncio.Event()
+        self.restart_lock = asyncio.Lock()
+        self.in_flight = 0
+        self.calls = 0
+        self.restarts = 0
+        self.error: Optional[BaseException] = None
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the slot has an initialized session with a live transport task."""
+        return self.session is not None and self.task is not None and not self.task.done()
+
+
+class MCPSessionPool:
+    """Pool of warm MCP client sessions with health checks and restarts."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], MCPClient],
+        size: int = 1,
+        max_concurrency: Optional[int] = None,
+        health_check_interval: float = 30.0,
+        ping_timeout: float = 5.0,
+        name: str = "mcp",
+    ) -> None:
+        """Initialize the pool (call start() before use).
+
+        Args:
+            client_factory: Callable returning a new MCP transport context
+                manager, e.g. ``lambda: stdio_client(server_params)``.
+            size: Number of server sessions to keep alive.
+            max_concurrency: Maximum number of tool calls in flight across
+                all sessions; further calls wait for a free slot. None
+                means unbounded.
+            health_check_interval: Seconds between background health checks.
+            ping_timeout: Seconds to wait for a ping reply before restarting.
+            name: Name used in log messages.
+        """
+        self._client_factory = client_factory
+        self._health_check_interval = health_check_interval
+        self._ping_timeout = ping_timeout
+        self._name = name
+        self._slots = [_PoolSlot(index) for index in range(max(1, size))]
+        self._max_concurrency = max_concurrency
+        self._limiter = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._health_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+        self._background: set = set()
+        self._logger = get_logger()
+
+    @property
+    def size(self) -> int:
+        """Number of sessions managed by the pool."""
+        return len(self._slots)
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """Event loop the pool was started on."""
+        return self._loop
+
+    async def start(self) -> "MCPSessionPool":
+        """Start all server sessions and the background health checker.
+
+        Returns:
+            MCPSessionPool: The started pool.
+
+        Raises:
+            RuntimeError: If none of the sessions could be initialized.
+        """
+        self._loop = asyncio.get_running_loop()
+        for slot in self._slots:
+            self._start_slot(slot)
+        await asyncio.gather(*(slot.ready.wait() for slot in self._slots))
+
+        if not any(slot.healthy for slot in self._slots):
+            errors = "; ".join(str(slot.error) for slot in self._slots if slot.error)
+            await self.close()
+            raise RuntimeError(f"Failed to start any {self._name} MCP session: {errors}")
+
+        self._health_task = asyncio.create_task(self._health_loop())
+        healthy = sum(slot.healthy for slot in self._slots)
+        self._logger.info(f"Started {self._name} MCP session pool ({healthy}/{self.size} sessions ready)")
+        return self
+
+    def _start_slot(self, slot: _PoolSlot) -> None:
+        """Spawn the task that owns the transport and session of a slot."""
+        slot.ready = asyncio.Event()
+        slot.stopping = asyncio.Event()
+        slot.error = None
+        slot.task = asyncio.create_task(self._run_slot(slot))
+
+    async def _run_slot(self, slot: _PoolSlot) -> None:
+        """Hold a session open until the slot is stopped or the transport fails.
+
+        The transport context is entered and exited inside this task, which
+        anyio requires for the cancel scopes used by the MCP transports.
+        """
+        try:
+            async with self._client_factory() as (read, write, *_), ClientSession(read, write) as session:
+                await session.initialize()
+                slot.session = session
+                slot.ready.set()
+                await slot.stopping.wait()
+        except Exception as e:
+            slot.error = e
+            self._logger.warning(f"{self._name} MCP session #{slot.index} terminated: {e}")
+        finally:
+            slot.session = None
+            slot.ready.set()
+
+    async def _stop_slot(self, slot: _PoolSlot) -> None:
+        """Stop a slot's session and wait for its transport to shut down."""
+        slot.stopping.set()
+        if slot.task is not None and not slot.task.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(slot.task), timeout=self._ping_timeout)
+            except Exception:
+                slot.task.cancel()
+
+    async def restart(self, slot: _PoolSlot) -> None:
+        """Restart the session of a slot (no-op if another caller already did)."""
+        task_before = slot.task
+        async with slot.restart_lock:
+            if self._closed or (slot.task is not task_before and slot.healthy):
+                return
+            self._logger.warning(f"Restarting {self._name} MCP session #{slot.index}")
+            await self._stop_slot(slot)
+            slot.restarts += 1
+            MCP_RESTARTS.inc(pool=self._name)
+            self._start_slot(slot)
+            await slot.ready.wait()
+
+    async def check_health(self) -> None:
+        """Ping every session and restart the ones that crashed or do not answer."""
+        for slot in self._slots:
+            if self._closed:
+                return
+            if not slot.healthy:
+                await self.restart(slot)
+                continue
+            try:
+                await asyncio.wait_for(slot.session.send_ping(), timeout=self._ping_timeout)
+            except Exception as e:
+                self._logger.warning(f"{self._name} MCP session #{slot.index} failed health check: {e}")
+                await self.restart(slot)
+
+    async def _health_loop(self) -> None:
+        """Periodically run health checks until the pool is closed."""
+        while not self._closed:
+            await asyncio.sleep(self._health_check_interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                self._logger.error(f"{self._name} MCP health check failed: {e}", exc_info=True)
+
+    def _spawn(self, coro: Any) -> None:
+        """Run a coroutine in the background, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _acquire_slot(self, exclude: Optional[_PoolSlot] = None) -> _PoolSlot:
+        """Pick the least busy healthy slot, reviving dead slots if none is healthy."""
+        if self._closed:
+            raise RuntimeError(f"{self._name} MCP session pool is closed")
+
+        candidates = [slot for slot in self._slots if slot.healthy and slot is not exclude]
+        if not candidates:
+            await asyncio.gather(*(self.restart(slot) for slot in self._slots if not slot.healthy))
+            candidates = [slot for slot in self._slots if slot.healthy]
+        if not candidates:
+            raise RuntimeError(f"No healthy {self._name} MCP sessions available")
+        return min(candidates, key=lambda slot: slot.in_flight)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[ClientSession]:
+        """Borrow the least busy session for the duration of the context."""
+        slot = await self._acquire_slot()
+        slot.in_flight += 1
+        try:
+            yield slot.session
+        finally:
+            slot.in_flight -= 1
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None, **kwargs: Any) -> CallToolResult:
+        """Call a tool on the least busy session.
+
+        Mirrors ClientSession.call_tool so the pool can be used as the session
+        of an MCPTool. Concurrent calls are spread across sessions and bounded
+        by max_concurrency. If the chosen server died mid-call, the session is
+        restarted and the call is retried once on another healthy session.
+        """
+        if self._limiter is None:
+            return await self._call_tool(name, arguments, **kwargs)
+        async with self._limiter:
+            return await self._call_tool(name, arguments, **kwargs)
+
+    async def _call_tool(self, name: str, arguments: Optional[Dict[str, Any]], **kwargs: Any) -> CallToolResult:
+        """Dispatch a tool call to a session, retrying once on transport failure."""
+        slot = await self._acquire_slot()
+        for attempt in range(2):
+            current = slot
+            current.in_flight += 1
+            current.calls += 1
+            try:
+                session = current.session
+                if session is None:
+                    # The server went away between picking the slot and sending the call
+                    raise ConnectionError(f"{self._name} MCP session #{current.index} is not running")
+                return await session.call_tool(name, arguments, **kwargs)
+            except TRANSPORT_ERRORS as e:
+                MCP_TRANSPORT_ERRORS.inc(pool=self._name)
+                if attempt == 1:
+                    raise
+                self._logger.warning(f"{self._name} MCP session #{current.index} lost during '{name}': {e}")
+                self._spawn(self.restart(current))
+            finally:
+                current.in_flight -= 1
+            slot = await self._acquire_slot(exclude=current)
+
+    async def list_tools(self) -> ListToolsResult:
+        """List the tools exposed by the server."""
+        async with self.session() as session:
+            return await session.list_tools()
+
+    async def create_tools(self, tool_class: Type[MCPTool] = MCPTool, **options: Any) -> List[MCPTool]:
+        """Create MCPTool instances whose calls are multiplexed over the pool.
+
+        Args:
+            tool_class: MCPTool subclass to instantiate.
+            **options: Options forwarded to the tool class (e.g. smart_parsing).
+
+        Returns:
+            List[MCPTool]: One tool per tool exposed by the server.
+        """
+        result = await self.list_tools()
+        return [tool_class(self, tool, **options) for tool in result.tools]
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool state for diagnostics."""
+        return {
+            "name": self._name,
+            "size": self.size,
+            "max_concurrency": self._max_concurrency,
+            "in_flight": sum(slot.in_flight for slot in self._slots),
+            "healthy": sum(slot.healthy for slot in self._slots),
+            "sessions": [
+                {
+                    "index": slot.index,
+                    "healthy": slot.healthy,
+                    "in_flight": slot.in_flight,
+                    "calls": slot.calls,
+                    "restarts": slot.restarts,
+                }
+                for slot in self._slots
+            ],
+        }
+
+    async def close(self) -> None:
+        """Stop the health checker and all sessions."""
+        self._closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        await asyncio.gather(*(self._stop_slot(slot) for slot in self._slots), return_exceptions=True)
+
+
+# Process-wide pools keyed by server command line
+_pools: Dict[str, MCPSessionPool] = {}
+
+# Per event loop lock so concurrent first callers share one pool
+_pool_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def _pool_key(server_params: StdioServerParameters) -> str:
+    """Build a registry key identifying a server configuration."""
+    env = sorted((server_params.env or {}).items())
+    return repr((server_params.command, tuple(server_params.args), str(server_params.cwd), env))
+
+
+async def get_session_pool(
+    server_params: StdioServerParameters,
+    size: int = 1,
+    max_concurrency: Optional[int] = None,
+    health_check_interval: float = 30.0,
+    ping_timeout: float = 5.0,
+    name: str = "mcp",
+) -> MCPSessionPool:
+    """Get (or start) the process-wide session pool for a stdio MCP server.
+
+    Pools are reused across calls with the same server parameters, so the
+    server processes stay warm for the lifetime of the process.
+
+    Args:
+        server_params: Parameters used to spawn the stdio server.
+        size: Number of server processes to keep alive.
+        max_concurrency: Maximum number of concurrent tool calls.
+        health_check_interval: Seconds between background health checks.
+        ping_timeout: Seconds to wait for a ping reply.
+        name: Name used in log messages.
+
+    Returns:
+        MCPSessionPool: A started pool.
+    """
+    key = _pool_key(server_params)
+    loop = asyncio.get_running_loop()
+    lock = _pool_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        pool = _pools.get(key)
+        if pool is not None and pool.loop is loop:
+            return pool
+
+        pool = MCPSessionPool(
+            client_factory=lambda: stdio_client(server_params),
+            size=size,
+            max_concurrency=max_concurrency,
+            health_check_interval=health_check_interval,
+            ping_timeout=ping_timeout,
+            name=name,
+        )
+        await pool.start()
+        _pools[key] = pool
+        return pool
+
+
+async def close_session_pools() -> None:
+    """Close every pool started in the running event loop."""
+    loop = asyncio.get_running_loop()
+    for key, pool in list(_pools.items()):
+        if pool.loop is loop:
+            await pool.close()
+        _pools.pop(key, None)
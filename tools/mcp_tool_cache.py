@@ -0,0 +1,206 @@
+"""TTL result cache for read-only MCP tools.
+
+Every tool exposed by linux-mcp-server only reads host state, so repeating a
+call with the same arguments within a short window can be answered from
+memory instead of re-running it on the host. Entries live in one
+size-bounded LRU store shared by all tools and expire after a per-tool TTL
+(long for hardware/OS facts, short for processes, memory and logs).
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from beeai_framework.cache.base import BaseCache
+from beeai_framework.tools.mcp import MCPTool
+from pydantic import BaseModel
+
+from config.mcp_config import MCPCacheConfig
+from config.metrics import record_cache_lookups
+
+
+def normalize_arguments(arguments: Any) -> str:
+    """Build a canonical string for tool arguments.
+
+    Keys are sorted recursively and top-level None values are dropped, so
+    {"b": 1, "a": None} and {"b": 1} produce the same key.
+    """
+    if isinstance(arguments, BaseModel):
+        arguments = arguments.model_dump(exclude_none=True)
+    if isinstance(arguments, dict):
+        arguments = {key: value for key, value in arguments.items() if value is not None}
+    return json.dumps(arguments or {}, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ToolResultCache:
+    """Shared LRU store of tool results with per-tool TTLs and hit/miss counters."""
+
+    def __init__(self, config: Optional[MCPCacheConfig] = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            config: Cache configuration. Defaults to MCPCacheConfig().
+        """
+        self.config = config or MCPCacheConfig()
+        self._items: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.evictions = 0
+
+    def enabled_for(self, tool_name: str) -> bool:
+        """Whether results of a tool are cached."""
+        return self.config.enabled and self.config.ttl_for(tool_name) > 0
+
+    def get(self, tool_name: str, key: str) -> Optional[Any]:
+        """Get a cached result, or None on a miss or expired entry."""
+        entry = self._items.get((tool_name, key))
+        if entry is not None and entry[0] > time.monotonic():
+            self._items.move_to_end((tool_name, key))
+            self.hits[tool_name] = self.hits.get(tool_name, 0) + 1
+            record_cache_lookups("mcp_tool", hits=1)
+            return entry[1]
+        if entry is not None:
+            del self._items[(tool_name, key)]
+        self.misses[tool_name] = self.misses.get(tool_name, 0) + 1
+        record_cache_lookups("mcp_tool", misses=1)
+        return None
+
+    def set(self, tool_name: str, key: str, value: Any) -> None:
+        """Store a result, evicting the least recently used entries when full."""
+        ttl = self.config.ttl_for(tool_name)
+        if ttl <= 0:
+            return
+        self._items[(tool_name, key)] = (time.monotonic() + ttl, value)
+        self._items.move_to_end((tool_name, key))
+        while len(self._items) > self.config.max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def contains(self, tool_name: str, key: str) -> bool:
+        """Whether an unexpired entry exists (does not count as a hit)."""
+        entry = self._items.get((tool_name, key))
+        return entry is not None and entry[0] > time.monotonic()
+
+    def delete(self, tool_name: str, key: str) -> bool:
+        """Remove a single entry."""
+        return self._items.pop((tool_name, key), None) is not None
+
+    def clear(self, tool_name: Optional[str] = None) -> None:
+        """Remove all entries, or only those of one tool."""
+        if tool_name is None:
+            self._items.clear()
+            return
+        for item_key in [item_key for item_key in self._items if item_key[0] == tool_name]:
+            del self._items[item_key]
+
+    def size(self, tool_name: Optional[str] = None) -> int:
+        """Number of stored entries (including not yet purged expired ones)."""
+        if tool_name is None:
+            return len(self._items)
+        return sum(1 for item_key in self._items if item_key[0] == tool_name)
+
+    def for_tool(self, tool_name: str) -> "ToolCacheView":
+        """Get a BaseCache view of the entries of one tool."""
+        return ToolCacheView(self, tool_name)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters for diagnostics."""
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        return {
+            "size": len(self._items),
+            "max_size": self.config.max_size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "evictions": self.evictions,
+            "tools": {
+                name: {"hits": self.hits.get(name, 0), "misses": self.misses.get(name, 0)}
+                for name in sorted(set(self.hits) | set(self.misses))
+            },
+        }
+
+
+class ToolCacheView(BaseCache[Any]):
+    """Framework cache adapter scoping a ToolResultCache to a single tool."""
+
+    def __init__(self, store: ToolResultCache, tool_name: str) -> None:
+        super().__init__()
+        self._store = store
+        self._tool_name = tool_name
+        self._enabled = store.enabled_for(tool_name)
+
+    async def size(self) -> int:
+        return self._store.size(self._tool_name)
+
+    async def set(self, key: str, value: Any) -> None:
+        self._store.set(self._tool_name, key, value)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._store.get(self._tool_name, key)
+
+    async def has(self, key: str) -> bool:
+        return self._store.contains(self._tool_name, key)
+
+    async def delete(self, key: str) -> bool:
+        return self._store.delete(self._tool_name, key)
+
+    async def clear(self) -> None:
+        self._store.clear(self._tool_name)
+
+    async def clone(self) -> "ToolCacheView":
+        # Clones keep sharing the same store
+        return self
+
+
+class CachedMCPTool(MCPTool):
+    """MCPTool whose results are served from a shared ToolResultCache."""
+
+    def __init__(self, session: Any, tool: Any, result_cache: ToolResultCache, **options: Any) -> None:
+        """Initialize the tool.
+
+        Args:
+            session: MCP session (or session pool) used to call the tool.
+            tool: MCP tool description.
+            result_cache: Shared result cache.
+            **options: Options forwarded to MCPTool.
+        """
+        super().__init__(session, tool, **options)
+        self._result_cache = result_cache
+        self._cache = result_cache.for_tool(self.name)
+
+    def _generate_key(self, input: Any, options: Any = None) -> str:
+        return normalize_arguments(input)
+
+    async def clone(self) -> "CachedMCPTool":
+        # Clones share the session and the result cache
+        tool = CachedMCPTool(
+            self._session,
+            self._tool.model_copy(),
+            self._result_cache,
+            smart_parsing=self._smart_parsing,
+            exclude_none=self._exclude_none,
+            **(self._options or {}),
+        )
+        tool.middlewares.extend(self.middlewares)
+        return tool
+
+
+# Process-wide cache shared by all linux-mcp-server tools
+_result_cache: Optional[ToolResultCache] = None
+
+
+def get_tool_result_cache(config: Optional[MCPCacheConfig] = None) -> ToolResultCache:
+    """Get (or create) the process-wide tool result cache.
+
+    Args:
+        config: Configuration used when the cache is first created.
+            Defaults to MCPCacheConfig.from_env().
+
+    Returns:
+        ToolResultCache: The shared cache.
+    """
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ToolResultCache(config or MCPCacheConfig.from_env())
+    return _result_cache
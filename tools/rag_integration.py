@@ -6,13 +6,25 @@ from beeai_framework.backend.embedding import EmbeddingModel
 from beeai_framework.backend.vector_store import VectorStore
 from beeai_framework.tools.search.retrieval import VectorStoreSearchTool
 
-from config.db_config import get_connection_string
-from config.llm_config import get_embedding_model_config
+from config.db_config import get_connection_string, get_engine_args
+from config.llm_config import (
+    get_embedding_cache_path,
+    get_embedding_cache_size,
+    get_embedding_dimensions,
+    get_embedding_model_config,
+)
+from tools.embedding_cache import CachedEmbeddingModel, DiskEmbeddingStore
+from tools.rate_limiter import RateLimitedEmbeddingModel, get_rate_limiter
 
 
 def create_embedding_model(provider: str, model: str, truncate_input_tokens: int = 500) -> EmbeddingModel:
     """Create an embedding model for the specified provider.
     
+    Unless disabled with EMBEDDING_CACHE_SIZE=0, the model is wrapped in an
+    embedding cache (in memory, plus on disk when EMBEDDING_CACHE_PATH is set)
+    so repeated queries skip the call to the provider. Calls to the provider
+    are kept within its RATE_LIMIT_<PROVIDER>_* limits.
+    
     Args:
         provider: The embedding provider (e.g., 'openai', 'ollama', 'watsonx', 'gemini').
         model: The model name for that provider.
@@ -23,10 +35,27 @@ def create_embedding_model(provider: str, model: str, truncate_input_tokens: int
     """
     model_name = f"{provider}:{model}"
     
-    return EmbeddingModel.from_name(
+    embedding_model = EmbeddingModel.from_name(
         model_name,
         truncate_input_tokens=truncate_input_tokens
     )
+    
+    # Shares the provider's limits with its chat models; cache hits below use no quota
+    limiter = get_rate_limiter(provider)
+    if limiter is not None:
+        embedding_model = RateLimitedEmbeddingModel(embedding_model, limiter)
+    
+    cache_size = get_embedding_cache_size()
+    if cache_size == 0:
+        return embedding_model
+    
+    cache_path = get_embedding_cache_path()
+    return CachedEmbeddingModel(
+        embedding_model,
+        truncate_input_tokens=truncate_input_tokens,
+        max_size=cache_size,
+        disk_store=DiskEmbeddingStore(cache_path) if cache_path else None,
+    )
 
 
 def get_embedding_model() -> EmbeddingModel:
@@ -61,6 +90,12 @@ def create_rag_tool(
 ) -> VectorStoreSearchTool:
     """Create a RAG tool for searching the postgres+pgvector knowledge base.
     
+    The vector store keeps a pool of warm database connections (sized and
+    timed out according to DatabaseConfig), so searches do not pay a new
+    TCP connection and authentication each time. The embedding column is
+    declared with the model's dimensions so searches can use the ANN index
+    built by utils/manage_vector_index.py.
+    
     Args:
         collection_name: Name of the pgvector collection/table.
         
@@ -76,6 +111,8 @@ def create_rag_tool(
         embedding_model=embedding_model,
         collection_name=collection_name,
         connection_string=connection_string,
+        engine_args=get_engine_args(),
+        embedding_length=get_embedding_dimensions(),
         use_jsonb=True,
     )
     
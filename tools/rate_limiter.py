@@ -0,0 +1,360 @@
+"""Client-side rate limiting of provider requests.
+
+Under batch load, concurrent queries send chat and embedding requests to the
+same provider faster than its quota allows, and the provider answers with
+HTTP 429. Each retry then adds to the load, and the errors feed on
+themselves. ProviderRateLimiter keeps a provider's requests within its
+quota instead:
+
+- token buckets for requests and tokens per minute, so bursts up to one
+  minute's quota pass at once and later requests queue (in arrival order)
+  until the bucket has refilled;
+- a cap on requests in flight;
+- when the provider still answers 429, the request is retried after the
+  provider's Retry-After, or after an exponential backoff with jitter, and
+  every other request to the provider holds off for that time as well.
+
+One limiter is shared per provider (get_rate_limiter), and both chat and
+embedding models of that provider are wrapped with it. The tokens of a
+request are estimated up front (about four characters per token, plus
+max_tokens of a chat answer) and corrected with the usage the provider
+reports.
+"""
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncGenerator, Dict, Iterator, Optional
+
+from beeai_framework.backend import ChatModel, ChatModelOutput, ChatModelParameters
+from beeai_framework.backend.embedding import EmbeddingModel
+from beeai_framework.backend.types import ChatModelInput, EmbeddingModelInput, EmbeddingModelOutput
+from beeai_framework.context import RunContext
+from beeai_framework.emitter import Emitter
+
+from config.llm_config import RateLimitConfig
+from config.logging_config import get_logger
+from config.metrics import RATE_LIMITED, RATE_LIMIT_WAIT_SECONDS
+from tools.llm_fallback import forward_request
+
+_limiters: Dict[str, "ProviderRateLimiter"] = {}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _causes(error: BaseException) -> Iterator[BaseException]:
+    """An error and the errors it was raised from."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Tell whether an error is a provider's rate limit response.
+
+    Returns:
+        Optional[float]: None if the error is not a rate limit; otherwise the
+        seconds the provider asked to wait (Retry-After), or 0 if it did not say.
+    """
+    for cause in _causes(error):
+        response = getattr(cause, "response", None)
+        status = getattr(cause, "status_code", None) or getattr(response, "status_code", None)
+        if status != 429 and type(cause).__name__ != "RateLimitError":
+            continue
+        headers = getattr(response, "headers", None) or getattr(cause, "headers", None) or {}
+        if headers.get("retry-after-ms"):
+            try:
+                return max(0.0, float(headers["retry-after-ms"]) / 1000)
+            except ValueError:
+                pass
+        value = headers.get("retry-after")
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        return 0.0
+    return None
+
+
+class TokenBucket:
+    """Bucket refilling a per-minute quota continuously, holding at most one minute's worth."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = per_minute
+        self.level = per_minute
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until the amount (at most the capacity) is available."""
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return missing * 60 / self.capacity if missing > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        """Remove an amount; corrections may leave the bucket in debt."""
+        self._refill()
+        self.level -= amount
+
+    def give(self, amount: float) -> None:
+        """Return an amount that was taken but not used."""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class ProviderRateLimiter:
+    """Request, token and concurrency limits of one provider."""
+
+    def __init__(self, provider: str, config: RateLimitConfig) -> None:
+        """Create the limiter.
+
+        Args:
+            provider: Provider name (for logs and metrics).
+            config: Limits and retry settings.
+        """
+        self.provider = provider
+        self.config = config
+        self.requests = TokenBucket(config.requests_per_minute) if config.requests_per_minute else None
+        self.tokens = TokenBucket(config.tokens_per_minute) if config.tokens_per_minute else None
+        self._paused_until = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Lock] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self.admitted = 0
+        self.queued = 0
+        self.waited = 0.0
+        self.rate_limited = 0
+        self.retries = 0
+
+    def _bind(self) -> None:
+        # asyncio primitives belong to one event loop; the limiter outlives it (e.g. between tests)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Lock()
+            self._in_flight = asyncio.Semaphore(self.config.max_in_flight) if self.config.max_in_flight else None
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until a request of about this many tokens may be sent.
+
+        Requests are admitted in arrival order. Every acquire must be paired
+        with a release.
+        """
+        self._bind()
+        started = time.monotonic()
+        async with self._queue:
+            if self._in_flight is not None:
+                await self._in_flight.acquire()
+            try:
+                while True:
+                    delay = self._paused_until - time.monotonic()
+                    if self.requests is not None:
+                        delay = max(delay, self.requests.delay(1))
+                    if self.tokens is not None:
+                        delay = max(delay, self.tokens.delay(tokens))
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+            except BaseException:
+                # A request cancelled while queued (hedging, timeouts) never gets to release its slot
+                if self._in_flight is not None:
+                    self._in_flight.release()
+                raise
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(tokens)
+
+        waited = time.monotonic() - started
+        self.admitted += 1
+        if waited > 0.001:
+            self.queued += 1
+            self.waited += waited
+        RATE_LIMIT_WAIT_SECONDS.observe(waited, provider=self.provider)
+
+    def release(self, reserved: int, used: Optional[int] = None) -> None:
+        """Finish a request, correcting its token estimate with the reported usage."""
+        if self.tokens is not None and used:
+            self.tokens.give(reserved - used)
+        if self._in_flight is not None:
+            self._in_flight.release()
+
+    def retry_delay(self, error: BaseException, attempt: int, name: str) -> Optional[float]:
+        """Hold all requests off after a rate limit response.
+
+        Args:
+            error: Error of the failed request.
+            attempt: Number of rate limit responses of this request so far (from 0).
+            name: Model name for the log.
+
+        Returns:
+            Optional[float]: Seconds the provider is paused for before the
+            request is retried, or None if it should not be retried.
+        """
+        wait = retry_after(error)
+        if wait is None:
+            return None
+        self.rate_limited += 1
+        RATE_LIMITED.inc(provider=self.provider)
+        if attempt >= self.config.max_retries:
+            return None
+        # Honor Retry-After; otherwise back off exponentially with jitter, so queued requests do not retry in step
+        delay = wait or min(self.config.max_backoff, self.config.backoff * 2 ** attempt) * random.uniform(0.5, 1.5)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        self.retries += 1
+        get_logger().warning(f"{name} is rate limited, retrying in {delay:.1f}s")
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of admitted, queued and rate limited requests."""
+        return {
+            "provider": self.provider,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "mean_wait": self.waited / self.queued if self.queued else 0.0,
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+        }
+
+
+def get_rate_limiter(provider: str) -> Optional[ProviderRateLimiter]:
+    """Get the process-wide limiter of a provider, creating it on first use.
+
+    Returns:
+        Optional[ProviderRateLimiter]: The limiter, or None if no
+        RATE_LIMIT_<PROVIDER>_* limit is set.
+    """
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        config = RateLimitConfig.from_env(provider)
+        if not config.enabled:
+            return None
+        limiter = _limiters[provider] = ProviderRateLimiter(provider, config)
+    return limiter
+
+
+class RateLimitedChatModel(ChatModel):
+    """ChatModel sending its requests through a provider's rate limiter."""
+
+    def __init__(self, model: ChatModel, limiter: ProviderRateLimiter) -> None:
+        """Wrap a chat model.
+
+        Args:
+            model: The chat model doing the actual work.
+            limiter: Limiter of the model's provider.
+        """
+        # Requests are passed on unchanged; the model adapts tools and tool_choice itself
+        super().__init__(
+            parameters=ChatModelParameters(stream=model.parameters.stream),
+            tool_call_fallback_via_response_format=False,
+            allow_parallel_tool_calls=model.allow_parallel_tool_calls,
+        )
+        self.model = model
+        self.limiter = limiter
+
+    @property
+    def model_id(self) -> str:
+        return self.model.model_id
+
+    @property
+    def provider_id(self) -> Any:
+        return self.model.provider_id
+
+    def _create_emitter(self) -> Emitter:
+        # Own emitter namespace, so the queued request is not counted as a second LLM call
+        return Emitter.root().child(namespace=["backend", "ratelimit", "chat"], creator=self)
+
+    def _estimate(self, input: ChatModelInput) -> int:
+        return sum(estimate_tokens(message.text) for message in input.messages) + (input.max_tokens or 0)
+
+    async def _serve(self, input: ChatModelInput) -> AsyncGenerator[ChatModelOutput, None]:
+        """Send the request within the limits, retrying rate limit responses before the first chunk."""
+        name = f"{self.provider_id}:{self.model_id}"
+        reserved = self._estimate(input)
+        for attempt in range(self.limiter.config.max_retries + 1):
+            await self.limiter.acquire(reserved)
+            used: Optional[int] = None
+            started = False
+            try:
+                async for chunk in forward_request(self.model, input):
+                    started = True
+                    if chunk.usage is not None and chunk.usage.total_tokens:
+                        used = chunk.usage.total_tokens
+                    yield chunk
+                return
+            except Exception as e:
+                if started or self.limiter.retry_delay(e, attempt, name) is None:
+                    raise
+            finally:
+                self.limiter.release(reserved, used)
+
+    async def _create(self, input: ChatModelInput, run: RunContext) -> ChatModelOutput:
+        chunks = [chunk async for chunk in self._serve(input)]
+        return chunks[0] if len(chunks) == 1 else ChatModelOutput.from_chunks(chunks)
+
+    async def _create_stream(self, input: ChatModelInput, run: RunContext) -> AsyncGenerator[ChatModelOutput, None]:
+        async for chunk in self._serve(input):
+            yield chunk
+
+    async def clone(self) -> "RateLimitedChatModel":
+        return RateLimitedChatModel(await self.model.clone(), self.limiter)
+
+
+class RateLimitedEmbeddingModel(EmbeddingModel):
+    """EmbeddingModel sending its requests through a provider's rate limiter."""
+
+    def __init__(self, model: EmbeddingModel, limiter: ProviderRateLimiter) -> None:
+        """Wrap an embedding model.
+
+        Args:
+            model: The embedding model doing the actual work.
+            limiter: Limiter of the model's provider.
+        """
+        super().__init__()
+        self.model = model
+        self.limiter = limiter
+
+    @property
+    def model_id(self) -> str:
+        return self.model.model_id
+
+    @property
+    def provider_id(self) -> Any:
+        return self.model.provider_id
+
+    def _create_emitter(self) -> Emitter:
+        return Emitter.root().child(namespace=["backend", "ratelimit", "embedding"], creator=self)
+
+    async def _create(self, input: EmbeddingModelInput, run: RunContext) -> EmbeddingModelOutput:
+        name = f"{self.provider_id}:{self.model_id}"
+        reserved = sum(estimate_tokens(text) for text in input.values)
+        attempt = 0
+        while True:
+            await self.limiter.acquire(reserved)
+            used: Optional[int] = None
+            try:
+                output = await self.model.create(input.values, signal=input.signal, max_retries=0)
+                used = output.usage.total_tokens if output.usage is not None else None
+                return output
+            except Exception as e:
+                if self.limiter.retry_delay(e, attempt, name) is None:
+                    raise
+                attempt += 1
+            finally:
+                self.limiter.release(reserved, used)
+
+    async def clone(self) -> "RateLimitedEmbeddingModel":
+        return RateLimitedEmbeddingModel(await self.model.clone(), self.limiter)
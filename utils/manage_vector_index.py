@@ -0,0 +1,402 @@
+"""Manage the approximate nearest neighbour index of the knowledge_base collection.
+
+Without an ANN index, similarity search on langchain_pg_embedding is a
+sequential scan over every vector. This command creates, rebuilds or drops
+an HNSW or IVFFlat index (partial on the collection id) and benchmarks its
+recall and latency against exact search.
+
+Usage:
+    python utils/manage_vector_index.py ensure
+    python utils/manage_vector_index.py create --method hnsw --m 16 --ef-construction 64 --rebuild
+    python utils/manage_vector_index.py create --method ivfflat --lists 1000
+    python utils/manage_vector_index.py benchmark --ef-search 20 40 80 160
+    python utils/manage_vector_index.py drop
+"""
+import argparse
+import asyncio
+import math
+import os
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import psycopg
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Vector store collection holding the knowledge base
+COLLECTION_NAME = "knowledge_base"
+
+# Operator classes and query operators per PGVector distance strategy
+DISTANCE_OPS = {
+    "cosine": ("vector_cosine_ops", "<=>"),
+    "l2": ("vector_l2_ops", "<->"),
+    "ip": ("vector_ip_ops", "<#>"),
+}
+
+# Query-time search parameter of each index method
+SEARCH_SETTINGS = {
+    "hnsw": "hnsw.ef_search",
+    "ivfflat": "ivfflat.probes",
+}
+
+
+@dataclass
+class IndexOptions:
+    """Build parameters of an ANN index."""
+
+    method: str = "hnsw"
+    distance: str = "cosine"
+    m: int = 16
+    ef_construction: int = 64
+    lists: Optional[int] = None
+
+
+def index_name(method: str) -> str:
+    """Name of the knowledge base index for a method."""
+    return f"ix_{COLLECTION_NAME}_embedding_{method}"
+
+
+def default_lists(row_count: int) -> int:
+    """IVFFlat list count recommended by pgvector (rows/1000, sqrt(rows) above 1M)."""
+    if row_count > 1_000_000:
+        return max(1, int(row_count ** 0.5))
+    return max(1, row_count // 1000)
+
+
+def build_index_sql(
+    options: IndexOptions,
+    collection_id: Any,
+    concurrently: bool = True,
+    name: Optional[str] = None,
+) -> str:
+    """Build the CREATE INDEX statement for the knowledge base collection.
+
+    Args:
+        options: Index method and build parameters.
+        collection_id: UUID of the collection (the index is partial on it).
+        concurrently: Build without blocking writes.
+        name: Index name. Defaults to index_name(options.method).
+
+    Returns:
+        str: SQL statement.
+    """
+    if options.method not in SEARCH_SETTINGS:
+        raise ValueError(f"Unsupported index method: {options.method}")
+    opclass, _ = DISTANCE_OPS[options.distance]
+    if options.method == "hnsw":
+        params = f"m = {int(options.m)}, ef_construction = {int(options.ef_construction)}"
+    else:
+        params = f"lists = {int(options.lists or 100)}"
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {name or index_name(options.method)} "
+        f"ON langchain_pg_embedding USING {options.method} (embedding {opclass}) "
+        f"WITH ({params}) WHERE collection_id = '{collection_id}'"
+    )
+
+
+def recall_at_k(approximate: Sequence[Any], exact: Sequence[Any]) -> float:
+    """Fraction of the exact top-k results returned by the approximate search."""
+    if not exact:
+        return 1.0
+    return len(set(approximate) & set(exact)) / len(exact)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def get_db_config() -> Dict[str, Any]:
+    """Database connection parameters from environment variables."""
+    return {
+        "host": os.getenv("POSTGRES_HOST", "localhost"),
+        "port": os.getenv("POSTGRES_PORT", "5432"),
+        "dbname": os.getenv("POSTGRES_DB", "rag_db"),
+        "user": os.getenv("POSTGRES_USER", "postgres"),
+        "password": os.getenv("POSTGRES_PASSWORD", ""),
+    }
+
+
+async def get_collection_id(conn: psycopg.AsyncConnection) -> Any:
+    """Get the uuid of the knowledge base collection."""
+    cursor = await conn.execute(
+        "SELECT uuid FROM langchain_pg_collection WHERE name = %s", (COLLECTION_NAME,)
+    )
+    row = await cursor.fetchone()
+    if row is None:
+        raise RuntimeError(f"Collection '{COLLECTION_NAME}' does not exist in langchain_pg_collection")
+    return row[0]
+
+
+async def check_embedding_column(conn: psycopg.AsyncConnection, collection_id: Any) -> None:
+    """Make sure the embedding column can carry an ANN index searches use.
+
+    HNSW and IVFFlat can only index vectors with declared dimensions.
+    PGVector searches the plain column, so an index on a cast expression
+    would never be used; an untyped column has to be converted instead.
+    The agent and the re-embed job create the column typed (embedding_length
+    from EMBEDDING_DIMENSIONS or the model's known dimensions).
+
+    Raises:
+        RuntimeError: If the column has no declared dimensions.
+    """
+    cursor = await conn.execute(
+        "SELECT atttypmod FROM pg_attribute "
+        "WHERE attrelid = 'langchain_pg_embedding'::regclass AND attname = 'embedding'"
+    )
+    if (await cursor.fetchone())[0] > 0:
+        return
+
+    cursor = await conn.execute(
+        "SELECT DISTINCT vector_dims(embedding) FROM langchain_pg_embedding WHERE collection_id = %s",
+        (collection_id,),
+    )
+    dims = [row[0] for row in await cursor.fetchall()]
+    if len(dims) != 1:
+        raise RuntimeError(
+            f"Cannot index '{COLLECTION_NAME}' embeddings with mixed or unknown dimensions {dims}; "
+            "re-embed the collection with a single model first"
+        )
+    raise RuntimeError(
+        "langchain_pg_embedding.embedding has no declared dimensions, so searches cannot use an ANN index. "
+        "Convert it once (this rewrites the table and requires every collection to use the same model):\n"
+        f"    ALTER TABLE langchain_pg_embedding ALTER COLUMN embedding TYPE vector({int(dims[0])})"
+    )
+
+
+async def get_index_validity(conn: psycopg.AsyncConnection, names: Sequence[str]) -> Dict[str, bool]:
+    """Map the given index names that exist to whether they are valid.
+
+    A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind that
+    queries ignore, and which IF NOT EXISTS would keep forever.
+    """
+    cursor = await conn.execute(
+        "SELECT c.relname, i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = ANY(%s)",
+        (list(names),),
+    )
+    return {row[0]: row[1] for row in await cursor.fetchall()}
+
+
+async def get_existing_indexes(conn: psycopg.AsyncConnection) -> List[str]:
+    """Names of the valid knowledge base ANN indexes."""
+    validity = await get_index_validity(conn, [index_name(method) for method in SEARCH_SETTINGS])
+    return [name for name, valid in validity.items() if valid]
+
+
+async def drop_invalid_indexes(conn: psycopg.AsyncConnection, names: Sequence[str]) -> None:
+    """Drop leftovers of failed concurrent builds among the given index names."""
+    for name, valid in (await get_index_validity(conn, names)).items():
+        if not valid:
+            print(f"   Dropping invalid index {name} left by an earlier failed build...")
+            await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+async def create_index(conn: psycopg.AsyncConnection, options: IndexOptions, rebuild: bool = False) -> str:
+    """Create (or rebuild) the ANN index of the knowledge base collection.
+
+    A rebuild builds the new index under a temporary name while the old
+    one keeps serving queries, then drops the old index and renames the
+    new one into place.
+
+    Args:
+        conn: Autocommit connection (required for CREATE INDEX CONCURRENTLY).
+        options: Index method and build parameters.
+        rebuild: Replace existing knowledge base indexes.
+
+    Returns:
+        str: Name of the index.
+    """
+    collection_id = await get_collection_id(conn)
+    await check_embedding_column(conn, collection_id)
+
+    if options.method == "ivfflat" and not options.lists:
+        cursor = await conn.execute(
+            "SELECT COUNT(*) FROM langchain_pg_embedding WHERE collection_id = %s", (collection_id,)
+        )
+        options.lists = default_lists((await cursor.fetchone())[0])
+
+    name = index_name(options.method)
+    build_name = f"{name}_new" if rebuild else name
+    await drop_invalid_indexes(conn, [name, build_name])
+    if rebuild:
+        await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {build_name}")
+
+    print(f"   Building {build_name}...")
+    start = time.perf_counter()
+    await conn.execute(build_index_sql(options, collection_id, name=build_name))
+    if not (await get_index_validity(conn, [build_name])).get(build_name):
+        raise RuntimeError(f"Index {build_name} was not built")
+
+    if rebuild:
+        for existing in await get_existing_indexes(conn):
+            print(f"   Dropping {existing}...")
+            await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {existing}")
+        await conn.execute(f"ALTER INDEX {build_name} RENAME TO {name}")
+    await conn.execute("ANALYZE langchain_pg_embedding")
+    print(f"   Built in {time.perf_counter() - start:.1f}s")
+    return name
+
+
+async def search(
+    conn: psycopg.AsyncConnection,
+    collection_id: Any,
+    query: Any,
+    k: int,
+    operator: str,
+    exact: bool = False,
+    setting: Optional[str] = None,
+    value: Optional[int] = None,
+) -> List[Any]:
+    """Run one top-k similarity search the way PGVector does; exact disables index scans."""
+    async with conn.transaction():
+        if exact:
+            await conn.execute("SET LOCAL enable_indexscan = off")
+            await conn.execute("SET LOCAL enable_bitmapscan = off")
+        elif setting and value:
+            await conn.execute(f"SET LOCAL {setting} = {int(value)}")
+        cursor = await conn.execute(
+            f"SELECT ctid::text FROM langchain_pg_embedding WHERE collection_id = %s "
+            f"ORDER BY embedding {operator} %s::vector LIMIT %s",
+            (collection_id, query, k),
+        )
+        return [row[0] for row in await cursor.fetchall()]
+
+
+async def benchmark(
+    conn: psycopg.AsyncConnection,
+    method: str,
+    search_values: List[int],
+    queries: int = 50,
+    k: int = 10,
+    distance: str = "cosine",
+) -> List[Dict[str, float]]:
+    """Compare ANN search against exact search.
+
+    Query vectors are sampled from the collection itself. For every
+    ef_search / probes value, reports mean recall@k and p50/p95 latency.
+
+    Returns:
+        List[Dict[str, float]]: One result row per search value, plus the
+        exact baseline (search value 0).
+    """
+    _, operator = DISTANCE_OPS[distance]
+    setting = SEARCH_SETTINGS[method]
+    collection_id = await get_collection_id(conn)
+    await check_embedding_column(conn, collection_id)
+    cursor = await conn.execute(
+        "SELECT embedding::text FROM langchain_pg_embedding WHERE collection_id = %s "
+        "ORDER BY random() LIMIT %s",
+        (collection_id, queries),
+    )
+    sample = [row[0] for row in await cursor.fetchall()]
+    if not sample:
+        raise RuntimeError(f"Collection '{COLLECTION_NAME}' has no embeddings to benchmark")
+
+    exact_results, exact_latencies = [], []
+    for query in sample:
+        start = time.perf_counter()
+        exact_results.append(await search(conn, collection_id, query, k, operator, exact=True))
+        exact_latencies.append(time.perf_counter() - start)
+    results = [{
+        "value": 0,
+        "recall": 1.0,
+        "p50_ms": percentile(exact_latencies, 50) * 1000,
+        "p95_ms": percentile(exact_latencies, 95) * 1000,
+    }]
+
+    for value in search_values:
+        recalls, latencies = [], []
+        for query, exact in zip(sample, exact_results):
+            start = time.perf_counter()
+            approximate = await search(conn, collection_id, query, k, operator, setting=setting, value=value)
+            latencies.append(time.perf_counter() - start)
+            recalls.append(recall_at_k(approximate, exact))
+        results.append({
+            "value": value,
+            "recall": statistics.mean(recalls),
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+        })
+    return results
+
+
+def format_benchmark(method: str, results: List[Dict[str, float]], k: int) -> str:
+    """Format benchmark results as a table."""
+    header = f"{SEARCH_SETTINGS[method]:>16}  {'recall@' + str(k):>10}  {'p50 ms':>8}  {'p95 ms':>8}"
+    lines = [header, "-" * len(header)]
+    for row in results:
+        label = "exact" if row["value"] == 0 else str(row["value"])
+        lines.append(f"{label:>16}  {row['recall']:>10.3f}  {row['p50_ms']:>8.2f}  {row['p95_ms']:>8.2f}")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Manage the knowledge_base ANN index.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_index_options(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument("--method", choices=sorted(SEARCH_SETTINGS), default="hnsw")
+        sub.add_argument("--distance", choices=sorted(DISTANCE_OPS), default="cosine",
+                         help="Distance strategy used by the vector store (default: %(default)s)")
+
+    create = subparsers.add_parser("create", help="Create the index (optionally rebuilding it)")
+    add_index_options(create)
+    create.add_argument("--m", type=int, default=16, help="HNSW max connections per layer")
+    create.add_argument("--ef-construction", type=int, default=64, help="HNSW build candidate list size")
+    create.add_argument("--lists", type=int, help="IVFFlat lists (default: rows/1000 or sqrt(rows))")
+    create.add_argument("--rebuild", action="store_true",
+                        help="Replace existing indexes (the old one serves queries until the new one is built)")
+
+    ensure = subparsers.add_parser("ensure", help="Create an HNSW index with defaults if none exists")
+    add_index_options(ensure)
+
+    subparsers.add_parser("drop", help="Drop the knowledge_base ANN indexes")
+
+    bench = subparsers.add_parser("benchmark", help="Report recall and latency against exact search")
+    add_index_options(bench)
+    bench.add_argument("--queries", type=int, default=50, help="Number of sampled query vectors")
+    bench.add_argument("--k", type=int, default=10, help="Results per query")
+    bench.add_argument("--ef-search", type=int, nargs="+", default=[10, 20, 40, 80, 160],
+                       help="HNSW ef_search values to try")
+    bench.add_argument("--probes", type=int, nargs="+", default=[1, 5, 10, 20, 50],
+                       help="IVFFlat probes values to try")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    """Run the index management command."""
+    args = parse_args(argv)
+    conn = await psycopg.AsyncConnection.connect(**get_db_config(), autocommit=True)
+    try:
+        if args.command == "create":
+            options = IndexOptions(args.method, args.distance, args.m, args.ef_construction, args.lists)
+            await create_index(conn, options, rebuild=args.rebuild)
+        elif args.command == "ensure":
+            existing = await get_existing_indexes(conn)
+            if existing:
+                print(f"   Index already present: {', '.join(existing)}")
+            else:
+                await create_index(conn, IndexOptions(args.method, args.distance))
+        elif args.command == "drop":
+            for name in await get_index_validity(conn, [index_name(method) for method in SEARCH_SETTINGS]):
+                await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                print(f"   Dropped {name}")
+        elif args.command == "benchmark":
+            values = args.ef_search if args.method == "hnsw" else args.probes
+            results = await benchmark(conn, args.method, values, args.queries, args.k, args.distance)
+            print(format_benchmark(args.method, results, args.k))
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+"""Profile the import time of the CLI entry modules.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter
+and reports the total import time, the slowest modules and any heavy
+packages that were loaded although startup should defer them. With
+``--budget-ms`` or forbidden modules it exits non-zero, so it can guard
+startup regressions in CI.
+
+Usage:
+    python utils/profile_imports.py
+    python utils/profile_imports.py --module agent --top 15 --budget-ms 300
+    python utils/profile_imports.py --module agent_client --forbid beeai_framework
+"""
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+# Repository root (modules are imported from here)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages that `import agent` must not load: they are imported on first use
+DEFAULT_FORBIDDEN = ("beeai_framework", "mcp", "langchain_postgres", "sqlalchemy", "openai", "litellm")
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse ``-X importtime`` stderr output into records."""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_part, cumulative_part, raw_name = line.split("|", 2)
+            self_us = int(self_part.split(":", 1)[1])
+            cumulative_us = int(cumulative_part)
+        except ValueError:
+            continue
+        # Nesting is encoded as two spaces per level after one separator space
+        stripped = raw_name.lstrip()
+        records.append(ImportRecord(
+            name=stripped.strip(),
+            self_us=self_us,
+            cumulative_us=cumulative_us,
+            depth=(len(raw_name) - len(stripped) - 1) // 2,
+        ))
+    return records
+
+
+def profile_module(module: str, python: str = sys.executable) -> List[ImportRecord]:
+    """Import a module in a fresh interpreter and return its import records."""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def module_records(records: Sequence[ImportRecord], module: str) -> List[ImportRecord]:
+    """Return the records of a module and everything it imported.
+
+    ``-X importtime`` lists nested imports before their parent, so these are
+    the module's own (depth 0) record and the nested records right before it;
+    interpreter start-up imports (site, .pth files) are left out.
+    """
+    for end in range(len(records) - 1, -1, -1):
+        if records[end].name == module and records[end].depth == 0:
+            start = end
+            while start > 0 and records[start - 1].depth > 0:
+                start -= 1
+            return list(records[start:end + 1])
+    return []
+
+
+def total_ms(records: Sequence[ImportRecord], module: str) -> float:
+    """Cumulative import time of a module in milliseconds."""
+    return next((r.cumulative_us for r in records if r.name == module and r.depth == 0), 0) / 1000
+
+
+def find_forbidden(records: Sequence[ImportRecord], forbidden: Sequence[str]) -> List[str]:
+    """Return forbidden top-level packages that were imported."""
+    loaded = {record.name.split(".")[0] for record in records}
+    return [package for package in forbidden if package in loaded]
+
+
+def format_report(module: str, records: Sequence[ImportRecord], top: int) -> str:
+    """Format the slowest top-level and individual imports of a module."""
+    lines = [f"import {module}: {total_ms(records, module):.1f} ms total, {len(records)} modules"]
+    lines.append("  slowest top-level imports (cumulative):")
+    for record in sorted((r for r in records if r.depth == 1), key=lambda r: -r.cumulative_us)[:top]:
+        lines.append(f"    {record.cumulative_us / 1000:>9.1f} ms  {record.name}")
+    lines.append("  slowest modules (self):")
+    for record in sorted(records, key=lambda r: -r.self_us)[:top]:
+        lines.append(f"    {record.self_us / 1000:>9.1f} ms  {record.name}")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Report the import time of the CLI entry modules.")
+    parser.add_argument("--module", action="append", help="Module to profile (default: agent, agent_client)")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the fastest is reported")
+    parser.add_argument("--budget-ms", type=float, help="Fail if a module takes longer to import")
+    parser.add_argument("--forbid", action="append",
+                        help=f"Fail if this package is imported (default: {', '.join(DEFAULT_FORBIDDEN)})")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Profile the modules and return the process exit code."""
+    args = parse_args(argv)
+    forbidden = args.forbid or list(DEFAULT_FORBIDDEN)
+    failed = False
+    for module in args.module or ["agent", "agent_client"]:
+        runs = [profile_module(module) for _ in range(max(1, args.repeat))]
+        records = module_records(min(runs, key=lambda run: total_ms(run, module)), module)
+        print(format_report(module, records, args.top))
+
+        loaded = find_forbidden(records, forbidden)
+        if loaded:
+            failed = True
+            print(f"  ❌ eagerly imports: {', '.join(loaded)}")
+        if args.budget_ms is not None and total_ms(records, module) > args.budget_ms:
+            failed = True
+            print(f"  ❌ exceeds budget of {args.budget_ms:g} ms")
+        print()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,625 @@
-"""Re-embed all documents with the correct embedding model."""
+"""Re-embed documents (fully or incrementally) with the correct embedding model."""
+import argparse
 import asyncio
+import hashlib
+import json
 import os
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
 from beeai_framework.backend.embedding import EmbeddingModel
 from beeai_framework.backend.vector_store import VectorStore
 import psycopg
+from pgvector.psycopg import register_vector_async
+from psycopg.types.json import Jsonb
+
+# Run as a script, the repository root is not on the import path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from config.llm_config import get_embedding_dimensions
+from tools.rate_limiter import RateLimitedEmbeddingModel, get_rate_limiter
 
 load_dotenv()
 
+# Rows fetched from the server-side cursor and initial embedding batch size
+DEFAULT_BATCH_SIZE = 100
+
+# Embedding batches in flight at once
+DEFAULT_CONCURRENCY = 4
+
+# Retries of a batch rejected by the provider's rate limiter, and the base
+# of their exponential backoff in seconds
+MAX_RATE_LIMIT_RETRIES = 5
+RATE_LIMIT_BACKOFF = 1.0
+
+# Vector store collection holding the knowledge base
+COLLECTION_NAME = "knowledge_base"
+
+# Progress of an interrupted run, used to resume it
+DEFAULT_CHECKPOINT_FILE = ".re_embed_checkpoint.json"
+
+# Staging table filled by the bulk COPY loader before being swapped in
+STAGING_TABLE = "langchain_pg_embedding_staging"
+
+# Embeddings of the knowledge base collection
+COLLECTION_FILTER = "collection_id IN (SELECT uuid FROM langchain_pg_collection WHERE name = %(collection)s)"
+
+# A document is up to date when an embedding with its current content hash
+# and the current embedding model exists (hash computed server-side)
+UP_TO_DATE_FILTER = f"""EXISTS (
+    SELECT 1 FROM langchain_pg_embedding e
+    WHERE e.{COLLECTION_FILTER}
+      AND e.cmetadata->>'original_id' = d.id::text
+      AND e.cmetadata->>'content_hash' = encode(sha256(convert_to(d.text, 'UTF8')), 'hex')
+      AND e.cmetadata->>'embedding_model' = %(embedding_model)s
+)"""
+
+
+class SimpleDocument:
+    """Simple class to match BeeAI's expected document format."""
+
+    def __init__(self, content: str, metadata: Dict[str, Any], row_id: Any = None):
+        self.id = None
+        self.content = content
+        self.metadata = metadata
+        self.row_id = row_id
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of a document's text (matches the SQL computation)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def row_to_document(
+    row_id: Any,
+    text: str,
+    metadata: Optional[Dict[str, Any]],
+    embedding_model: Optional[str] = None,
+) -> SimpleDocument:
+    """Convert a data_vectors row to a document for the vector store.
+    
+    The content hash and embedding model id are stored in the document
+    metadata so later incremental runs can skip unchanged documents.
+    """
+    file_name = metadata.get('file_name', f'doc_{row_id}') if metadata else f'doc_{row_id}'
+    doc_metadata = {
+        "source": file_name,
+        "original_id": str(row_id),
+        "content_hash": content_hash(text),
+    }
+    if embedding_model:
+        doc_metadata["embedding_model"] = embedding_model
+    return SimpleDocument(content=text, metadata=doc_metadata, row_id=row_id)
+
+
+def build_select_query(
+    incremental: bool = False,
+    embedding_model: Optional[str] = None,
+    after_id: Any = None,
+    count: bool = False,
+) -> Tuple[str, Dict[str, Any]]:
+    """Build the query selecting the data_vectors rows to embed.
+    
+    Args:
+        incremental: Only select new documents and documents whose content
+            hash or embedding model differs from the stored embedding.
+        embedding_model: Embedding model id (required when incremental).
+        after_id: Only select rows with a greater id (resume point).
+        count: Build a COUNT(*) query instead.
+        
+    Returns:
+        Tuple[str, Dict[str, Any]]: SQL and its parameters.
+    """
+    conditions = []
+    params: Dict[str, Any] = {"collection": COLLECTION_NAME, "embedding_model": embedding_model}
+    if incremental:
+        conditions.append(f"NOT {UP_TO_DATE_FILTER}")
+    if after_id is not None:
+        conditions.append("d.id > %(after_id)s")
+        params["after_id"] = after_id
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    if count:
+        return f"SELECT COUNT(*) FROM data_vectors d{where}", params
+    return f"SELECT d.id, d.text, d.metadata_ FROM data_vectors d{where} ORDER BY d.id", params
+
+
+async def iter_document_batches(
+    conn: psycopg.AsyncConnection,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    incremental: bool = False,
+    embedding_model: Optional[str] = None,
+    after_id: Any = None,
+) -> AsyncIterator[List[SimpleDocument]]:
+    """Stream documents from data_vectors in bounded batches.
+    
+    Uses a named (server-side) cursor so only one batch of rows is held in
+    memory at a time, regardless of the table size.
+    
+    Args:
+        conn: Open connection to the RAG database (not in autocommit mode).
+        batch_size: Number of rows fetched and yielded per batch.
+        incremental: Only stream new or changed documents.
+        embedding_model: Embedding model id stored with each document.
+        after_id: Resume after this row id.
+        
+    Yields:
+        List[SimpleDocument]: Up to batch_size documents, in id order.
+    """
+    query, params = build_select_query(incremental, embedding_model, after_id)
+    async with conn.cursor(name="re_embed_documents") as cursor:
+        cursor.itersize = batch_size
+        await cursor.execute(query, params)
+        while True:
+            rows = await cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [row_to_document(*row, embedding_model=embedding_model) for row in rows]
+
+
+@dataclass
+class Checkpoint:
+    """Resume point of a re-embedding run."""
+
+    embedding_model: str
+    incremental: bool
+    last_id: Any = None
+
+
+def load_checkpoint(path: str) -> Optional[Checkpoint]:
+    """Load a checkpoint file, or None if it is missing or unreadable."""
+    try:
+        return Checkpoint(**json.loads(Path(path).read_text()))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    """Atomically write a checkpoint file."""
+    tmp_path = Path(f"{path}.tmp")
+    tmp_path.write_text(json.dumps(checkpoint.__dict__))
+    os.replace(tmp_path, path)
+
+
+class BatchWatermark:
+    """Track the last row id below which every batch has been written.
+    
+    Batches complete out of order when several are in flight, so the resume
+    point only advances over a contiguous prefix of completed batches.
+    """
+
+    def __init__(self):
+        self._last_ids: Dict[int, Any] = {}
+        self._done: set = set()
+        self._next = 0
+
+    def register(self, seq: int, batch: List[SimpleDocument]) -> None:
+        """Record the last row id of a queued batch."""
+        self._last_ids[seq] = batch[-1].row_id
+
+    def complete(self, seq: int) -> Tuple[bool, Any]:
+        """Mark a batch written; return (advanced, watermark row id)."""
+        self._done.add(seq)
+        watermark, advanced = None, False
+        while self._next in self._done:
+            self._done.remove(self._next)
+            watermark = self._last_ids.pop(self._next)
+            self._next += 1
+            advanced = True
+        return advanced, watermark
+
+
+class AdaptiveBatchSizer:
+    """Adapt the embedding batch size to observed latency and rate limiting.
+    
+    Additive increase while batches finish well under the target latency,
+    multiplicative decrease when they are slow or rejected with HTTP 429.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_BATCH_SIZE,
+        minimum: int = 10,
+        maximum: int = 1000,
+        target_latency: float = 10.0,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.target_latency = target_latency
+        self.step = max(1, initial // 4)
+        self.size = min(self.maximum, max(self.minimum, initial))
+
+    def record_success(self, latency: float) -> None:
+        """Adjust the size after a batch completed in `latency` seconds."""
+        if latency > self.target_latency:
+            self.size = max(self.minimum, self.size // 2)
+        elif latency < self.target_latency / 2:
+            self.size = min(self.maximum, self.size + self.step)
+
+    def record_rate_limited(self) -> None:
+        """Shrink the size after the provider rejected a batch with 429."""
+        self.size = max(self.minimum, self.size // 2)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception (or its cause) is an HTTP 429 / rate limit error.
+
+    Only the status code and the exception type are trusted; error messages
+    mention "429" for unrelated reasons (ids, sizes, row counts).
+    """
+    while error is not None:
+        response = getattr(error, "response", None)
+        status = (
+            getattr(error, "status_code", None)
+            or getattr(error, "status", None)
+            or getattr(response, "status_code", None)
+        )
+        if status == 429 or type(error).__name__ in ("RateLimitError", "TooManyRequests"):
+            return True
+        error = error.__cause__
+    return False
+
+
+@dataclass
+class ThroughputMeter:
+    """Track processed documents and throughput."""
+
+    total: int
+    processed: int = 0
+    batches: int = 0
+    rate_limited: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the meter was created."""
+        return time.perf_counter() - self.started
+
+    @property
+    def docs_per_second(self) -> float:
+        """Average throughput in documents per second."""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def format(self) -> str:
+        """Format a single progress line."""
+        percent = 100 * self.processed // max(self.total, 1)
+        return (
+            f"Progress: {self.processed:,} / {self.total:,} ({percent}%) "
+            f"- {self.docs_per_second:.1f} docs/s"
+        )
+
+
+async def embed_documents_concurrently(
+    batches: AsyncIterator[List[SimpleDocument]],
+    write_batch: Callable[[List[SimpleDocument]], Awaitable[Any]],
+    meter: ThroughputMeter,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    sizer: Optional[AdaptiveBatchSizer] = None,
+    on_progress: Optional[Callable[[ThroughputMeter], None]] = None,
+    on_checkpoint: Optional[Callable[[Any], None]] = None,
+) -> ThroughputMeter:
+    """Embed and write documents with several batches in flight.
+    
+    A producer re-chunks the streamed documents into batches of the sizer's
+    current size and feeds a bounded queue, so at most about
+    2 * concurrency batches are held in memory. Workers write batches
+    concurrently; rate-limited batches are retried with exponential backoff.
+    
+    Args:
+        batches: Streamed document batches (e.g. from iter_document_batches).
+        write_batch: Coroutine function embedding and storing one batch.
+        meter: Throughput meter updated as batches complete.
+        concurrency: Number of batches in flight.
+        sizer: Adaptive batch sizer. Defaults to AdaptiveBatchSizer().
+        on_progress: Called with the meter after every completed batch.
+        on_checkpoint: Called with the row id up to which all documents
+            have been written, whenever it advances.
+        
+    Returns:
+        ThroughputMeter: The updated meter.
+    """
+    sizer = sizer or AdaptiveBatchSizer()
+    # Every worker needs its own end-of-input sentinel, so both use the same count
+    workers = max(1, concurrency)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    watermark = BatchWatermark()
+
+    async def produce() -> None:
+        seq = 0
+        buffer: List[SimpleDocument] = []
+
+        async def put(chunk: List[SimpleDocument]) -> None:
+            nonlocal seq
+            watermark.register(seq, chunk)
+            await queue.put((seq, chunk))
+            seq += 1
+
+        async for batch in batches:
+            buffer.extend(batch)
+            while len(buffer) >= sizer.size:
+                size = sizer.size
+                chunk, buffer = buffer[:size], buffer[size:]
+                await put(chunk)
+        if buffer:
+            await put(buffer)
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def work() -> None:
+        while (item := await queue.get()) is not None:
+            seq, batch = item
+            for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                start = time.perf_counter()
+                try:
+                    await write_batch(batch)
+                except Exception as e:
+                    if not is_rate_limit_error(e) or attempt == MAX_RATE_LIMIT_RETRIES:
+                        raise
+                    meter.rate_limited += 1
+                    sizer.record_rate_limited()
+                    await asyncio.sleep(min(30.0, RATE_LIMIT_BACKOFF * 2 ** attempt))
+                    continue
+                sizer.record_success(time.perf_counter() - start)
+                break
+            meter.processed += len(batch)
+            meter.batches += 1
+            advanced, last_id = watermark.complete(seq)
+            if advanced and on_checkpoint:
+                on_checkpoint(last_id)
+            if on_progress:
+                on_progress(meter)
+
+    async with asyncio.TaskGroup() as group:
+        group.create_task(produce())
+        for _ in range(workers):
+            group.create_task(work())
+    return meter
+
+
+def create_embedding_model(provider: str, model: str) -> EmbeddingModel:
+    """Create the embedding model, kept within the provider's RATE_LIMIT_<PROVIDER>_* limits.
+
+    The concurrent workers share one token bucket, so a bulk re-embed
+    cannot exceed the quota configured for the provider.
+    """
+    embedding_model = EmbeddingModel.from_name(f"{provider}:{model}", truncate_input_tokens=500)
+    limiter = get_rate_limiter(provider)
+    if limiter is not None:
+        embedding_model = RateLimitedEmbeddingModel(embedding_model, limiter)
+    return embedding_model
+
+
+async def ensure_original_id_index(conn: psycopg.AsyncConnection) -> None:
+    """Index embeddings by original_id so per-document lookups stay cheap."""
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_langchain_pg_embedding_original_id "
+        "ON langchain_pg_embedding ((cmetadata->>'original_id'))"
+    )
+
+
+async def delete_embeddings(conn: psycopg.AsyncConnection, original_ids: List[str]) -> None:
+    """Delete the stored embeddings of the given documents."""
+    await conn.execute(
+        f"DELETE FROM langchain_pg_embedding WHERE {COLLECTION_FILTER} "
+        "AND cmetadata->>'original_id' = ANY(%(original_ids)s)",
+        {"collection": COLLECTION_NAME, "original_ids": original_ids},
+    )
+
+
+async def delete_removed_documents(conn: psycopg.AsyncConnection) -> int:
+    """Delete embeddings whose source row no longer exists in data_vectors."""
+    cursor = await conn.execute(
+        f"DELETE FROM langchain_pg_embedding WHERE {COLLECTION_FILTER} "
+        "AND NOT EXISTS (SELECT 1 FROM data_vectors d WHERE d.id::text = langchain_pg_embedding.cmetadata->>'original_id')",
+        {"collection": COLLECTION_NAME},
+    )
+    return cursor.rowcount
+
+
+async def get_embedding_columns(conn: psycopg.AsyncConnection) -> List[Tuple[str, str]]:
+    """Get (column, type name) pairs of langchain_pg_embedding in table order.
+    
+    The layout differs between PGVector implementations (e.g. an ``id``
+    varchar key vs. a ``uuid`` key plus ``custom_id``), so it is read from
+    the catalog instead of being hard-coded.
+    """
+    cursor = await conn.execute(
+        "SELECT column_name, udt_name FROM information_schema.columns "
+        "WHERE table_name = 'langchain_pg_embedding' AND table_schema = current_schema() "
+        "ORDER BY ordinal_position"
+    )
+    return [(name, type_name) for name, type_name in await cursor.fetchall()]
+
+
+def build_embedding_row(
+    columns: List[Tuple[str, str]],
+    collection_id: Any,
+    document: SimpleDocument,
+    embedding: List[float],
+) -> List[Any]:
+    """Build a langchain_pg_embedding row (in column order) for binary COPY."""
+    row_id = uuid.uuid4()
+    values = {
+        "id": row_id,
+        "uuid": row_id,
+        "custom_id": document.metadata["original_id"],
+        "collection_id": collection_id,
+        "embedding": embedding,
+        "document": document.content,
+        "cmetadata": Jsonb(document.metadata),
+    }
+    row = []
+    for name, type_name in columns:
+        value = values.get(name)
+        if isinstance(value, uuid.UUID) and type_name != "uuid":
+            value = str(value)
+        row.append(value)
+    return row
+
+
+@asynccontextmanager
+async def copy_into_staging(conn: psycopg.AsyncConnection, columns: List[Tuple[str, str]]):
+    """Create an empty staging table and open a binary COPY into it.
+    
+    Yields:
+        An async callable writing one row (as built by build_embedding_row).
+    """
+    await register_vector_async(conn)
+    await conn.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+    await conn.execute(f"CREATE UNLOGGED TABLE {STAGING_TABLE} (LIKE langchain_pg_embedding INCLUDING DEFAULTS)")
+
+    column_list = ", ".join(name for name, _ in columns)
+    async with conn.cursor() as cursor:
+        async with cursor.copy(f"COPY {STAGING_TABLE} ({column_list}) FROM STDIN WITH (FORMAT BINARY)") as copy:
+            copy.set_types([type_name for _, type_name in columns])
+            yield copy.write_row
+
+
+async def get_vector_indexes(conn: psycopg.AsyncConnection) -> List[Tuple[str, str]]:
+    """Names and definitions of the ANN indexes on the embedding table."""
+    cursor = await conn.execute(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE tablename = 'langchain_pg_embedding' AND indexdef ~* 'USING (hnsw|ivfflat)'"
+    )
+    return [(row[0], row[1]) for row in await cursor.fetchall()]
+
+
+async def swap_in_staging(conn: psycopg.AsyncConnection, columns: List[Tuple[str, str]]) -> None:
+    """Replace the collection's embeddings with the staging table in one transaction.
+    
+    The ANN indexes are dropped before the swap and rebuilt from their
+    definitions afterwards, so the rows are not inserted into the index one
+    by one. Readers wait on the table lock during the swap and then see the
+    new embeddings; the collection is never observed half-empty.
+    """
+    column_list = ", ".join(name for name, _ in columns)
+    async with conn.transaction():
+        indexes = await get_vector_indexes(conn)
+        for name, _ in indexes:
+            await conn.execute(f'DROP INDEX "{name}"')
+        await conn.execute(
+            f"DELETE FROM langchain_pg_embedding WHERE {COLLECTION_FILTER}",
+            {"collection": COLLECTION_NAME},
+        )
+        await conn.execute(
+            f"INSERT INTO langchain_pg_embedding ({column_list}) SELECT {column_list} FROM {STAGING_TABLE}"
+        )
+        await conn.execute(f"DROP TABLE {STAGING_TABLE}")
+        for name, definition in indexes:
+            print(f"   Rebuilding index {name}...")
+            await conn.execute(definition)
+
+
+async def get_collection_id(conn: psycopg.AsyncConnection) -> Any:
+    """Get the uuid of the knowledge base collection."""
+    cursor = await conn.execute(
+        "SELECT uuid FROM langchain_pg_collection WHERE name = %(collection)s",
+        {"collection": COLLECTION_NAME},
+    )
+    row = await cursor.fetchone()
+    if row is None:
+        raise RuntimeError(f"Collection '{COLLECTION_NAME}' does not exist in langchain_pg_collection")
+    return row[0]
+
+
+async def bulk_load(
+    write_conn: psycopg.AsyncConnection,
+    embedding_model: EmbeddingModel,
+    embedding_model_id: str,
+    read_conn: psycopg.AsyncConnection,
+    batch_size: int,
+    meter: ThroughputMeter,
+    concurrency: int,
+    sizer: AdaptiveBatchSizer,
+) -> None:
+    """Embed all documents and load them with binary COPY, then swap them in.
+    
+    Embedding batches run concurrently; their rows are appended to a single
+    COPY stream into the staging table.
+    
+    Args:
+        write_conn: Autocommit connection used for COPY and the swap.
+        embedding_model: Model used to embed the documents.
+        embedding_model_id: Model id stored in the document metadata.
+        read_conn: Connection streaming the source documents.
+        batch_size: Cursor fetch size.
+        meter: Throughput meter.
+        concurrency: Number of embedding batches in flight.
+        sizer: Adaptive batch sizer.
+    """
+    columns = await get_embedding_columns(write_conn)
+    collection_id = await get_collection_id(write_conn)
+    copy_lock = asyncio.Lock()
+
+    async with copy_into_staging(write_conn, columns) as write_row:
+        async def write_batch(batch: List[SimpleDocument]) -> None:
+            output = await embedding_model.create([doc.content for doc in batch])
+            async with copy_lock:
+                for doc, embedding in zip(batch, output.embeddings):
+                    await write_row(build_embedding_row(columns, collection_id, doc, embedding))
+
+        await embed_documents_concurrently(
+            iter_document_batches(read_conn, batch_size, embedding_model=embedding_model_id),
+            write_batch,
+            meter,
+            concurrency=concurrency,
+            sizer=sizer,
+            on_progress=lambda m: print(f"   {m.format()} [batch size {sizer.size}]"),
+        )
+
+    print(f"\n6. Swapping staging table into langchain_pg_embedding...")
+    await swap_in_staging(write_conn, columns)
+    print("   Swapped!")
+
+
+async def re_embed_all(
+    concurrency: int = DEFAULT_CONCURRENCY,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    min_batch_size: int = 10,
+    max_batch_size: int = 1000,
+    target_latency: float = 10.0,
+    assume_yes: bool = False,
+    incremental: bool = False,
+    checkpoint_file: str = DEFAULT_CHECKPOINT_FILE,
+    resume: bool = True,
+    bulk: bool = False,
+):
+    """Re-embed documents from data_vectors using the current embedding model.
+    
+    In full mode every embedding of the collection is deleted and rebuilt.
+    In incremental mode only new documents and documents whose content hash
+    or embedding model changed are embedded, and embeddings of deleted
+    documents are removed. Either mode records its progress in a checkpoint
+    file and resumes from it after an interruption.
+    
+    The bulk mode (full re-index only) embeds the documents itself, streams
+    the vectors with binary COPY into a staging table and swaps it in with a
+    single transaction, which is much faster than row-by-row inserts through
+    the vector store. It restarts from scratch when interrupted.
+    
+    Args:
+        concurrency: Number of embedding batches in flight.
+        batch_size: Initial embedding batch size (also the cursor fetch size).
+        min_batch_size: Lower bound for the adaptive batch size.
+        max_batch_size: Upper bound for the adaptive batch size.
+        target_latency: Batch latency (seconds) the batch size adapts towards.
+        assume_yes: Skip the confirmation prompt.
+        incremental: Only embed new or changed documents.
+        checkpoint_file: Path of the checkpoint file.
+        resume: Resume from a matching checkpoint if one exists.
+        bulk: Load embeddings with COPY into a staging table and swap it in.
+    """
+    if bulk and incremental:
+        raise ValueError("Bulk loading only supports full re-embedding, not incremental mode")
+    if bulk:
+        resume = False
 
-async def re_embed_all():
-    """Re-embed all documents from data_vectors using the current embedding model."""
     print("=" * 80)
-    print("RE-EMBEDDING ALL DOCUMENTS")
+    print("RE-EMBEDDING DOCUMENTS (INCREMENTAL)" if incremental else "RE-EMBEDDING ALL DOCUMENTS")
     print("=" * 80)
     
     # Database config
@@ -28,101 +634,183 @@ async def re_embed_all():
     # Get embedding model
     embedding_provider = os.getenv("EMBEDDING_PROVIDER", "ollama")
     embedding_model_name = os.getenv("EMBEDDING_MODEL", "nomic-embed-text")
+    embedding_model_id = f"{embedding_provider}:{embedding_model_name}"
     
-    print(f"\n1. Creating embedding model: {embedding_provider}:{embedding_model_name}")
-    embedding_model = EmbeddingModel.from_name(
-        f"{embedding_provider}:{embedding_model_name}",
-        truncate_input_tokens=500
-    )
+    print(f"\n1. Creating embedding model: {embedding_model_id}")
+    embedding_model = create_embedding_model(embedding_provider, embedding_model_name)
     
-    # Read data from source table
+    # Read data from source table; writes go through a separate connection
+    # so they are not held in the reader's long-running transaction
     print(f"\n2. Reading documents from data_vectors table...")
     conn = await psycopg.AsyncConnection.connect(**db_config)
+    write_conn = await psycopg.AsyncConnection.connect(**db_config, autocommit=True)
+    await ensure_original_id_index(write_conn)
+    
+    # Resume from a checkpoint of an interrupted run with the same settings
+    checkpoint = load_checkpoint(checkpoint_file) if resume else None
+    if checkpoint and (checkpoint.embedding_model != embedding_model_id or checkpoint.incremental != incremental):
+        checkpoint = None
+    after_id = checkpoint.last_id if checkpoint else None
     
-    # Count total
-    cursor = await conn.execute("SELECT COUNT(*) FROM data_vectors")
+    # Count documents to process
+    query, params = build_select_query(incremental, embedding_model_id, after_id, count=True)
+    cursor = await conn.execute(query, params)
     total_count = (await cursor.fetchone())[0]
-    print(f"   Total documents: {total_count:,}")
+    await conn.commit()
+    print(f"   Documents to embed: {total_count:,}")
+    if checkpoint:
+        print(f"   Resuming from checkpoint after id {after_id}")
     
     # Confirm with user
-    print(f"\n⚠️  WARNING: This will RE-EMBED all {total_count:,} documents!")
-    print(f"   This will take significant time (~{total_count // 100} minutes at 100 docs/min)")
-    print(f"   Existing embeddings in langchain_pg_embedding will be DELETED")
-    response = input("\n   Continue? (yes/no): ")
+    if incremental:
+        print(f"\n   Only new and changed documents will be embedded; removed ones will be deleted")
+    else:
+        print(f"\n⚠️  WARNING: This will RE-EMBED all {total_count:,} documents!")
+        if not checkpoint:
+            print(f"   Existing embeddings in langchain_pg_embedding will be DELETED")
+    print(f"   Embedding with {concurrency} concurrent batches (initial batch size {batch_size})")
+    response = "yes" if assume_yes else input("\n   Continue? (yes/no): ")
     
     if response.lower() != 'yes':
         print("   Cancelled.")
         await conn.close()
+        await write_conn.close()
         return
     
-    # Delete existing embeddings
-    print(f"\n3. Clearing existing langchain_pg_embedding table...")
-    await conn.execute("DELETE FROM langchain_pg_embedding WHERE collection_id IN (SELECT uuid FROM langchain_pg_collection WHERE name = 'knowledge_base')")
-    await conn.commit()
-    print("   Cleared!")
-    
-    # Read all documents
-    print(f"\n4. Reading all documents...")
-    cursor = await conn.execute(
-        "SELECT id, text, metadata_ FROM data_vectors ORDER BY id"
-    )
-    rows = await cursor.fetchall()
-    print(f"   Loaded {len(rows):,} documents")
-    
-    # Convert to document format
-    print(f"\n5. Preparing documents...")
-    
-    # Simple class to match BeeAI's expected document format
-    class SimpleDocument:
-        def __init__(self, content, metadata):
-            self.content = content
-            self.metadata = metadata
-    
-    documents = []
-    for row_id, text, metadata in rows:
-        file_name = metadata.get('file_name', f'doc_{row_id}') if metadata else f'doc_{row_id}'
-        
-        doc = SimpleDocument(
-            content=text,
-            metadata={
-                "source": file_name,
-                "original_id": str(row_id),
-            }
+    # Delete existing embeddings (a resumed full run keeps what it already wrote;
+    # the bulk loader replaces them atomically at the end)
+    if bulk:
+        print(f"\n3. Existing embeddings will be replaced once the bulk load completes")
+    elif not incremental and not checkpoint:
+        print(f"\n3. Clearing existing langchain_pg_embedding table...")
+        await write_conn.execute(
+            f"DELETE FROM langchain_pg_embedding WHERE {COLLECTION_FILTER}",
+            {"collection": COLLECTION_NAME},
         )
-        documents.append(doc)
-    
-    print(f"   Prepared {len(documents):,} documents")
-    await conn.close()
-    
-    # Create vector store and add documents
-    print(f"\n6. Creating vector store and embedding documents...")
-    print(f"   ⏳ This will take a while...")
+        print("   Cleared!")
+    else:
+        print(f"\n3. Keeping existing embeddings")
+    if not bulk:
+        save_checkpoint(checkpoint_file, Checkpoint(embedding_model_id, incremental, after_id))
     
+    # Create vector store
+    print(f"\n4. Creating vector store...")
     connection_string = f"postgresql+psycopg://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['dbname']}"
     
     vector_store = VectorStore.from_name(
         name="langchain:PGVector",
         embedding_model=embedding_model,
-        collection_name="knowledge_base",
+        collection_name=COLLECTION_NAME,
         connection_string=connection_string,
+        embedding_length=get_embedding_dimensions(embedding_model_name),
         use_jsonb=True,
     )
     
-    # Add documents in batches to show progress
-    batch_size = 100
-    for i in range(0, len(documents), batch_size):
-        batch = documents[i:i+batch_size]
+    # Replace (rather than duplicate) embeddings of changed documents and of
+    # documents an interrupted run may already have written
+    replace_existing = incremental or checkpoint is not None
+    
+    async def write_batch(batch: List[SimpleDocument]) -> None:
+        if replace_existing:
+            await delete_embeddings(write_conn, [doc.metadata["original_id"] for doc in batch])
         await vector_store.add_documents(documents=batch)
-        print(f"   Progress: {min(i+batch_size, len(documents)):,} / {len(documents):,} ({100*min(i+batch_size, len(documents))//len(documents)}%)")
+    
+    # Stream, embed and write documents in bounded batches
+    print(f"\n5. Streaming and embedding documents...")
+    print(f"   ⏳ This will take a while...")
+    
+    meter = ThroughputMeter(total=total_count)
+    sizer = AdaptiveBatchSizer(
+        initial=batch_size,
+        minimum=min_batch_size,
+        maximum=max_batch_size,
+        target_latency=target_latency,
+    )
+    try:
+        if bulk:
+            await bulk_load(write_conn, embedding_model, embedding_model_id, conn, batch_size, meter, concurrency, sizer)
+        else:
+            await embed_documents_concurrently(
+                iter_document_batches(conn, batch_size, incremental, embedding_model_id, after_id),
+                write_batch,
+                meter,
+                concurrency=concurrency,
+                sizer=sizer,
+                on_progress=lambda m: print(f"   {m.format()} [batch size {sizer.size}]"),
+                on_checkpoint=lambda last_id: save_checkpoint(
+                    checkpoint_file, Checkpoint(embedding_model_id, incremental, last_id)
+                ),
+            )
+        
+        removed = 0
+        if incremental:
+            print(f"\n6. Removing embeddings of deleted documents...")
+            removed = await delete_removed_documents(write_conn)
+            print(f"   Removed {removed:,} embeddings")
+    finally:
+        await conn.close()
+        await write_conn.close()
+    
+    if not bulk:
+        Path(checkpoint_file).unlink(missing_ok=True)
     
     print("\n" + "=" * 80)
     print("✅ RE-EMBEDDING COMPLETE!")
     print("=" * 80)
-    print(f"Successfully re-embedded {len(documents):,} documents")
-    print(f"Embedding model: {embedding_provider}:{embedding_model_name}")
+    print(f"Successfully re-embedded {meter.processed:,} documents in {meter.elapsed:.0f}s ({meter.docs_per_second:.1f} docs/s)")
+    if meter.rate_limited:
+        print(f"Rate-limited batches retried: {meter.rate_limited}")
+    print(f"Embedding model: {embedding_model_id}")
     print("\nYour RAG database is now ready with consistent embeddings!")
+    print("Make sure the ANN index exists with: python utils/manage_vector_index.py ensure")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Re-embed all documents with the current embedding model.")
+    parser.add_argument(
+        "--concurrency", type=int, default=int(os.getenv("RE_EMBED_CONCURRENCY", str(DEFAULT_CONCURRENCY))),
+        help="Embedding batches in flight (default: RE_EMBED_CONCURRENCY or %(default)s)",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Initial batch size")
+    parser.add_argument("--min-batch-size", type=int, default=10, help="Smallest adaptive batch size")
+    parser.add_argument("--max-batch-size", type=int, default=1000, help="Largest adaptive batch size")
+    parser.add_argument(
+        "--target-latency", type=float, default=10.0,
+        help="Per-batch latency in seconds the batch size adapts towards",
+    )
+    parser.add_argument("--yes", action="store_true", help="Do not ask for confirmation")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Only embed new or changed documents and remove deleted ones",
+    )
+    parser.add_argument(
+        "--checkpoint-file", default=DEFAULT_CHECKPOINT_FILE,
+        help="Progress file used to resume an interrupted run (default: %(default)s)",
+    )
+    parser.add_argument("--no-resume", action="store_true", help="Ignore an existing checkpoint")
+    parser.add_argument(
+        "--bulk", action="store_true",
+        help="Full re-index with binary COPY into a staging table, swapped in atomically",
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
 
 
 if __name__ == "__main__":
-    asyncio.run(re_embed_all())
+    args = parse_args()
+    asyncio.run(re_embed_all(
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        min_batch_size=args.min_batch_size,
+        max_batch_size=args.max_batch_size,
+        target_latency=args.target_latency,
+        assume_yes=args.yes,
+        incremental=args.incremental,
+        checkpoint_file=args.checkpoint_file,
+        resume=not args.no_resume,
+        bulk=args.bulk,
+    ))
 
@@ -0,0 +1,142 @@
+"""Summarize a JSONL trace log into a latency breakdown.
+
+Reads trace files written with TRACE_ENABLED=true (see config/tracing.py)
+and reports, over all traced runs, how agent latency splits into LLM, tool,
+retrieval and requirement time, per span kind and optionally per tool or
+model name.
+
+Usage:
+    python utils/trace_summary.py logs/trace_20250101.jsonl
+    python utils/trace_summary.py logs/trace_*.jsonl --by-name
+    python utils/trace_summary.py logs/trace_*.jsonl --json
+"""
+import argparse
+import json
+import statistics
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def read_spans(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """Read span records from trace files, skipping notices and bad lines."""
+    spans = []
+    for path in paths:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict) and "span_id" in record:
+                    spans.append(record)
+    return spans
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def _stats(durations: List[float], agent_total: float) -> Dict[str, float]:
+    total = sum(durations)
+    return {
+        "spans": len(durations),
+        "total_ms": total,
+        "mean_ms": statistics.mean(durations) if durations else 0.0,
+        "p50_ms": statistics.median(durations) if durations else 0.0,
+        "p95_ms": _percentile(durations, 0.95),
+        "share": total / agent_total if agent_total else 0.0,
+    }
+
+
+def summarize(spans: List[Dict[str, Any]], by_name: bool = False) -> Dict[str, Any]:
+    """Aggregate span durations per kind (and per name).
+
+    Args:
+        spans: Span records from read_spans().
+        by_name: Also break each kind down by tool or model name.
+
+    Returns:
+        Dict[str, Any]: Run count, run latency percentiles and per-kind statistics.
+        ``share`` is the summed span time relative to the summed run time;
+        parallel tool calls overlap, so shares can add up to more than 1.
+    """
+    runs = [span["duration_ms"] for span in spans if span.get("kind") == "agent" and not span.get("parent_id")]
+    agent_total = sum(runs)
+
+    per_kind: Dict[str, List[float]] = defaultdict(list)
+    per_name: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    errors: Dict[str, int] = defaultdict(int)
+    for span in spans:
+        kind = span.get("kind", "other")
+        if kind == "agent" and not span.get("parent_id"):
+            continue
+        per_kind[kind].append(span["duration_ms"])
+        per_name[kind][span.get("name", "?")].append(span["duration_ms"])
+        if span.get("status") == "error":
+            errors[kind] += 1
+
+    kinds = {}
+    for kind, durations in sorted(per_kind.items(), key=lambda item: -sum(item[1])):
+        kinds[kind] = {**_stats(durations, agent_total), "errors": errors[kind]}
+        if by_name:
+            kinds[kind]["names"] = {
+                name: _stats(values, agent_total)
+                for name, values in sorted(per_name[kind].items(), key=lambda item: -sum(item[1]))
+            }
+
+    return {
+        "runs": len(runs),
+        "run_p50_ms": statistics.median(runs) if runs else 0.0,
+        "run_p95_ms": _percentile(runs, 0.95),
+        "tokens": sum(span.get("total_tokens", 0) for span in spans if span.get("kind") == "llm"),
+        "kinds": kinds,
+    }
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Format a summary as a table."""
+    lines = [
+        f"{summary['runs']} runs, latency p50 {summary['run_p50_ms']:.0f} ms, p95 {summary['run_p95_ms']:.0f} ms, "
+        f"{summary['tokens']} LLM tokens",
+        f"  {'kind':<28} {'spans':>6} {'total ms':>11} {'mean ms':>9} {'p95 ms':>9} {'share':>7} {'errors':>6}",
+    ]
+    for kind, stats in summary["kinds"].items():
+        lines.append(
+            f"  {kind:<28} {stats['spans']:>6} {stats['total_ms']:>11.0f} {stats['mean_ms']:>9.1f} "
+            f"{stats['p95_ms']:>9.1f} {stats['share']:>6.0%} {stats['errors']:>6}"
+        )
+        for name, named in stats.get("names", {}).items():
+            lines.append(
+                f"    {name[:26]:<26} {named['spans']:>6} {named['total_ms']:>11.0f} {named['mean_ms']:>9.1f} "
+                f"{named['p95_ms']:>9.1f} {named['share']:>6.0%}"
+            )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Summarize JSONL trace logs into a latency breakdown.")
+    parser.add_argument("files", nargs="+", help="Trace files (TRACE_FILE / logs/trace_<date>.jsonl)")
+    parser.add_argument("--by-name", action="store_true", help="Break each span kind down by tool/model name")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print the summary and return the process exit code."""
+    args = parse_args(argv)
+    summary = summarize(read_spans(args.files), by_name=args.by_name)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(format_summary(summary))
+    return 0 if summary["runs"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())